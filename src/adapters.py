@@ -1,8 +1,275 @@
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from urllib.parse import urlparse
+
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from requests import PreparedRequest, Response
+from requests.adapters import DEFAULT_POOLSIZE, BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 
+from archive import ArchiveRecord, HtmlArchive
+from cache import CacheEntry, HttpCache
 from config import SessionConfig, session_conf
+from constants import ARCHIVE_MODE_RECORD, ARCHIVE_MODE_REPLAY
+from rate_limit import HostRateLimiter, ThrottleAwareRetry
+
+# Тело ответа хранится в кэше уже распакованным, поэтому заголовки
+# Content-Encoding и Content-Length к нему не относятся и не сохраняются.
+CACHED_HEADERS: tuple[str, ...] = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+)
+BODY_ENCODING_HEADERS: tuple[str, ...] = ("Content-Encoding", "Content-Length")
+
+
+class ScraperHTTPAdapter(HTTPAdapter):
+    """
+    HTTP-адаптер с поддержкой условных запросов через дисковый кэш.
+
+    Для GET-запросов с сохраненным ответом добавляет заголовки
+    ``If-None-Match``/``If-Modified-Since``. При ответе 304 возвращает
+    сохраненное тело со статусом 200, а новые ответы с валидаторами
+    сохраняет в кэш. Если передан архив, каждый полученный ответ
+    дописывается в него для последующего воспроизведения. Если передан
+    ограничитель, запрос ждет его разрешения, а время и статус ответа
+    передаются ограничителю для подстройки параллельности.
+
+    Attributes:
+        cache (HttpCache | None): Кэш ответов или None, если кэш отключен
+        archive (HtmlArchive | None): Архив для записи ответов или None,
+            если запись отключена
+        limiter (HostRateLimiter | None): Ограничитель запросов к хостам
+            или None, если ограничение отключено
+    """
+
+    def __init__(
+        self,
+        cache: HttpCache | None = None,
+        archive: HtmlArchive | None = None,
+        limiter: HostRateLimiter | None = None,
+        **kwargs,
+    ) -> None:
+        self.cache: HttpCache | None = cache
+        self.archive: HtmlArchive | None = archive
+        self.limiter: HostRateLimiter | None = limiter
+        super().__init__(**kwargs)
+
+    def send(
+        self, request: PreparedRequest, stream: bool = False, **kwargs
+    ) -> Response:
+        """
+        Отправляет запрос и записывает полученный ответ в архив.
+
+        Args:
+            request: Подготовленный запрос
+            stream: Нужно ли читать тело ответа потоково. Потоковые
+                   ответы не архивируются
+            **kwargs: Остальные параметры ``HTTPAdapter.send``
+
+        Returns:
+            Ответ сервера или восстановленный из кэша ответ
+        """
+        response = self._send_limited(request, stream=stream, **kwargs)
+        if self.archive is not None and not stream and request.method == "GET":
+            self.archive.add(
+                ArchiveRecord(
+                    url=request.url,
+                    status=response.status_code,
+                    content=response.content,
+                    headers=dict(response.headers),
+                )
+            )
+        return response
+
+    def _send_limited(
+        self, request: PreparedRequest, stream: bool = False, **kwargs
+    ) -> Response:
+        """
+        Отправляет запрос с разрешения ограничителя запросов к хосту.
+
+        Args:
+            request: Подготовленный запрос
+            stream: Нужно ли читать тело ответа потоково
+            **kwargs: Остальные параметры ``HTTPAdapter.send``
+
+        Returns:
+            Ответ сервера или восстановленный из кэша ответ
+        """
+        if self.limiter is None:
+            return self._send_conditional(request, stream=stream, **kwargs)
+
+        host = urlparse(request.url).hostname
+        self.limiter.acquire(host)
+        self.limiter.start_attempt()
+        status = None
+        try:
+            response = self._send_conditional(request, stream=stream, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            self.limiter.release(
+                host, self.limiter.get_attempt_latency(), status
+            )
+
+    def _send_conditional(
+        self, request: PreparedRequest, stream: bool = False, **kwargs
+    ) -> Response:
+        """
+        Отправляет запрос, используя кэш для условной загрузки.
+
+        Args:
+            request: Подготовленный запрос
+            stream: Нужно ли читать тело ответа потоково. Потоковые
+                   ответы не кэшируются
+            **kwargs: Остальные параметры ``HTTPAdapter.send``
+
+        Returns:
+            Ответ сервера или восстановленный из кэша ответ
+        """
+        if self.cache is None or stream or request.method != "GET":
+            return super().send(request, stream=stream, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry and entry.etag:
+            request.headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if entry and response.status_code == 304:
+            self.cache.touch(request.url)
+            response.status_code = 200
+            response.reason = "OK"
+            for header in BODY_ENCODING_HEADERS:
+                response.headers.pop(header, None)
+            response.headers.update(
+                {
+                    header: value
+                    for header, value in entry.headers.items()
+                    if header in CACHED_HEADERS
+                }
+            )
+            response._content = entry.content
+            return response
+
+        self.cache.record_miss()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            self.cache.set(
+                CacheEntry(
+                    url=request.url,
+                    content=response.content,
+                    etag=etag,
+                    last_modified=last_modified,
+                    headers={
+                        header: response.headers[header]
+                        for header in CACHED_HEADERS
+                        if header in response.headers
+                    },
+                )
+            )
+        return response
+
+    def connection_stats(self) -> dict[str, int]:
+        """
+        Возвращает количество запросов и открытых соединений по всем пулам.
+
+        Returns:
+            Словарь с количеством запросов и новых соединений с момента
+            создания пулов
+        """
+        stats = {"requests": 0, "connections": 0}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                stats["requests"] += pool.num_requests
+                stats["connections"] += pool.num_connections
+        return stats
+
+    def close_storage(self) -> None:
+        """Закрывает соединение с базой кэша и архив, сохраняя пулы."""
+        if self.cache is not None:
+            self.cache.close()
+        if self.archive is not None:
+            self.archive.close()
+
+    def close(self) -> None:
+        """Закрывает пул соединений, соединение с базой кэша и архив."""
+        super().close()
+        self.close_storage()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Адаптер, отвечающий на запросы ответами из архива без обращения к сети.
+
+    Ответ восстанавливается с сохраненными статусом и заголовками, поэтому
+    кодировка и обработка ошибок совпадают с исходным запуском. Для URL,
+    отсутствующих в архиве, вызывается ``ConnectionError``.
+
+    Attributes:
+        archive (HtmlArchive): Архив ответов
+    """
+
+    def __init__(self, archive: HtmlArchive) -> None:
+        super().__init__()
+        self.archive: HtmlArchive = archive
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """
+        Возвращает сохраненный в архиве ответ на запрос.
+
+        Args:
+            request: Подготовленный запрос
+            **kwargs: Параметры ``HTTPAdapter.send``, не используются
+
+        Raises:
+            ConnectionError: Если ответ для URL отсутствует в архиве
+
+        Returns:
+            Ответ, восстановленный из архива
+        """
+        record = self.archive.get(request.url)
+        if record is None:
+            raise ConnectionError(
+                f"Ответ для {request.url} отсутствует в архиве",
+                request=request,
+            )
+
+        response = Response()
+        response.status_code = record.status
+        response.headers = CaseInsensitiveDict(record.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = record.content
+        return response
+
+    def connection_stats(self) -> dict[str, int]:
+        """
+        Возвращает количество запросов и соединений.
+
+        Returns:
+            Нулевые счетчики: ответы берутся из архива без соединений
+        """
+        return {"requests": 0, "connections": 0}
+
+    def close_storage(self) -> None:
+        """Закрывает архив."""
+        self.archive.close()
+
+    def close(self) -> None:
+        """Закрывает архив."""
+        self.close_storage()
 
 
 class HttpClientManager:
@@ -12,14 +279,58 @@ class HttpClientManager:
     Обеспечивает ленивую инициализацию сессии и централизованную конфигурацию
     параметров HTTP-соединения, включая повторные попытки и заголовки по умолчанию.
 
+    Все потоки используют одну сессию с одним адаптером. Пул соединений
+    адаптера потокобезопасен и рассчитан на ``pool_maxsize`` соединений
+    к каждому хосту; если размер не задан в конфигурации, он выбирается
+    по числу потоков парсера через ``ensure_pool_size``. Пул блокирующий:
+    лишний поток ждет освобождения соединения, а не открывает новое,
+    которое пришлось бы закрыть. При ``keep_connections_alive``
+    соединения не закрываются между запусками ``run_session``.
+
     Attributes:
         _session (requests.Session | None): HTTP-сессия, инициализируемая при первом обращении
         _config (SessionConfig): Конфигурация параметров сессии
+        cache (HttpCache | None): Дисковый кэш для условных запросов,
+            если в конфигурации задан ``cache_path``
+        archive (HtmlArchive | None): Архив исходных ответов, если
+            в конфигурации задан ``archive_mode``
+        limiter (HostRateLimiter | None): Ограничитель частоты
+            и параллельности запросов к хостам, если в конфигурации
+            включен ``adaptive_rate_limit``
     """
 
     def __init__(self, config: SessionConfig) -> None:
         self._session: requests.Session | None = None
         self._config: SessionConfig = config
+        self._adapter: ScraperHTTPAdapter | ReplayAdapter | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._pools_stats: dict[str, int] = {"requests": 0, "connections": 0}
+        self._unreported_stats: dict[str, int] = {
+            "requests": 0,
+            "connections": 0,
+        }
+        self.pool_maxsize: int = config.pool_maxsize or DEFAULT_POOLSIZE
+        self.archive: HtmlArchive | None = (
+            HtmlArchive(config.archive_path) if config.archive_mode else None
+        )
+        self.cache: HttpCache | None = (
+            HttpCache(config.cache_path, config.cache_max_size)
+            if config.cache_path and config.archive_mode != ARCHIVE_MODE_REPLAY
+            else None
+        )
+        self.limiter: HostRateLimiter | None = (
+            HostRateLimiter(
+                rate=config.host_rate,
+                burst=config.host_burst,
+                initial_limit=config.initial_concurrency,
+                min_limit=config.min_concurrency,
+                max_limit=config.max_concurrency,
+                decrease_factor=config.concurrency_decrease_factor,
+                latency_tolerance=config.latency_tolerance,
+            )
+            if config.adaptive_rate_limit
+            else None
+        )
 
     @property
     def session(self) -> requests.Session:
@@ -30,10 +341,115 @@ class HttpClientManager:
             config: Конфигурация параметров сессии, включая заголовки,
                    настройки повторных попыток и другие параметры
         """
-        if not self._session:
-            self._session = requests.Session()
-            self._configure_session()
-        return self._session
+        with self._lock:
+            if not self._session:
+                self._session = requests.Session()
+                self._configure_session()
+            return self._session
+
+    def ensure_pool_size(self, concurrency: int) -> None:
+        """
+        Увеличивает пул соединений до числа одновременных запросов.
+
+        Если ``pool_maxsize`` задан в конфигурации, пул не изменяется.
+        Если адаптер уже создан, его пулы пересоздаются, а открытые
+        соединения закрываются.
+
+        Args:
+            concurrency: Количество потоков, одновременно выполняющих
+                запросы к одному хосту
+        """
+        with self._lock:
+            if self._config.pool_maxsize or concurrency <= self.pool_maxsize:
+                return
+            self.pool_maxsize = concurrency
+            if isinstance(self._adapter, ScraperHTTPAdapter):
+                self._collect_connection_stats(is_closing=True)
+                self._adapter.poolmanager.clear()
+                self._adapter.init_poolmanager(
+                    self._config.pool_connections,
+                    self.pool_maxsize,
+                    block=True,
+                )
+
+    @contextmanager
+    def run_session(self) -> Iterator[requests.Session]:
+        """
+        Предоставляет сессию на время одного запуска парсера.
+
+        По окончании запуска закрываются база кэша и архив, чтобы
+        записанные данные попали на диск. Соединения закрываются, только
+        если в конфигурации выключен ``keep_connections_alive``, иначе
+        следующий запуск использует открытые соединения (urllib3
+        проверяет, не закрыл ли их сервер, перед повторным использованием).
+
+        Yields:
+            Общая HTTP-сессия
+        """
+        session = self.session
+        try:
+            yield session
+        finally:
+            if self._config.keep_connections_alive:
+                self._adapter.close_storage()
+            else:
+                with self._lock:
+                    self._collect_connection_stats(is_closing=True)
+                    session.close()
+
+    def _collect_connection_stats(self, is_closing: bool = False) -> None:
+        """
+        Переносит новые запросы и соединения пулов в неотданные счетчики.
+
+        Пулы хранят счетчики с момента создания, поэтому перед закрытием
+        пулов их значения нужно сохранить. Вызывается под блокировкой.
+
+        Args:
+            is_closing: Будут ли пулы закрыты после вызова
+        """
+        if self._adapter is None:
+            return
+        current = self._adapter.connection_stats()
+        for key, value in current.items():
+            self._unreported_stats[key] += max(
+                0, value - self._pools_stats[key]
+            )
+        self._pools_stats = (
+            {"requests": 0, "connections": 0} if is_closing else current
+        )
+
+    def pop_connection_stats(self) -> dict[str, Any]:
+        """
+        Возвращает статистику повторного использования соединений.
+
+        Счетчики считаются с предыдущего вызова.
+
+        Returns:
+            Словарь с количеством запросов, новых и повторно
+            использованных соединений и долей повторного использования
+        """
+        with self._lock:
+            self._collect_connection_stats()
+            requests_count = self._unreported_stats["requests"]
+            connections = self._unreported_stats["connections"]
+            self._unreported_stats = {"requests": 0, "connections": 0}
+
+        reused = max(0, requests_count - connections)
+        return {
+            "requests": requests_count,
+            "connections": connections,
+            "reused": reused,
+            "reuse_ratio": reused / requests_count if requests_count else 0.0,
+        }
+
+    def close(self) -> None:
+        """Закрывает сессию вместе с пулами соединений, кэшем и архивом."""
+        with self._lock:
+            if self._session is not None:
+                self._collect_connection_stats(is_closing=True)
+                self._session.close()
+                self._session = None
+                self._adapter = None
 
     def _configure_session(self) -> None:
         """
@@ -51,15 +467,32 @@ class HttpClientManager:
         if self._config.default_headers:
             self._session.headers.update(self._config.default_headers)
 
-        retry_strategy = Retry(
+        retry_strategy = ThrottleAwareRetry(
             total=self._config.max_retries,
             backoff_factor=self._config.backoff_factor,
             status_forcelist=self._config.retry_statuses,
+            limiter=self.limiter,
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        if self._config.archive_mode == ARCHIVE_MODE_REPLAY:
+            adapter = ReplayAdapter(self.archive)
+        else:
+            adapter = ScraperHTTPAdapter(
+                cache=self.cache,
+                archive=(
+                    self.archive
+                    if self._config.archive_mode == ARCHIVE_MODE_RECORD
+                    else None
+                ),
+                limiter=self.limiter,
+                max_retries=retry_strategy,
+                pool_connections=self._config.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=True,
+            )
+        self._adapter = adapter
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
 
 scraper_http_manager: HttpClientManager = HttpClientManager(session_conf)
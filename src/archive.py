@@ -0,0 +1,192 @@
+import argparse
+import json
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+ARCHIVE_DATA_FILENAME: str = "responses.dat"
+ARCHIVE_INDEX_FILENAME: str = "index.jsonl"
+ARCHIVE_SKIPPED_HEADERS: frozenset[str] = frozenset(
+    ("content-encoding", "content-length", "transfer-encoding")
+)
+
+
+@dataclass
+class ArchiveRecord:
+    """Сохраненный в архиве ответ сервера."""
+
+    url: str
+    status: int
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class HtmlArchive:
+    """
+    Сжатый архив исходных ответов сервера с дозаписью и индексом.
+
+    Тела ответов сжимаются zlib и дописываются в конец файла данных,
+    а для каждой записи в индекс JSON Lines добавляется строка с URL,
+    статусом, заголовками, смещением и размером сжатого тела. Ранее
+    записанные данные не изменяются; при повторной записи URL в индексе
+    действует последняя запись.
+
+    Attributes:
+        dir_path (Path): Директория архива
+        compress_level (int): Уровень сжатия zlib
+    """
+
+    def __init__(self, dir_path: Path, compress_level: int = 6) -> None:
+        self.dir_path: Path = Path(dir_path)
+        self.compress_level: int = compress_level
+        self._index: dict[str, dict[str, Any]] | None = None
+        self._data_file = None
+        self._index_file = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def data_path(self) -> Path:
+        """Путь к файлу сжатых тел ответов."""
+        return self.dir_path / ARCHIVE_DATA_FILENAME
+
+    @property
+    def index_path(self) -> Path:
+        """Путь к файлу индекса."""
+        return self.dir_path / ARCHIVE_INDEX_FILENAME
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        """
+        Загружает индекс архива при первом обращении.
+
+        Returns:
+            Последние записи индекса по URL
+        """
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                with open(self.index_path, encoding="utf-8") as read:
+                    for line in read:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self._index[entry["url"]] = entry
+        return self._index
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._load_index()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def urls(self) -> list[str]:
+        """
+        Возвращает URL всех сохраненных ответов.
+
+        Returns:
+            Список URL в порядке первой записи
+        """
+        with self._lock:
+            return list(self._load_index())
+
+    def add(self, record: ArchiveRecord) -> None:
+        """
+        Дописывает ответ в архив.
+
+        Args:
+            record: Сохраняемый ответ сервера
+        """
+        compressed = zlib.compress(record.content, self.compress_level)
+        headers = {
+            name: value
+            for name, value in record.headers.items()
+            if name.lower() not in ARCHIVE_SKIPPED_HEADERS
+        }
+
+        with self._lock:
+            index = self._load_index()
+            if self._data_file is None:
+                self.dir_path.mkdir(parents=True, exist_ok=True)
+                self._data_file = open(self.data_path, "ab")
+                self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+            offset = self._data_file.seek(0, 2)
+            self._data_file.write(compressed)
+            self._data_file.flush()
+
+            entry = {
+                "url": record.url,
+                "status": record.status,
+                "headers": headers,
+                "offset": offset,
+                "length": len(compressed),
+                "recorded_at": time.time(),
+            }
+            self._index_file.write(json.dumps(entry) + "\n")
+            self._index_file.flush()
+            index[record.url] = entry
+
+    def get(self, url: str) -> ArchiveRecord | None:
+        """
+        Возвращает последний сохраненный ответ для URL.
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            Ответ из архива или None, если URL не записывался
+        """
+        with self._lock:
+            entry = self._load_index().get(url)
+            if entry is None:
+                return None
+            if self._data_file is not None:
+                self._data_file.flush()
+            with open(self.data_path, "rb") as read:
+                read.seek(entry["offset"])
+                compressed = read.read(entry["length"])
+
+        return ArchiveRecord(
+            url=url,
+            status=entry["status"],
+            content=zlib.decompress(compressed),
+            headers=entry["headers"],
+        )
+
+    def close(self) -> None:
+        """Закрывает файлы архива, открытые для записи."""
+        with self._lock:
+            if self._data_file is not None:
+                self._data_file.close()
+                self._index_file.close()
+                self._data_file = self._index_file = None
+
+
+if __name__ == "__main__":
+    from adapters import HttpClientManager
+    from config import SessionConfig, scraper_conf
+    from constants import ARCHIVE_DIR_PATH, ARCHIVE_MODE_REPLAY
+    from scraper import Scraper
+
+    arg_parser = argparse.ArgumentParser(
+        description="Повторный разбор страниц из архива без обращения к сети"
+    )
+    arg_parser.add_argument(
+        "--archive-dir", type=Path, default=ARCHIVE_DIR_PATH
+    )
+    arg_parser.add_argument("--no-save", action="store_true")
+    args = arg_parser.parse_args()
+
+    replay_scraper = Scraper(
+        HttpClientManager(
+            SessionConfig(
+                archive_path=args.archive_dir,
+                archive_mode=ARCHIVE_MODE_REPLAY,
+            )
+        ),
+        scraper_conf,
+    )
+    replay_scraper.scrape_books(is_save=not args.no_save)
@@ -0,0 +1,273 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from functools import partial
+from typing import Any, NoReturn
+from urllib.parse import urlsplit
+
+import aiohttp
+from requests.exceptions import RequestException
+
+from config import ScraperConfig, SessionConfig, scraper_conf, session_conf
+from frontier import canonicalize_url
+from logger import logger
+from metrics import HTTP_BYTES, HTTP_RESPONSES
+from scraper import Scraper
+
+
+class AsyncScraper(Scraper):
+    """Асинхронный парсер для сбора данных о книгах с books.toscrape.com.
+
+    Использует те же методы извлечения данных, что и ``Scraper``, но
+    выполняет HTTP-запросы через ``aiohttp`` в одном цикле событий.
+    Количество одновременных запросов к каждому хосту ограничивается
+    семафором, что позволяет держать сотни запросов в работе без
+    отдельных потоков. Разбор HTML выполняется в пуле потоков цикла
+    событий, чтобы не задерживать ожидающие ответы запросы.
+
+    Книги перебираются асинхронным генератором ``aiter_books``.
+    Синхронный ``iter_books`` требует HTTP-клиента ``requests``, которого
+    у асинхронного парсера нет, поэтому вызывает ``TypeError``.
+    """
+
+    def __init__(
+        self,
+        scraper_config: ScraperConfig,
+        session_config: SessionConfig,
+    ):
+        super().__init__(http_manager=None, scraper_config=scraper_config)
+        self.session_config: SessionConfig = session_config
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Создает асинхронную HTTP-сессию с параметрами из конфигурации.
+
+        Returns:
+            aiohttp.ClientSession: Сессия с заголовками по умолчанию,
+                таймаутом и ограничением соединений на хост.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=self.config.max_connections_per_host,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.session_config.default_headers,
+            timeout=aiohttp.ClientTimeout(total=self.config.response_timeout),
+        )
+
+    def iter_books(self, resume: bool = False) -> NoReturn:
+        """Не поддерживается: используйте асинхронный ``aiter_books``.
+
+        Args:
+            resume (bool, optional): Не используется.
+
+        Raises:
+            TypeError: Всегда.
+        """
+        raise TypeError(
+            "AsyncScraper не поддерживает синхронный iter_books, "
+            "используйте async for book in scraper.aiter_books()"
+        )
+
+    def _get_host_semaphore(
+        self, host_semaphores: dict[str, asyncio.Semaphore], url: str
+    ) -> asyncio.Semaphore:
+        """Возвращает семафор, ограничивающий число запросов к хосту URL.
+
+        Семафоры создаются заново в каждом обходе, так как привязываются
+        к циклу событий, в котором используются впервые.
+
+        Args:
+            host_semaphores (dict[str, asyncio.Semaphore]): Семафоры
+                хостов текущего обхода.
+            url (str): URL, для хоста которого нужен семафор.
+
+        Returns:
+            asyncio.Semaphore: Семафор хоста.
+        """
+        host = urlsplit(url).netloc
+        if host not in host_semaphores:
+            host_semaphores[host] = asyncio.Semaphore(
+                self.config.max_connections_per_host
+            )
+        return host_semaphores[host]
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        host_semaphores: dict[str, asyncio.Semaphore],
+    ) -> bytes:
+        """Выполняет асинхронный HTTP-запрос и возвращает тело ответа.
+
+        Повторяет запрос при сетевых ошибках и статусах из
+        ``SessionConfig.retry_statuses`` с экспоненциальной задержкой.
+
+        Args:
+            session (aiohttp.ClientSession): Сессия для выполнения запроса.
+            url (str): URL для запроса.
+            host_semaphores (dict[str, asyncio.Semaphore]): Семафоры
+                хостов текущего обхода.
+
+        Raises:
+            RequestException: Если запрос не удался после всех попыток
+                или получен статус код ошибки.
+
+        Returns:
+            bytes: Тело HTML-страницы, декодируемое в ``_get_soup``.
+        """
+        retry_statuses = self.session_config.retry_statuses or ()
+        max_retries = self.session_config.max_retries or 0
+        backoff_factor = self.session_config.backoff_factor or 0
+
+        attempt = 0
+        while True:
+            try:
+                async with self._get_host_semaphore(host_semaphores, url):
+                    async with session.get(url) as response:
+                        if (
+                            response.status in retry_statuses
+                            and attempt < max_retries
+                        ):
+                            raise aiohttp.ClientResponseError(
+                                response.request_info,
+                                response.history,
+                                status=response.status,
+                            )
+                        self.metrics.inc(
+                            HTTP_RESPONSES, status=str(response.status)
+                        )
+                        response.raise_for_status()
+                        body = await response.read()
+                        self.metrics.inc(HTTP_BYTES, len(body))
+                        return body
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                is_retryable = not isinstance(
+                    error, aiohttp.ClientResponseError
+                ) or (error.status in retry_statuses)
+                if not is_retryable or attempt >= max_retries:
+                    raise RequestException(
+                        f"Ошибка при попытке выполнить запрос к {url}: {error}"
+                    )
+                await asyncio.sleep(backoff_factor * 2**attempt)
+                attempt += 1
+
+    async def _fetch_book_data(
+        self,
+        session: aiohttp.ClientSession,
+        book_url: str,
+        host_semaphores: dict[str, asyncio.Semaphore],
+    ) -> dict[str, Any]:
+        """Асинхронно извлекает полную информацию о книге с её страницы.
+
+        Args:
+            session (aiohttp.ClientSession): Сессия для HTTP-запросов.
+            book_url (str): URL страницы книги.
+            host_semaphores (dict[str, asyncio.Semaphore]): Семафоры
+                хостов текущего обхода.
+
+        Returns:
+            dict[str, Any]: Словарь с полной информацией о книге.
+        """
+        content = await self._fetch(session, book_url, host_semaphores)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._parse_book_page, content
+        )
+
+    async def aiter_books(self) -> AsyncIterator[dict[str, Any]]:
+        """Асинхронно перебирает книги каталога в порядке их следования.
+
+        Загрузка страниц книг запускается сразу после разбора страницы
+        каталога, поэтому запросы к книгам выполняются одновременно
+        с обходом следующих страниц каталога.
+
+        Yields:
+            dict[str, Any]: Словарь с данными о книге.
+        """
+        loop = asyncio.get_running_loop()
+        host_semaphores: dict[str, asyncio.Semaphore] = {}
+        async with self._create_session() as session:
+            pending_pages: deque[list[asyncio.Task]] = deque()
+            page_url = self.config.start_catalog_page
+            try:
+                while page_url:
+                    soup = await loop.run_in_executor(
+                        None,
+                        partial(
+                            self._get_soup,
+                            await self._fetch(
+                                session, page_url, host_semaphores
+                            ),
+                            parse_only=self._get_strainer(
+                                self.config.catalog_parse_only
+                            ),
+                        ),
+                    )
+                    pending_pages.append(
+                        [
+                            asyncio.create_task(
+                                self._fetch_book_data(
+                                    session,
+                                    canonicalize_url(
+                                        redirect, self.config.base_url
+                                    ),
+                                    host_semaphores,
+                                )
+                            )
+                            for redirect in self._get_books_redirections(soup)
+                        ]
+                    )
+
+                    next_page = self._get_next_page(soup)
+                    page_url = (
+                        canonicalize_url(next_page, self.config.base_url)
+                        if next_page
+                        else None
+                    )
+
+                    while pending_pages and all(
+                        task.done() for task in pending_pages[0]
+                    ):
+                        for task in pending_pages.popleft():
+                            yield task.result()
+
+                while pending_pages:
+                    for task in pending_pages.popleft():
+                        yield await task
+            finally:
+                for tasks in pending_pages:
+                    for task in tasks:
+                        task.cancel()
+
+    async def scrape_books(
+        self, is_save: bool = False
+    ) -> list[dict[str, Any]]:
+        """Асинхронно парсит данные о всех книгах из каталога.
+
+        Args:
+            is_save (bool, optional): Сохранять ли данные в файл.
+                Значение по умолчанию - False.
+
+        Returns:
+            list[dict[str, Any]]: Список словарей с данными о книгах.
+        """
+        logger.info("Начало процесса асинхронного парсинга.")
+        self.metrics.reset()
+        scraped_books = [book async for book in self.aiter_books()]
+
+        if is_save:
+            self._save_books_data_as_file(scraped_books)
+
+        logger.info("Асинхронный парсинг сайта завершен.")
+        logger.info(f"Обработано страниц с книгами: #{len(scraped_books)}.")
+        if self.metrics.enabled:
+            self._export_metrics()
+        return scraped_books
+
+
+if __name__ == "__main__":
+    async_book_scraper = AsyncScraper(
+        scraper_config=scraper_conf,
+        session_config=session_conf,
+    )
+    asyncio.run(async_book_scraper.scrape_books(is_save=True))
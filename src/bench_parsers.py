@@ -0,0 +1,147 @@
+import argparse
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from config import ScraperConfig, scraper_conf
+from constants import HTML_PARSER, HTML_PARSERS, SAVE_DIR_PATH
+from fake_site import generate_site, write_site
+from logger import logger
+from scraper import Scraper
+
+PAGES_DIR_PATH = SAVE_DIR_PATH / "pages"
+BOOK_PAGE_MARKER: str = "product_page"
+
+
+def load_saved_pages(pages_dir: Path) -> tuple[list[bytes], list[bytes]]:
+    """Загружает сохраненные HTML-страницы и делит их на книги и каталог.
+
+    Args:
+        pages_dir (Path): Директория с сохраненными ``*.html`` страницами.
+
+    Returns:
+        tuple[list[bytes], list[bytes]]: Страницы книг и страницы каталога.
+    """
+    book_pages, catalog_pages = [], []
+    for page_path in sorted(Path(pages_dir).rglob("*.html")):
+        page = page_path.read_bytes()
+        if BOOK_PAGE_MARKER.encode() in page:
+            book_pages.append(page)
+        else:
+            catalog_pages.append(page)
+    return book_pages, catalog_pages
+
+
+def parse_pages(
+    scraper: Scraper, book_pages: list[bytes], catalog_pages: list[bytes]
+) -> list[Any]:
+    """Разбирает страницы тем же кодом, что и при парсинге сайта.
+
+    Args:
+        scraper (Scraper): Парсер с проверяемой конфигурацией.
+        book_pages (list[bytes]): Страницы книг.
+        catalog_pages (list[bytes]): Страницы каталога.
+
+    Returns:
+        list[Any]: Извлеченные данные книг и ссылки со страниц каталога.
+    """
+    catalog_strainer = scraper._get_strainer(scraper.config.catalog_parse_only)
+    results = [scraper._parse_book_page(page) for page in book_pages]
+    for page in catalog_pages:
+        soup = scraper._get_soup(page, parse_only=catalog_strainer)
+        results.append(
+            (scraper._get_catalog_books(soup), scraper._get_next_page(soup))
+        )
+    return results
+
+
+def compare_parsers(
+    pages_dir: Path,
+    config: ScraperConfig,
+    parsers: tuple[str, ...] = HTML_PARSERS,
+    repeat: int = 3,
+) -> list[dict[str, Any]]:
+    """Сравнивает время разбора сохраненных страниц разными парсерами.
+
+    Для каждого парсера замеряется лучшее из ``repeat`` время разбора всех
+    страниц с построением полного дерева и с частичным парсингом.
+    Результаты сверяются с эталоном ``html.parser`` без частичного парсинга.
+
+    Args:
+        pages_dir (Path): Директория с сохраненными страницами.
+        config (ScraperConfig): Базовая конфигурация парсера.
+        parsers (tuple[str, ...], optional): Сравниваемые парсеры.
+            Значение по умолчанию - HTML_PARSERS.
+        repeat (int, optional): Количество повторов замера.
+            Значение по умолчанию - 3.
+
+    Returns:
+        list[dict[str, Any]]: Строки отчета с временем разбора и признаком
+            совпадения результатов с эталоном.
+    """
+    book_pages, catalog_pages = load_saved_pages(pages_dir)
+    pages_count = len(book_pages) + len(catalog_pages)
+    if not pages_count:
+        raise FileNotFoundError(f"Не найдены HTML-страницы в {pages_dir}")
+
+    reference = parse_pages(
+        Scraper(None, replace(config, parser=HTML_PARSER)),
+        book_pages,
+        catalog_pages,
+    )
+
+    report = []
+    for parser in parsers:
+        for partial_parsing in (False, True):
+            scraper = Scraper(
+                None,
+                replace(
+                    config, parser=parser, partial_parsing=partial_parsing
+                ),
+            )
+            timings = []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                results = parse_pages(scraper, book_pages, catalog_pages)
+                timings.append(time.perf_counter() - start_time)
+
+            best_time = min(timings)
+            report.append(
+                {
+                    "parser": parser,
+                    "partial_parsing": partial_parsing,
+                    "pages": pages_count,
+                    "total_seconds": best_time,
+                    "ms_per_page": best_time / pages_count * 1000,
+                    "matches_reference": results == reference,
+                }
+            )
+    return report
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Сравнение скорости HTML-парсеров на сохраненных страницах"
+    )
+    arg_parser.add_argument("--pages-dir", type=Path, default=PAGES_DIR_PATH)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument(
+        "--generate-pages",
+        type=int,
+        default=0,
+        help="Сгенерировать страницы каталога с разметкой books.toscrape.com",
+    )
+    args = arg_parser.parse_args()
+
+    if args.generate_pages:
+        write_site(generate_site(args.generate_pages), args.pages_dir)
+
+    for row in compare_parsers(
+        args.pages_dir, scraper_conf, repeat=args.repeat
+    ):
+        logger.info(
+            f"{row['parser']:<12} partial={row['partial_parsing']!s:<5} "
+            f"страниц: {row['pages']}, {row['ms_per_page']:.2f} мс/стр., "
+            f"совпадает с эталоном: {row['matches_reference']}"
+        )
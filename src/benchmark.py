@@ -0,0 +1,332 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from constants import SAVE_DIR_PATH
+from fake_site import FakeSiteServer, generate_site
+from logger import logger
+from metrics import STAGE_SECONDS, MetricsRegistry
+
+BENCHMARK_RESULT_PATH = SAVE_DIR_PATH / "benchmarks" / "latest.json"
+CLI_PATH = Path(__file__).parent / "cli.py"
+STARTUP_COMMANDS: tuple[tuple[str, ...], ...] = (
+    ("--help",),
+    ("status",),
+    ("run-once", "--help"),
+)
+
+# В стадию extraction входят только внешние таймеры извлечения: таймеры
+# отдельных полей (extract_price, extract_listing и др.) вложены в них
+# и при сложении учитывались бы дважды.
+STAGES: dict[str, tuple[str, ...]] = {
+    "fetch": ("fetch",),
+    "parse": ("parse",),
+    "extraction": (
+        "extract_catalog_books",
+        "extract_next_page",
+        "extract_book",
+    ),
+    "save": ("save",),
+}
+
+
+def get_stages_totals(
+    registry: MetricsRegistry,
+) -> tuple[dict[str, float], dict[str, int]]:
+    """Суммирует время и количество вызовов стадий парсера из реестра метрик.
+
+    Время суммируется по всем потокам, поэтому при параллельной загрузке
+    сумма по стадиям может превышать общее время работы.
+
+    Args:
+        registry (MetricsRegistry): Реестр метрик парсера.
+
+    Returns:
+        tuple[dict[str, float], dict[str, int]]: Суммарное время
+            и количество вызовов по стадиям.
+    """
+    seconds, calls = {}, {}
+    for stage, metrics_stages in STAGES.items():
+        histograms = [
+            registry.get_histogram(STAGE_SECONDS, stage=metrics_stage)
+            for metrics_stage in metrics_stages
+        ]
+        seconds[stage] = sum(h.total for h in histograms if h is not None)
+        calls[stage] = sum(h.count for h in histograms if h is not None)
+    return seconds, calls
+
+
+def get_peak_rss_mb() -> float | None:
+    """Возвращает пиковый объем резидентной памяти процесса в мегабайтах.
+
+    Returns:
+        float | None: Пиковый RSS или None, если платформа не
+            поддерживает модуль ``resource``.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_rss / 1024 / 1024
+    return peak_rss / 1024
+
+
+def _run_scrape(
+    base_url: str, config_overrides: dict[str, Any], save_dir: str
+) -> dict[str, Any]:
+    """Запускает парсинг сгенерированного сайта в отдельном процессе.
+
+    Args:
+        base_url (str): Базовый URL каталога локального сервера.
+        config_overrides (dict[str, Any]): Переопределения ScraperConfig.
+        save_dir (str): Директория для сохранения результатов.
+
+    Returns:
+        dict[str, Any]: Количество книг, время работы, время по стадиям
+            и пиковый RSS процесса.
+    """
+    from adapters import HttpClientManager
+    from config import ScraperConfig, SessionConfig
+    from scraper import Scraper
+
+    config = ScraperConfig(
+        base_url=base_url,
+        start_catalog_page=base_url + "page-1.html",
+        save_dir_path=Path(save_dir),
+        file_path=Path(save_dir) / "books_data.txt",
+        jsonl_file_path=Path(save_dir) / "books_data.jsonl",
+        sqlite_path=Path(save_dir) / "books.sqlite3",
+        snapshots_dir_path=Path(save_dir) / "snapshots",
+        images_dir_path=Path(save_dir) / "images",
+        books_index_path=Path(save_dir) / "books_index.json",
+        metrics_dir_path=Path(save_dir) / "metrics",
+        profile_dir_path=Path(save_dir) / "profiles",
+        **{"metrics_enabled": True, **config_overrides},
+    )
+    scraper = Scraper(HttpClientManager(SessionConfig()), config)
+
+    start_time = time.perf_counter()
+    books_count = len(scraper.scrape_books(is_save=True))
+    wall_seconds = time.perf_counter() - start_time
+    stages_seconds, stages_calls = get_stages_totals(scraper.metrics)
+
+    return {
+        "books": books_count,
+        "wall_seconds": wall_seconds,
+        "stages": stages_seconds,
+        "stage_calls": stages_calls,
+        "metrics": scraper.metrics.snapshot(),
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+
+
+def run_benchmark(
+    pages_count: int = 10,
+    latency: float = 0.0,
+    config_overrides: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Измеряет производительность ``Scraper.scrape_books`` без сети.
+
+    Генерирует сайт с разметкой books.toscrape.com из ``pages_count``
+    страниц каталога по 20 книг, поднимает локальный HTTP-сервер и
+    выполняет полный парсинг с сохранением в отдельном процессе, чтобы
+    пиковый RSS отражал только работу парсера.
+
+    Args:
+        pages_count (int, optional): Количество страниц каталога.
+            Значение по умолчанию - 10.
+        latency (float, optional): Задержка ответа сервера в секундах.
+            Значение по умолчанию - 0.0.
+        config_overrides (dict[str, Any] | None, optional):
+            Переопределения ScraperConfig. Значение по умолчанию - None.
+
+    Returns:
+        dict[str, Any]: Результаты замера: страницы в секунду, время по
+            стадиям (fetch, parse, extraction, save) и пиковый RSS.
+    """
+    config_overrides = config_overrides or {}
+    site = generate_site(pages_count)
+
+    with (
+        FakeSiteServer(site, latency=latency) as server,
+        tempfile.TemporaryDirectory() as save_dir,
+        ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor,
+    ):
+        result = executor.submit(
+            _run_scrape, server.base_url, config_overrides, save_dir
+        ).result()
+        requests_count = server.requests_count
+
+    result.update(
+        {
+            "pages_count": pages_count,
+            "latency": latency,
+            "config": config_overrides,
+            "requests": requests_count,
+            "pages_per_second": requests_count / result["wall_seconds"],
+        }
+    )
+    return result
+
+
+def compare_with_baseline(
+    result: dict[str, Any], baseline: dict[str, Any]
+) -> dict[str, float]:
+    """Сравнивает результаты замера с сохраненным базовым замером.
+
+    Args:
+        result (dict[str, Any]): Текущий замер.
+        baseline (dict[str, Any]): Базовый замер.
+
+    Returns:
+        dict[str, float]: Относительное изменение показателей, где
+            положительное значение означает рост.
+    """
+    changes = {}
+    for metric in ("pages_per_second", "wall_seconds", "peak_rss_mb"):
+        if result.get(metric) and baseline.get(metric):
+            changes[metric] = result[metric] / baseline[metric] - 1
+    for stage, seconds in result["stages"].items():
+        if baseline["stages"].get(stage):
+            changes[f"stage_{stage}"] = seconds / baseline["stages"][stage] - 1
+    for command, milliseconds in result.get("startup_ms", {}).items():
+        if baseline.get("startup_ms", {}).get(command):
+            changes[f"startup_{command}"] = (
+                milliseconds / baseline["startup_ms"][command] - 1
+            )
+    return changes
+
+
+def measure_startup(
+    commands: tuple[tuple[str, ...], ...] = STARTUP_COMMANDS,
+    repeat: int = 5,
+) -> dict[str, float]:
+    """Измеряет время запуска команд командной строки.
+
+    Каждая команда запускается в новом процессе интерпретатора, поэтому
+    в замер входят импорт модулей и создание глобальных объектов.
+    Для сравнения замеряется запуск пустого интерпретатора.
+
+    Args:
+        commands (tuple[tuple[str, ...], ...], optional): Аргументы
+            команд ``cli.py``. Значение по умолчанию - STARTUP_COMMANDS.
+        repeat (int, optional): Количество повторов каждой команды,
+            из которых берется лучшее время. Значение по умолчанию - 5.
+
+    Returns:
+        dict[str, float]: Лучшее время запуска в миллисекундах
+            по командам, "python" - для пустого интерпретатора.
+    """
+    launches = {"python": [sys.executable, "-c", "pass"]}
+    for command in commands:
+        launches[" ".join(command)] = [sys.executable, str(CLI_PATH), *command]
+
+    startup_ms = {}
+    for name, launch in launches.items():
+        timings = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            subprocess.run(launch, check=True, capture_output=True)
+            timings.append(time.perf_counter() - start_time)
+        startup_ms[name] = min(timings) * 1000
+    return startup_ms
+
+
+def parse_overrides(values: list[str]) -> dict[str, Any]:
+    """Разбирает переопределения конфигурации вида ``ключ=значение``.
+
+    Значение интерпретируется как JSON, а если это не удается - как строка.
+
+    Args:
+        values (list[str]): Строки переопределений.
+
+    Returns:
+        dict[str, Any]: Переопределения ScraperConfig.
+    """
+    overrides = {}
+    for value in values:
+        key, _, raw = value.partition("=")
+        try:
+            overrides[key] = json.loads(raw)
+        except json.JSONDecodeError:
+            overrides[key] = raw
+    return overrides
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Выполняет замер и сохраняет результаты в JSON-файл.
+
+    Args:
+        argv (list[str] | None, optional): Аргументы командной строки.
+            Значение по умолчанию - None (``sys.argv``).
+    """
+    arg_parser = argparse.ArgumentParser(
+        description="Замер производительности парсера на локальной копии сайта"
+    )
+    arg_parser.add_argument("--pages", type=int, default=10)
+    arg_parser.add_argument("--latency", type=float, default=0.0)
+    arg_parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Переопределение поля ScraperConfig, например max_workers=8",
+    )
+    arg_parser.add_argument(
+        "--output", type=Path, default=BENCHMARK_RESULT_PATH
+    )
+    arg_parser.add_argument("--baseline", type=Path)
+    arg_parser.add_argument(
+        "--no-startup",
+        action="store_true",
+        help="Не замерять время запуска команд командной строки",
+    )
+    args = arg_parser.parse_args(argv)
+
+    benchmark_result = run_benchmark(
+        args.pages, args.latency, parse_overrides(args.set)
+    )
+    if not args.no_startup:
+        benchmark_result["startup_ms"] = measure_startup()
+
+    logger.info(
+        f"Книг: {benchmark_result['books']}, "
+        f"запросов: {benchmark_result['requests']}, "
+        f"время: {benchmark_result['wall_seconds']:.2f} с, "
+        f"{benchmark_result['pages_per_second']:.1f} стр./с, "
+        f"пиковый RSS: {benchmark_result['peak_rss_mb']} МБ"
+    )
+    for stage, seconds in benchmark_result["stages"].items():
+        logger.info(f"Стадия {stage}: {seconds:.3f} с")
+    for command, milliseconds in benchmark_result.get(
+        "startup_ms", {}
+    ).items():
+        logger.info(f"Запуск {command}: {milliseconds:.0f} мс")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as read:
+            baseline_result = json.load(read)
+        for metric, change in compare_with_baseline(
+            benchmark_result, baseline_result
+        ).items():
+            logger.info(
+                f"{metric}: {change:+.1%} относительно базового замера"
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, mode="w", encoding="utf-8") as write:
+        json.dump(benchmark_result, write, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+
+class BooksIndex:
+    """Индекс книг предыдущего запуска для инкрементального парсинга.
+
+    Для каждого URL книги хранит отпечаток её карточки в каталоге
+    (название, цена, наличие, рейтинг) и данные, полученные со страницы
+    книги. Если отпечаток не изменился, данные книги переносятся в новый
+    запуск без повторного запроса её страницы.
+
+    Книги добавляются из потоков парсера, поэтому индекс текущего
+    запуска и счетчики изменяются под блокировкой.
+
+    Attributes:
+        path (Path): Путь к JSON-файлу индекса.
+        reused (int): Количество книг, взятых из индекса в текущем запуске.
+        fetched (int): Количество книг, загруженных заново.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = Path(path)
+        self.reused: int = 0
+        self.fetched: int = 0
+        self._previous: dict[str, dict[str, Any]] = {}
+        self._current: dict[str, dict[str, Any]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def load(self) -> None:
+        """Загружает индекс предыдущего запуска, если файл существует."""
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as read:
+                self._previous = json.load(read)
+        self._current = {}
+        self.reused = self.fetched = 0
+
+    def get(self, book_url: str, fingerprint: str) -> dict[str, Any] | None:
+        """Возвращает сохраненные данные книги, если карточка не изменилась.
+
+        Args:
+            book_url (str): URL страницы книги.
+            fingerprint (str): Отпечаток карточки книги в текущем каталоге.
+
+        Returns:
+            dict[str, Any] | None: Данные книги из предыдущего запуска или
+                None, если книга новая или её карточка изменилась.
+        """
+        entry = self._previous.get(book_url)
+        if entry and entry["fingerprint"] == fingerprint:
+            return entry["book"]
+        return None
+
+    def get_previous(self, book_url: str) -> dict[str, Any] | None:
+        """Возвращает данные книги из предыдущего запуска без сверки карточки.
+
+        Args:
+            book_url (str): URL страницы книги.
+
+        Returns:
+            dict[str, Any] | None: Данные книги из предыдущего запуска или
+                None, если книга в нем не встречалась.
+        """
+        entry = self._previous.get(book_url)
+        return entry["book"] if entry else None
+
+    def add(
+        self,
+        book_url: str,
+        fingerprint: str,
+        book: dict[str, Any],
+        is_reused: bool = False,
+    ) -> None:
+        """Добавляет книгу в индекс текущего запуска.
+
+        Args:
+            book_url (str): URL страницы книги.
+            fingerprint (str): Отпечаток карточки книги в каталоге.
+            book (dict[str, Any]): Данные книги.
+            is_reused (bool, optional): Взяты ли данные из индекса.
+                Значение по умолчанию - False.
+        """
+        with self._lock:
+            self._current[book_url] = {
+                "fingerprint": fingerprint,
+                "book": book,
+            }
+            if is_reused:
+                self.reused += 1
+            else:
+                self.fetched += 1
+
+    def save(self) -> None:
+        """Атомарно сохраняет индекс текущего запуска на диск.
+
+        Книги, которых больше нет в каталоге, в индекс не попадают.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with self._lock:
+            current = dict(self._current)
+        with open(temp_path, mode="w", encoding="utf-8") as write:
+            json.dump(current, write, ensure_ascii=False)
+        os.replace(temp_path, self.path)
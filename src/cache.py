@@ -0,0 +1,181 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class CacheEntry:
+    """Сохраненный ответ сервера с валидаторами для условных запросов."""
+
+    url: str
+    content: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class HttpCache:
+    """
+    Дисковый кэш HTTP-ответов для условных запросов.
+
+    Хранит тело ответа, заголовки ``ETag``/``Last-Modified`` и время
+    последнего обращения для каждого URL в базе SQLite. Суммарный размер
+    тел ограничен ``max_size``: при превышении удаляются записи, к которым
+    дольше всего не обращались (LRU).
+
+    Attributes:
+        path (Path): Путь к файлу базы кэша
+        max_size (int): Максимальный суммарный размер тел ответов в байтах
+        hits (int): Количество ответов, отданных из кэша после 304
+        misses (int): Количество ответов, загруженных полностью
+    """
+
+    def __init__(self, path: Path, max_size: int) -> None:
+        self.path: Path = Path(path)
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._connection: sqlite3.Connection | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Открывает соединение с базой кэша при первом обращении.
+
+        Returns:
+            Соединение с базой, в которой создана таблица ответов
+        """
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, check_same_thread=False
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+        return self._connection
+
+    def get(self, url: str) -> CacheEntry | None:
+        """
+        Возвращает сохраненный ответ для URL.
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            Запись кэша или None, если ответ для URL не сохранялся
+        """
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute(
+                    "SELECT etag, last_modified, headers, content "
+                    "FROM responses WHERE url = ?",
+                    (url,),
+                )
+                .fetchone()
+            )
+        if not row:
+            return None
+
+        etag, last_modified, headers, content = row
+        return CacheEntry(
+            url=url,
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+            headers=json.loads(headers),
+        )
+
+    def set(self, entry: CacheEntry) -> None:
+        """
+        Сохраняет ответ и вытесняет старые записи при превышении размера.
+
+        Args:
+            entry: Запись кэша для сохранения
+        """
+        with self._lock, self._get_connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.url,
+                    entry.etag,
+                    entry.last_modified,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    len(entry.content),
+                    time.time(),
+                ),
+            )
+            connection.execute(
+                """
+                DELETE FROM responses WHERE url IN (
+                    SELECT url FROM (
+                        SELECT url, SUM(size) OVER (
+                            ORDER BY accessed_at DESC
+                        ) AS total_size
+                        FROM responses
+                    )
+                    WHERE total_size > ?
+                )
+                """,
+                (self.max_size,),
+            )
+
+    def touch(self, url: str) -> None:
+        """
+        Обновляет время последнего обращения к записи и учитывает попадание.
+
+        Args:
+            url: URL запроса, ответ на который отдан из кэша
+        """
+        with self._lock, self._get_connection() as connection:
+            self.hits += 1
+            connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+
+    def record_miss(self) -> None:
+        """Учитывает ответ, загруженный с сервера полностью."""
+        with self._lock:
+            self.misses += 1
+
+    def pop_stats(self) -> dict[str, Any]:
+        """
+        Возвращает счетчики попаданий и промахов и сбрасывает их.
+
+        Returns:
+            Словарь с количеством попаданий, промахов и долей попаданий
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            self.hits = self.misses = 0
+
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        """Закрывает соединение с базой кэша."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
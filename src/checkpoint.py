@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+
+class CrawlCheckpoint:
+    """Контрольная точка обхода каталога для продолжения после сбоя.
+
+    Записи дописываются в файл JSON Lines: строка с URL и данными каждой
+    обработанной книги. Страницы каталога в контрольную точку
+    не записываются: при продолжении каталог обходится заново, а
+    запрашиваются только страницы книг, которых в ней нет. Буфер записи
+    сбрасывается на диск каждые ``interval`` книг и при закрытии,
+    поэтому после аварийного завершения теряется не больше ``interval``
+    книг. Оборванная последняя строка при загрузке пропускается.
+
+    Без ``resume`` файл при открытии очищается, поэтому контрольную
+    точку прерванного запуска нужно продолжить до следующего запуска
+    без ``resume`` (например, очередного запуска по расписанию).
+
+    Attributes:
+        path (Path): Путь к файлу контрольной точки.
+        interval (int): Количество книг между сбросами на диск.
+        restored (int): Количество книг, взятых из контрольной точки
+            в текущем запуске.
+    """
+
+    def __init__(self, path: Path, interval: int) -> None:
+        self.path: Path = Path(path)
+        self.interval: int = interval
+        self.restored: int = 0
+        self._books: dict[str, dict[str, Any]] = {}
+        self._unsynced: int = 0
+        self._file = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def open(self, resume: bool = False) -> None:
+        """Открывает контрольную точку для записи.
+
+        Args:
+            resume (bool, optional): Загрузить ли сохраненную ранее
+                контрольную точку и продолжить её. Иначе файл очищается.
+                Значение по умолчанию - False.
+        """
+        self._books = {}
+        self.restored = 0
+        if resume and self.path.exists():
+            with open(self.path, encoding="utf-8") as read:
+                for line in read:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._books[entry["url"]] = entry["book"]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(
+            self.path, mode="a" if resume else "w", encoding="utf-8"
+        )
+
+    def get(self, book_url: str) -> dict[str, Any] | None:
+        """Возвращает данные книги, обработанной до сбоя.
+
+        Args:
+            book_url (str): URL страницы книги.
+
+        Returns:
+            dict[str, Any] | None: Данные книги или None, если книга
+                в контрольную точку не попала.
+        """
+        book = self._books.get(book_url)
+        if book is not None:
+            with self._lock:
+                self.restored += 1
+        return book
+
+    def add(self, book_url: str, book: dict[str, Any]) -> None:
+        """Дописывает обработанную книгу в контрольную точку.
+
+        Args:
+            book_url (str): URL страницы книги.
+            book (dict[str, Any]): Данные книги.
+        """
+        line = json.dumps({"url": book_url, "book": book}, ensure_ascii=False)
+        with self._lock:
+            self._books[book_url] = book
+            self._file.write(line + "\n")
+            self._unsynced += 1
+            if self._unsynced >= self.interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        """Сбрасывает буфер записи на диск. Вызывается под блокировкой."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """Сбрасывает несохраненные записи и закрывает файл."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Закрывает и удаляет контрольную точку после успешного обхода."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,447 @@
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterable
+from dataclasses import asdict, fields, replace
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, TextIO
+
+from config import ScraperConfig, scraper_conf
+from constants import (
+    IMAGES_INDEX_FILENAME,
+    OUTPUT_FORMAT_COLUMNAR,
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSONL,
+    OUTPUT_FORMAT_SQLITE,
+    SCRAPE_MODE_LISTING,
+    SCRAPE_MODES,
+    SNAPSHOT_META_FILENAME,
+)
+from models import Book
+from scheduler import JobScheduler
+from storage import SqliteBooksStorage, read_json_lines
+
+EXPORT_FORMAT_CSV: str = "csv"
+EXPORT_FORMATS: tuple[str, ...] = (
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSONL,
+    EXPORT_FORMAT_CSV,
+)
+SOURCE_FORMATS: tuple[str, ...] = (
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSONL,
+    OUTPUT_FORMAT_SQLITE,
+    OUTPUT_FORMAT_COLUMNAR,
+)
+
+# Модули парсера (bs4, requests, numpy и синглтоны HTTP-клиента)
+# импортируются внутри команд, которым они нужны, поэтому команды
+# status и export запускаются без их загрузки.
+
+
+def get_source_path(config: ScraperConfig, source: str) -> Path:
+    """Возвращает путь сохраненных книг для формата из конфигурации.
+
+    Args:
+        config (ScraperConfig): Конфигурация парсера.
+        source (str): Формат сохранения: "json", "jsonl", "sqlite" или
+            "columnar".
+
+    Returns:
+        Path: Путь к файлу, базе или директории снимков.
+    """
+    return Path(
+        {
+            OUTPUT_FORMAT_JSON: config.file_path,
+            OUTPUT_FORMAT_JSONL: config.jsonl_file_path,
+            OUTPUT_FORMAT_SQLITE: config.sqlite_path,
+            OUTPUT_FORMAT_COLUMNAR: config.snapshots_dir_path,
+        }[source]
+    )
+
+
+def get_latest_snapshot(snapshots_dir_path: Path) -> Path | None:
+    """Находит последний по имени столбцовый снимок.
+
+    Args:
+        snapshots_dir_path (Path): Директория снимков.
+
+    Returns:
+        Path | None: Директория снимка или None, если снимков нет.
+    """
+    meta_paths = sorted(
+        Path(snapshots_dir_path).glob(f"*/{SNAPSHOT_META_FILENAME}")
+    )
+    return meta_paths[-1].parent if meta_paths else None
+
+
+def load_books(
+    source: str, path: Path, snapshot: str | None = None
+) -> list[dict[str, Any]]:
+    """Читает сохраненные книги.
+
+    Args:
+        source (str): Формат сохранения: "json", "jsonl", "sqlite" или
+            "columnar".
+        path (Path): Путь к файлу, базе или директории снимков.
+        snapshot (str | None, optional): Имя снимка для формата
+            "columnar". Значение по умолчанию - None (последний снимок).
+
+    Raises:
+        FileNotFoundError: Если сохраненных книг нет.
+
+    Returns:
+        list[dict[str, Any]]: Список словарей с данными о книгах.
+    """
+    if source == OUTPUT_FORMAT_COLUMNAR:
+        snapshot_path = (
+            path / snapshot if snapshot else get_latest_snapshot(path)
+        )
+        if snapshot_path is None:
+            raise FileNotFoundError(f"В {path} нет столбцовых снимков")
+        from columnar import ColumnarSnapshot, books_from_snapshot
+
+        return books_from_snapshot(ColumnarSnapshot(snapshot_path))
+
+    if not path.exists():
+        raise FileNotFoundError(f"Файл {path} не найден")
+    if source == OUTPUT_FORMAT_SQLITE:
+        with SqliteBooksStorage(path) as storage:
+            return list(storage.query())
+    if source == OUTPUT_FORMAT_JSONL:
+        return read_json_lines(path)
+    with open(path, encoding="utf-8") as read:
+        return json.load(read)
+
+
+def write_books(
+    books: Iterable[dict[str, Any]], export_format: str, output: TextIO
+) -> None:
+    """Записывает книги в поток в выбранном формате.
+
+    Args:
+        books (Iterable[dict[str, Any]]): Словари с данными о книгах.
+        export_format (str): Формат: "json", "jsonl" или "csv". В CSV
+            каждая книга записывается строкой с полями ``Book``.
+        output (TextIO): Поток для записи.
+    """
+    if export_format == OUTPUT_FORMAT_JSON:
+        json.dump(list(books), output, ensure_ascii=False, indent=2)
+        output.write("\n")
+    elif export_format == OUTPUT_FORMAT_JSONL:
+        for book in books:
+            output.write(json.dumps(book, ensure_ascii=False) + "\n")
+    else:
+        writer = csv.DictWriter(
+            output, fieldnames=[field.name for field in fields(Book)]
+        )
+        writer.writeheader()
+        for book in books:
+            writer.writerow(asdict(Book.from_dict(book)))
+
+
+def get_status(config: ScraperConfig) -> dict[str, Any]:
+    """Собирает сведения о результатах последних запусков.
+
+    Читает только метаданные сохраненных файлов, не загружая модули
+    парсера.
+
+    Args:
+        config (ScraperConfig): Конфигурация парсера.
+
+    Returns:
+        dict[str, Any]: Формат и путь результатов, время их изменения,
+            количество книг, последний столбцовый снимок, наличие
+            контрольной точки прерванного запуска и количество
+            сохраненных обложек.
+    """
+    source = config.output_format
+    path = get_source_path(config, source)
+    status = {"output_format": source, "output_path": str(path)}
+
+    if source == OUTPUT_FORMAT_COLUMNAR:
+        path = get_latest_snapshot(path)
+        books_count = (
+            json.loads((path / SNAPSHOT_META_FILENAME).read_text())["rows"]
+            if path
+            else None
+        )
+    elif path.exists():
+        books_count = len(load_books(source, path))
+    else:
+        books_count = None
+    status["books"] = books_count
+    status["updated_at"] = (
+        datetime.fromtimestamp(path.stat().st_mtime).isoformat(
+            timespec="seconds"
+        )
+        if path and path.exists()
+        else None
+    )
+
+    latest_snapshot = get_latest_snapshot(config.snapshots_dir_path)
+    status["latest_snapshot"] = (
+        latest_snapshot.name if latest_snapshot else None
+    )
+    status["interrupted_run"] = bool(
+        config.checkpoint_path and Path(config.checkpoint_path).exists()
+    )
+    images_index_path = Path(config.images_dir_path) / IMAGES_INDEX_FILENAME
+    status["images"] = (
+        len(json.loads(images_index_path.read_text(encoding="utf-8")))
+        if images_index_path.exists()
+        else None
+    )
+    return status
+
+
+def run_once(config: ScraperConfig, resume: bool = False) -> None:
+    """Выполняет один полный парсинг каталога с сохранением результатов.
+
+    Args:
+        config (ScraperConfig): Конфигурация парсера.
+        resume (bool, optional): Продолжить ли прерванный обход.
+            Значение по умолчанию - False.
+    """
+    from adapters import scraper_http_manager
+    from scraper import Scraper
+
+    Scraper(scraper_http_manager, config).scrape_books(
+        is_save=True, resume=resume
+    )
+
+
+def get_scheduler(config: ScraperConfig) -> JobScheduler:
+    """Создает планировщик задач парсинга.
+
+    Ежедневный обход каталога запускается в ``start_time``, а при
+    положительном ``listing_refresh_interval`` (по умолчанию выключено)
+    через каждые ``listing_refresh_interval`` секунд цены и наличие книг
+    обновляются по карточкам каталога (``scrape_mode`` равный "listing")
+    в базе SQLite. Вместе задачи не превышают общего бюджета
+    ``concurrency_budget``.
+
+    Обновление по карточкам выполняется своим парсером с отдельным
+    HTTP-клиентом без дискового кэша и архива, без контрольной точки,
+    обложек и профилирования, а метрики сохраняет в поддиректорию
+    "listing" директории ``metrics_dir_path``, поэтому не мешает
+    одновременно идущему обходу каталога.
+
+    Args:
+        config (ScraperConfig): Конфигурация парсера.
+
+    Returns:
+        JobScheduler: Планировщик с добавленными задачами.
+    """
+    from adapters import HttpClientManager, scraper_http_manager
+    from config import session_conf
+    from scraper import Scraper
+
+    scheduler = JobScheduler(
+        workers=config.scheduler_workers,
+        concurrency_budget=config.concurrency_budget,
+    )
+    scheduler.every_day(
+        "crawl",
+        config.start_time,
+        partial(
+            Scraper(scraper_http_manager, config).scrape_books, is_save=True
+        ),
+        slots=config.max_workers,
+    )
+    if config.listing_refresh_interval > 0:
+        listing_config = replace(
+            config,
+            scrape_mode=SCRAPE_MODE_LISTING,
+            output_format=OUTPUT_FORMAT_SQLITE,
+            checkpoint_path=None,
+            frontier_dir_path=None,
+            download_images=False,
+            profiling=False,
+            metrics_dir_path=Path(config.metrics_dir_path) / "listing",
+        )
+        listing_http_manager = HttpClientManager(
+            replace(session_conf, cache_path=None, archive_mode=None)
+        )
+        scheduler.every(
+            "listing",
+            config.listing_refresh_interval,
+            partial(
+                Scraper(listing_http_manager, listing_config).scrape_books,
+                is_save=True,
+            ),
+            slots=listing_config.max_workers,
+        )
+    return scheduler
+
+
+def run_daemon(config: ScraperConfig) -> None:
+    """Запускает парсинг по расписанию до остановки процесса.
+
+    Запуски по расписанию не продолжают прерванный обход: каждый из них
+    начинается заново и очищает контрольную точку ``checkpoint_path``.
+    Чтобы не потерять её, прерванный обход продолжают командой
+    ``run-once --resume`` до следующего запуска по расписанию.
+
+    Args:
+        config (ScraperConfig): Конфигурация парсера.
+    """
+    try:
+        get_scheduler(config).run()
+    except KeyboardInterrupt:
+        print("Ручная остановка работы программы")
+
+
+def _get_config(args: argparse.Namespace) -> ScraperConfig:
+    """Применяет к конфигурации общие параметры командной строки.
+
+    Args:
+        args (argparse.Namespace): Разобранные аргументы.
+
+    Returns:
+        ScraperConfig: Конфигурация парсера.
+    """
+    overrides = {}
+    if getattr(args, "profile", False):
+        overrides["profiling"] = True
+    if getattr(args, "format", None):
+        overrides["output_format"] = args.format
+    if getattr(args, "workers", None):
+        overrides["max_workers"] = args.workers
+    if getattr(args, "mode", None):
+        overrides["scrape_mode"] = args.mode
+    if getattr(args, "listing_interval", None) is not None:
+        overrides["listing_refresh_interval"] = args.listing_interval
+    return replace(scraper_conf, **overrides)
+
+
+def _command_run_once(args: argparse.Namespace) -> None:
+    run_once(_get_config(args), resume=args.resume)
+
+
+def _command_daemon(args: argparse.Namespace) -> None:
+    run_daemon(_get_config(args))
+
+
+def _command_export(args: argparse.Namespace) -> None:
+    config = _get_config(args)
+    source = args.source or config.output_format
+    books = load_books(
+        source, args.path or get_source_path(config, source), args.snapshot
+    )
+    if args.output is None:
+        write_books(books, args.to, sys.stdout)
+        return
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, mode="w", encoding="utf-8", newline="") as write:
+        write_books(books, args.to, write)
+
+
+def _command_status(args: argparse.Namespace) -> None:
+    for key, value in get_status(_get_config(args)).items():
+        print(f"{key}: {value}")
+
+
+def _command_bench(args: argparse.Namespace) -> None:
+    from benchmark import main as benchmark_main
+
+    benchmark_main(args.benchmark_args)
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    """Создает парсер аргументов командной строки.
+
+    Returns:
+        argparse.ArgumentParser: Парсер с подкомандами run-once, daemon,
+            export, status и bench.
+    """
+    arg_parser = argparse.ArgumentParser(
+        prog="books-scraper",
+        description="Парсер каталога books.toscrape.com",
+    )
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    for name, handler, help_text in (
+        ("run-once", _command_run_once, "Один парсинг каталога"),
+        ("daemon", _command_daemon, "Парсинг по расписанию"),
+    ):
+        command = subparsers.add_parser(name, help=help_text)
+        command.set_defaults(handler=handler)
+        command.add_argument(
+            "--profile",
+            action="store_true",
+            help="Профилировать запуски (cProfile, tracemalloc, стеки вызовов)",
+        )
+        command.add_argument("--format", choices=SOURCE_FORMATS)
+        command.add_argument("--workers", type=int)
+        command.add_argument(
+            "--mode",
+            choices=SCRAPE_MODES,
+            help="Режим обхода: страницы всех книг (full), только карточки "
+            "каталога (listing) или страницы только новых книг (hybrid)",
+        )
+    subparsers.choices["run-once"].add_argument(
+        "--resume",
+        action="store_true",
+        help="Продолжить прерванный обход с контрольной точки",
+    )
+    subparsers.choices["daemon"].add_argument(
+        "--listing-interval",
+        type=float,
+        help="Интервал обновления цен и наличия по карточкам каталога "
+        "в секундах (0 - не обновлять)",
+    )
+
+    export = subparsers.add_parser("export", help="Выгрузка сохраненных книг")
+    export.set_defaults(handler=_command_export)
+    export.add_argument(
+        "--source",
+        choices=SOURCE_FORMATS,
+        help="Формат сохраненных книг (по умолчанию output_format)",
+    )
+    export.add_argument(
+        "--path", type=Path, help="Файл, база или директория снимков"
+    )
+    export.add_argument("--snapshot", help="Имя столбцового снимка")
+    export.add_argument(
+        "--to", choices=EXPORT_FORMATS, default=OUTPUT_FORMAT_JSONL
+    )
+    export.add_argument(
+        "--output", type=Path, help="Файл выгрузки (по умолчанию stdout)"
+    )
+
+    status = subparsers.add_parser(
+        "status", help="Сведения о последних запусках"
+    )
+    status.set_defaults(handler=_command_status)
+    status.add_argument("--format", choices=SOURCE_FORMATS)
+
+    bench = subparsers.add_parser(
+        "bench",
+        help="Замер производительности (аргументы передаются benchmark.py)",
+    )
+    bench.set_defaults(handler=_command_bench)
+    bench.add_argument("benchmark_args", nargs=argparse.REMAINDER)
+    return arg_parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Выполняет команду командной строки.
+
+    Args:
+        argv (list[str] | None, optional): Аргументы командной строки.
+            Значение по умолчанию - None (``sys.argv``).
+    """
+    arg_parser = get_arg_parser()
+    args = arg_parser.parse_args(argv)
+    try:
+        args.handler(args)
+    except (FileNotFoundError, ValueError) as error:
+        arg_parser.exit(1, f"{error}\n")
+
+
+if __name__ == "__main__":
+    main()
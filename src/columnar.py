@@ -0,0 +1,280 @@
+import json
+import math
+import shutil
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from constants import SNAPSHOT_META_FILENAME
+from models import Book, book_to_dict
+
+SNAPSHOT_FORMAT_VERSION: int = 1
+
+NUMERIC_COLUMNS: dict[str, tuple[str, Any]] = {
+    "price": ("float64", np.nan),
+    "price_excl_tax": ("float64", np.nan),
+    "price_incl_tax": ("float64", np.nan),
+    "tax": ("float64", np.nan),
+    "available": ("int32", -1),
+    "in_stock": ("int8", -1),
+    "rating": ("int8", 0),
+    "number_of_reviews": ("int32", -1),
+}
+STRING_COLUMNS: tuple[str, ...] = (
+    "title",
+    "upc",
+    "product_type",
+    "description",
+    "image",
+)
+
+
+def _save_string_column(
+    dir_path: Path, name: str, values: list[str | None]
+) -> None:
+    """Сохраняет строковый столбец как общий буфер UTF-8 и смещения.
+
+    Args:
+        dir_path (Path): Директория снимка.
+        name (str): Имя столбца.
+        values (list[str | None]): Значения столбца.
+    """
+    encoded = [(value or "").encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="int64")
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    np.save(dir_path / f"{name}.offsets.npy", offsets)
+    np.save(
+        dir_path / f"{name}.data.npy",
+        np.frombuffer(b"".join(encoded), dtype="uint8"),
+    )
+
+
+def save_columnar(
+    books: Iterable[dict[str, Any] | Book], dir_path: Path
+) -> int:
+    """Сохраняет книги в столбцовый снимок из файлов ``.npy``.
+
+    Числовые поля (цены, налог, наличие, рейтинг, отзывы) сохраняются
+    отдельными массивами, отсутствующие значения кодируются как NaN для
+    сумм, -1 для количеств и признака наличия и 0 для рейтинга.
+    Строковые поля (в том числе путь к обложке) хранятся как буфер UTF-8
+    и массив смещений, поэтому все файлы снимка можно открыть через
+    отображение в память.
+
+    Args:
+        books (Iterable[dict[str, Any] | Book]): Словари или записи книг.
+        dir_path (Path): Директория снимка. Существующий снимок
+            перезаписывается.
+
+    Returns:
+        int: Количество сохраненных книг.
+    """
+    records = [
+        book if isinstance(book, Book) else Book.from_dict(book)
+        for book in books
+    ]
+    dir_path = Path(dir_path)
+    if dir_path.exists():
+        shutil.rmtree(dir_path)
+    dir_path.mkdir(parents=True)
+
+    for name, (dtype, missing) in NUMERIC_COLUMNS.items():
+        column = np.array(
+            [
+                missing
+                if getattr(record, name) is None
+                else getattr(record, name)
+                for record in records
+            ],
+            dtype=dtype,
+        )
+        np.save(dir_path / f"{name}.npy", column)
+
+    for name in STRING_COLUMNS:
+        _save_string_column(
+            dir_path, name, [getattr(record, name) for record in records]
+        )
+
+    with open(
+        dir_path / SNAPSHOT_META_FILENAME, "w", encoding="utf-8"
+    ) as write:
+        json.dump(
+            {
+                "version": SNAPSHOT_FORMAT_VERSION,
+                "rows": len(records),
+                "currency": records[0].currency if records else "",
+                "numeric_columns": list(NUMERIC_COLUMNS),
+                "string_columns": list(STRING_COLUMNS),
+            },
+            write,
+            ensure_ascii=False,
+        )
+    return len(records)
+
+
+def export_json_to_columnar(json_path: Path, dir_path: Path) -> int:
+    """Преобразует JSON-файл с книгами в столбцовый снимок.
+
+    Args:
+        json_path (Path): Путь к JSON-файлу, сохраненному парсером.
+        dir_path (Path): Директория снимка.
+
+    Returns:
+        int: Количество сохраненных книг.
+    """
+    with open(json_path, encoding="utf-8") as read:
+        return save_columnar(json.load(read), dir_path)
+
+
+class StringColumn:
+    """Строковый столбец снимка, декодирующий значения по требованию.
+
+    Attributes:
+        data (np.ndarray): Отображенный в память буфер UTF-8.
+        offsets (np.ndarray): Смещения начала каждого значения в буфере.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray) -> None:
+        self.data: np.ndarray = data
+        self.offsets: np.ndarray = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:end].tobytes().decode()
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class ColumnarSnapshot:
+    """Чтение столбцового снимка через отображение файлов в память.
+
+    Столбцы открываются лениво с ``mmap_mode="r"``, поэтому агрегации по
+    отдельным столбцам не требуют чтения и разбора остальных данных.
+
+    Attributes:
+        dir_path (Path): Директория снимка.
+        meta (dict[str, Any]): Метаданные снимка.
+    """
+
+    def __init__(self, dir_path: Path) -> None:
+        self.dir_path: Path = Path(dir_path)
+        with open(
+            self.dir_path / SNAPSHOT_META_FILENAME, encoding="utf-8"
+        ) as read:
+            self.meta: dict[str, Any] = json.load(read)
+        self._columns: dict[str, np.ndarray] = {}
+        self._strings: dict[str, StringColumn] = {}
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def column(self, name: str) -> np.ndarray:
+        """Открывает числовой столбец снимка.
+
+        Args:
+            name (str): Имя столбца, например "price" или "rating".
+
+        Returns:
+            np.ndarray: Отображенный в память массив значений.
+        """
+        if name not in self.meta["numeric_columns"]:
+            raise KeyError(f"Числовой столбец {name} отсутствует в снимке")
+        if name not in self._columns:
+            self._columns[name] = np.load(
+                self.dir_path / f"{name}.npy", mmap_mode="r"
+            )
+        return self._columns[name]
+
+    def strings(self, name: str) -> StringColumn:
+        """Открывает строковый столбец снимка.
+
+        Args:
+            name (str): Имя столбца, например "title" или "upc".
+
+        Returns:
+            StringColumn: Столбец, декодирующий строки по требованию.
+        """
+        if name not in self.meta["string_columns"]:
+            raise KeyError(f"Строковый столбец {name} отсутствует в снимке")
+        if name not in self._strings:
+            self._strings[name] = StringColumn(
+                np.load(self.dir_path / f"{name}.data.npy", mmap_mode="r"),
+                np.load(self.dir_path / f"{name}.offsets.npy", mmap_mode="r"),
+            )
+        return self._strings[name]
+
+    def book(self, index: int) -> Book:
+        """Собирает запись о книге из всех столбцов снимка.
+
+        Столбцы, отсутствующие в снимках предыдущих версий (например,
+        признак наличия или путь к обложке), пропускаются.
+
+        Args:
+            index (int): Номер книги в снимке.
+
+        Returns:
+            Book: Запись о книге.
+        """
+        values = {}
+        for name, (_, missing) in NUMERIC_COLUMNS.items():
+            if name not in self.meta["numeric_columns"]:
+                continue
+            value = self.column(name)[index].item()
+            is_missing = (
+                math.isnan(value)
+                if isinstance(value, float)
+                else value == missing
+            )
+            values[name] = None if is_missing else value
+        for name in STRING_COLUMNS:
+            if name not in self.meta["string_columns"]:
+                continue
+            values[name] = self.strings(name)[index] or None
+        if values.get("in_stock") is not None:
+            values["in_stock"] = bool(values["in_stock"])
+
+        return Book(
+            title=values.pop("title") or "",
+            currency=self.meta["currency"],
+            **values,
+        )
+
+
+def iter_snapshots(root_path: Path) -> Iterator[ColumnarSnapshot]:
+    """Перебирает столбцовые снимки в директории в порядке их имен.
+
+    Args:
+        root_path (Path): Директория, содержащая снимки.
+
+    Yields:
+        ColumnarSnapshot: Снимок из очередной поддиректории.
+    """
+    for meta_path in sorted(
+        Path(root_path).glob(f"*/{SNAPSHOT_META_FILENAME}")
+    ):
+        yield ColumnarSnapshot(meta_path.parent)
+
+
+def books_from_snapshot(snapshot: ColumnarSnapshot) -> list[dict[str, Any]]:
+    """Восстанавливает словари книг из столбцового снимка.
+
+    Args:
+        snapshot (ColumnarSnapshot): Снимок.
+
+    Returns:
+        list[dict[str, Any]]: Список словарей с данными о книгах.
+    """
+    return [
+        book_to_dict(snapshot.book(index)) for index in range(len(snapshot))
+    ]
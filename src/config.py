@@ -1,20 +1,69 @@
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
 from constants import (
+    ARCHIVE_DIR_PATH,
     BACKOFF_FACTOR,
     BASE_URL,
-    CLEAN_CURRENCY,
+    BOOK_PAGE_PARSE_ONLY,
+    BOOKS_INDEX_PATH,
+    CATALOG_DISCOVERY_SEQUENTIAL,
+    CATALOG_PAGE_PARSE_ONLY,
+    CATALOGUE_PAGE_TEMPLATE,
+    CHECKPOINT_INTERVAL,
+    CHECKPOINT_PATH,
+    CONCURRENCY_BUDGET,
+    CONCURRENCY_DECREASE_FACTOR,
     DEFAULT_HEADERS,
     EMPTY_DATA,
     FILE_PATH,
+    FRONTIER_BUFFER_SIZE,
+    FRONTIER_EXPECTED_URLS,
+    FRONTIER_FALSE_POSITIVE_RATE,
+    HOST_BURST,
+    HOST_RATE,
+    HTML_PARSER,
+    HTTP_CACHE_MAX_SIZE,
+    HTTP_CACHE_PATH,
+    IMAGE_CHUNK_SIZE,
+    IMAGE_WORKERS,
+    IMAGES_DIR_PATH,
+    INITIAL_CONCURRENCY,
+    JSONL_FILE_PATH,
+    LATENCY_TOLERANCE,
     LINK_NOT_FOUND,
+    LISTING_REFRESH_INTERVAL,
+    MAX_CONCURRENCY,
+    MAX_CONNECTIONS_PER_HOST,
     MAX_RETRIES,
+    MAX_WORKERS,
+    METRICS_DIR_PATH,
+    MIN_CONCURRENCY,
+    OUTPUT_FORMAT_JSON,
+    PARSE_BATCH_DELAY,
+    PARSE_BATCH_SIZE,
+    PARSE_WORKERS,
+    POOL_CONNECTIONS,
+    PROFILE_DIR_PATH,
+    PROFILE_SAMPLE_INTERVAL,
     RATING_MAP,
+    RESPONSE_ENCODING,
     RESPONSE_TIMEOUT,
     RETRY_STATUSES,
     SAVE_DIR_PATH,
+    SCHEDULER_WORKERS,
+    SCRAPE_MODE_FULL,
+    SHARD_LEASE_TIMEOUT,
+    SHARD_MAX_ATTEMPTS,
+    SHARD_QUEUE_PATH,
+    SHARD_WORKERS,
+    SHARDS_DIR_PATH,
+    SNAPSHOT_NAME_FORMAT,
+    SNAPSHOTS_DIR_PATH,
+    SQLITE_FILE_PATH,
     START_CATALOGUE_PAGE_URL,
+    STORAGE_BATCH_SIZE,
     TASK_START_TIME,
     UNKNOWN_RATING,
     UNKNOWN_RATING_VALUE,
@@ -31,6 +80,21 @@ class SessionConfig:
     default_headers: dict[str, Any] = field(
         default_factory=lambda: DEFAULT_HEADERS.copy()
     )
+    cache_path: Path | None = None
+    cache_max_size: int = HTTP_CACHE_MAX_SIZE
+    archive_path: Path = ARCHIVE_DIR_PATH
+    archive_mode: str | None = None
+    adaptive_rate_limit: bool = False
+    host_rate: float | None = HOST_RATE
+    host_burst: int = HOST_BURST
+    initial_concurrency: int = INITIAL_CONCURRENCY
+    min_concurrency: int = MIN_CONCURRENCY
+    max_concurrency: int = MAX_CONCURRENCY
+    concurrency_decrease_factor: float = CONCURRENCY_DECREASE_FACTOR
+    latency_tolerance: float = LATENCY_TOLERANCE
+    pool_connections: int = POOL_CONNECTIONS
+    pool_maxsize: int | None = None
+    keep_connections_alive: bool = True
 
 
 @dataclass
@@ -39,15 +103,66 @@ class ScraperConfig:
 
     base_url: str = BASE_URL
     start_catalog_page: str = START_CATALOGUE_PAGE_URL
+    catalog_page_template: str = CATALOGUE_PAGE_TEMPLATE
+    catalog_discovery: str = CATALOG_DISCOVERY_SEQUENTIAL
+    scrape_mode: str = SCRAPE_MODE_FULL
 
     response_timeout: int | None = RESPONSE_TIMEOUT
+    response_encoding: str | None = RESPONSE_ENCODING
+
+    parser: str = HTML_PARSER
+    partial_parsing: bool = False
+    catalog_parse_only: dict[str, Any] = field(
+        default_factory=lambda: CATALOG_PAGE_PARSE_ONLY.copy()
+    )
+    book_parse_only: dict[str, Any] = field(
+        default_factory=lambda: BOOK_PAGE_PARSE_ONLY.copy()
+    )
+
+    max_workers: int = MAX_WORKERS
+    max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST
+    parse_workers: int = PARSE_WORKERS
+    parse_batch_size: int = PARSE_BATCH_SIZE
+    parse_batch_delay: float = PARSE_BATCH_DELAY
 
     file_path: str = FILE_PATH
+    jsonl_file_path: str = JSONL_FILE_PATH
+    sqlite_path: Path = SQLITE_FILE_PATH
+    storage_batch_size: int = STORAGE_BATCH_SIZE
+    output_format: str = OUTPUT_FORMAT_JSON
     save_dir_path: str = SAVE_DIR_PATH
+    books_index_path: str = BOOKS_INDEX_PATH
+    snapshots_dir_path: str = SNAPSHOTS_DIR_PATH
+    snapshot_name_format: str = SNAPSHOT_NAME_FORMAT
+    checkpoint_path: Path | None = None
+    checkpoint_interval: int = CHECKPOINT_INTERVAL
+    metrics_enabled: bool = False
+    metrics_dir_path: Path = METRICS_DIR_PATH
+    profiling: bool = False
+    profile_dir_path: Path = PROFILE_DIR_PATH
+    profile_sample_interval: float = PROFILE_SAMPLE_INTERVAL
+    shard_workers: int = SHARD_WORKERS
+    shard_queue_path: Path = SHARD_QUEUE_PATH
+    shard_results_dir_path: Path = SHARDS_DIR_PATH
+    shard_lease_timeout: float = SHARD_LEASE_TIMEOUT
+    shard_max_attempts: int = SHARD_MAX_ATTEMPTS
+    frontier_dir_path: Path | None = None
+    frontier_expected_urls: int = FRONTIER_EXPECTED_URLS
+    frontier_false_positive_rate: float = FRONTIER_FALSE_POSITIVE_RATE
+    frontier_buffer_size: int = FRONTIER_BUFFER_SIZE
+    download_images: bool = False
+    images_dir_path: Path = IMAGES_DIR_PATH
+    image_workers: int = IMAGE_WORKERS
+    image_chunk_size: int = IMAGE_CHUNK_SIZE
+
+    incremental: bool = False
+    as_records: bool = False
 
     start_time: str = TASK_START_TIME
+    scheduler_workers: int = SCHEDULER_WORKERS
+    concurrency_budget: int = CONCURRENCY_BUDGET
+    listing_refresh_interval: float = LISTING_REFRESH_INTERVAL
 
-    clean_currency: str = CLEAN_CURRENCY
     empty_data: str = EMPTY_DATA
     link_not_found: str = LINK_NOT_FOUND
     unknown_rating: str = UNKNOWN_RATING
@@ -57,5 +172,7 @@ class ScraperConfig:
     )
 
 
-session_conf: SessionConfig = SessionConfig()
-scraper_conf: ScraperConfig = ScraperConfig()
+session_conf: SessionConfig = SessionConfig(cache_path=HTTP_CACHE_PATH)
+scraper_conf: ScraperConfig = ScraperConfig(
+    checkpoint_path=CHECKPOINT_PATH, metrics_enabled=True
+)
@@ -1,17 +1,81 @@
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Any
 
 BASE_DIR = Path(__file__).parent.parent
 
 BOOKS_DATA_FILENAME = "books_data.txt"
+BOOKS_DATA_JSONL_FILENAME = "books_data.jsonl"
 SAVE_DIR_PATH = BASE_DIR / "artifacts"
 FILE_PATH = SAVE_DIR_PATH / BOOKS_DATA_FILENAME
+JSONL_FILE_PATH = SAVE_DIR_PATH / BOOKS_DATA_JSONL_FILENAME
+HTTP_CACHE_PATH = SAVE_DIR_PATH / "http_cache.sqlite3"
+SQLITE_FILE_PATH = SAVE_DIR_PATH / "books.sqlite3"
+STORAGE_BATCH_SIZE: int = 500
+BOOKS_INDEX_PATH = SAVE_DIR_PATH / "books_index.json"
+SNAPSHOTS_DIR_PATH = SAVE_DIR_PATH / "snapshots"
+SNAPSHOT_NAME_FORMAT: str = "%Y-%m-%d"
+SNAPSHOT_META_FILENAME: str = "meta.json"
+ARCHIVE_DIR_PATH = SAVE_DIR_PATH / "archive"
+CHECKPOINT_PATH = SAVE_DIR_PATH / "checkpoint.jsonl"
+CHECKPOINT_INTERVAL: int = 20
+METRICS_DIR_PATH = SAVE_DIR_PATH / "metrics"
+PROFILE_DIR_PATH = SAVE_DIR_PATH / "profiles"
+PROFILE_SAMPLE_INTERVAL: float = 0.005
+SHARDS_DIR_PATH = SAVE_DIR_PATH / "shards"
+SHARD_QUEUE_PATH = SHARDS_DIR_PATH / "queue.sqlite3"
+SHARD_WORKERS: int = 4
+SHARD_LEASE_TIMEOUT: float = 120.0
+SHARD_MAX_ATTEMPTS: int = 3
+SHARD_POLL_INTERVAL: float = 1.0
+FRONTIER_EXPECTED_URLS: int = 100_000
+FRONTIER_FALSE_POSITIVE_RATE: float = 0.001
+FRONTIER_BUFFER_SIZE: int = 10_000
+IMAGES_DIR_PATH = SAVE_DIR_PATH / "images"
+IMAGES_INDEX_FILENAME: str = "index.json"
+IMAGE_WORKERS: int = 4
+IMAGE_CHUNK_SIZE: int = 64 * 1024
+
+ARCHIVE_MODE_RECORD: str = "record"
+ARCHIVE_MODE_REPLAY: str = "replay"
 
 BASE_URL: str = "https://books.toscrape.com/catalogue/"
-START_CATALOGUE_PAGE_URL: str = BASE_URL + "page-1.html"
+CATALOGUE_PAGE_TEMPLATE: str = "page-{}.html"
+START_CATALOGUE_PAGE_URL: str = BASE_URL + CATALOGUE_PAGE_TEMPLATE.format(1)
+
+CATALOG_DISCOVERY_SEQUENTIAL: str = "sequential"
+CATALOG_DISCOVERY_FANOUT: str = "fanout"
+
+SCRAPE_MODE_FULL: str = "full"
+SCRAPE_MODE_LISTING: str = "listing"
+SCRAPE_MODE_HYBRID: str = "hybrid"
+SCRAPE_MODES: tuple[str, ...] = (
+    SCRAPE_MODE_FULL,
+    SCRAPE_MODE_LISTING,
+    SCRAPE_MODE_HYBRID,
+)
+
+HTML_PARSER: str = "html.parser"
+LXML_PARSER: str = "lxml"
+HTML_PARSERS: tuple[str, ...] = (HTML_PARSER, LXML_PARSER)
+CATALOG_PAGE_PARSE_ONLY: dict[str, Any] = {"name": "section"}
+BOOK_PAGE_PARSE_ONLY: dict[str, Any] = {
+    "name": "article",
+    "class_": "product_page",
+}
+
+OUTPUT_FORMAT_JSON: str = "json"
+OUTPUT_FORMAT_JSONL: str = "jsonl"
+OUTPUT_FORMAT_COLUMNAR: str = "columnar"
+OUTPUT_FORMAT_SQLITE: str = "sqlite"
 
-CLEAN_CURRENCY: str = "Â"
+RESPONSE_ENCODING: str = "utf-8"
 RESPONSE_TIMEOUT: int = 10
+MAX_WORKERS: int = 1
+MAX_CONNECTIONS_PER_HOST: int = 100
+PARSE_WORKERS: int = 0
+PARSE_BATCH_SIZE: int = 8
+PARSE_BATCH_DELAY: float = 0.02
 
 EMPTY_DATA: str = "Нет данных"
 LINK_NOT_FOUND: str = "Ссылка перехода отсутствует"
@@ -28,12 +92,28 @@ RATING_MAP: dict[str, str] = {
 }
 
 TASK_START_TIME: str = "19:00"
-DELAY: int = 10
+SCHEDULER_WORKERS: int = 2
+CONCURRENCY_BUDGET: int = 16
+LISTING_REFRESH_INTERVAL: float = 0
 TIMEOUT: int | None = 30
 MAX_RETRIES: int | None = 3
 BACKOFF_FACTOR: float | None = 0.5
-RETRY_STATUSES: tuple[int] | None = (500, 502, 503, 504)
+RETRY_STATUSES: tuple[int] | None = (429, 500, 502, 503, 504)
+HOST_RATE: float | None = None
+HOST_BURST: int = 10
+INITIAL_CONCURRENCY: int = 4
+MIN_CONCURRENCY: int = 1
+MAX_CONCURRENCY: int = 64
+CONCURRENCY_DECREASE_FACTOR: float = 0.5
+LATENCY_TOLERANCE: float = 2.0
+HTTP_CACHE_MAX_SIZE: int = 200 * 1024 * 1024
+POOL_CONNECTIONS: int = 10
+ACCEPT_ENCODING: str = ", ".join(
+    ("gzip", "deflate")
+    + (("br",) if find_spec("brotli") or find_spec("brotlicffi") else ())
+)
 DEFAULT_HEADERS: dict[str, Any] = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": ACCEPT_ENCODING,
 }
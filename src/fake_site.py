@@ -0,0 +1,510 @@
+import gzip
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Self
+
+BOOKS_PER_PAGE: int = 20
+COVER_VARIANTS: int = 8
+COVER_SIZE: int = 16 * 1024
+RATINGS: tuple[str, ...] = ("One", "Two", "Three", "Four", "Five")
+WORDS: tuple[str, ...] = (
+    "light",
+    "attic",
+    "velvet",
+    "soumission",
+    "sharp",
+    "objects",
+    "sapiens",
+    "requiem",
+    "dark",
+    "mountain",
+    "coming",
+    "woman",
+    "boys",
+    "boat",
+    "bible",
+    "black",
+    "maria",
+    "starving",
+    "shakespeare",
+    "sonnets",
+)
+
+CATALOG_PAGE_TEMPLATE: str = """<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+<head>
+  <title>All products | Books to Scrape - Sandbox</title>
+  <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+  <link rel="stylesheet" href="../static/oscar/css/styles.css" />
+</head>
+<body id="default" class="default">
+  <header class="header container-fluid">
+    <div class="page_inner"><div class="row">
+      <div class="col-sm-8 h1"><a href="../index.html">Books to Scrape</a>
+        <small> We love being scraped!</small></div>
+    </div></div>
+  </header>
+  <div class="container-fluid page"><div class="page_inner">
+    <ul class="breadcrumb">
+      <li><a href="../index.html">Home</a></li>
+      <li class="active">All products</li>
+    </ul>
+    <div class="row">
+      <aside class="sidebar col-sm-4 col-md-3">
+        <div class="side_categories"><ul class="nav nav-list"><li>
+          <a href="{root}category/books_1/index.html">Books</a>{categories}
+        </li></ul></div>
+      </aside>
+      <div class="col-sm-8 col-md-9">
+        <div class="page-header action"><h1>All products</h1></div>
+        <form method="get" class="form-horizontal">
+          <strong>{books_count}</strong> results - showing
+          <strong>{first}</strong> to <strong>{last}</strong>.
+        </form>
+        <section>
+          <div class="alert alert-warning" role="alert"><strong>Warning!
+          </strong> This is a demo website for web scraping purposes.</div>
+          <div>
+            <ol class="row">{listings}
+            </ol>
+            <div><ul class="pager">{previous}
+              <li class="current">Page {page} of {pages_count}</li>{next}
+            </ul></div>
+          </div>
+        </section>
+      </div>
+    </div>
+  </div></div>
+  <footer class="footer container-fluid"></footer>
+</body>
+</html>
+"""
+
+LISTING_TEMPLATE: str = """
+    <li class="col-xs-6 col-sm-4 col-md-3 col-lg-3">
+      <article class="product_pod">
+        <div class="image_container">
+          <a href="{root}{slug}/index.html"><img src="{root}../media/cache/{image}"
+             alt="{title}" class="thumbnail"></a>
+        </div>
+        <p class="star-rating {rating}">
+          <i class="icon-star"></i><i class="icon-star"></i>
+        </p>
+        <h3><a href="{root}{slug}/index.html" title="{title}">{short_title}</a></h3>
+        <div class="product_price">
+          <p class="price_color">£{price}</p>
+          <p class="instock availability">
+            <i class="icon-ok"></i>
+            In stock
+          </p>
+          <form><button type="submit" class="btn btn-primary btn-block"
+            data-loading-text="Adding...">Add to basket</button></form>
+        </div>
+      </article>
+    </li>"""
+
+BOOK_PAGE_TEMPLATE: str = """<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+<head>
+  <title>{title} | Books to Scrape - Sandbox</title>
+  <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+</head>
+<body id="default" class="default">
+  <header class="header container-fluid">
+    <div class="page_inner"><div class="row">
+      <div class="col-sm-8 h1"><a href="../../index.html">Books to Scrape</a>
+        <small> We love being scraped!</small></div>
+    </div></div>
+  </header>
+  <div class="container-fluid page"><div class="page_inner">
+    <ul class="breadcrumb">
+      <li><a href="../../index.html">Home</a></li>
+      <li><a href="../category/books_1/index.html">Books</a></li>
+      <li class="active">{title}</li>
+    </ul>
+    <div id="messages"></div>
+    <div class="content"><div id="promotions"></div>
+      <div id="content_inner">
+<article class="product_page"><!-- Start of product page -->
+  <div class="row">
+    <div class="col-sm-6">
+      <div id="product_gallery" class="carousel"><div class="thumbnail">
+        <div class="carousel-inner"><div class="item active">
+          <img src="../../media/cache/{image}" alt="{title}" />
+        </div></div>
+      </div></div>
+    </div>
+    <div class="col-sm-6 product_main">
+      <h1>{title}</h1>
+      <p class="price_color">£{price}</p>
+      <p class="instock availability">
+        <i class="icon-ok"></i>
+        In stock ({available} available)
+      </p>
+      <p class="star-rating {rating}">
+        <i class="icon-star"></i><i class="icon-star"></i>
+      </p>
+      <hr/>
+    </div>
+  </div>
+  <div id="product_description" class="sub-header">
+    <h2>Product Description</h2>
+  </div>
+  <p>{description}</p>
+  <div class="sub-header"><h2>Product Information</h2></div>
+  <table class="table table-striped">
+    <tr><th>UPC</th><td>{upc}</td></tr>
+    <tr><th>Product Type</th><td>Books</td></tr>
+    <tr><th>Price (excl. tax)</th><td>£{price}</td></tr>
+    <tr><th>Price (incl. tax)</th><td>£{price}</td></tr>
+    <tr><th>Tax</th><td>£0.00</td></tr>
+    <tr><th>Availability</th><td>In stock ({available} available)</td></tr>
+    <tr><th>Number of reviews</th><td>0</td></tr>
+  </table>
+</article><!-- End of product page -->
+      </div>
+    </div>
+  </div></div>
+  <footer class="footer container-fluid"></footer>
+</body>
+</html>
+"""
+
+
+def _render_catalog_page(
+    books: list[dict[str, str]],
+    page: int,
+    pages_count: int,
+    books_count: int,
+    books_per_page: int,
+    root: str,
+    categories: str,
+) -> bytes:
+    """Формирует страницу каталога или категории.
+
+    Args:
+        books (list[dict[str, str]]): Данные книг страницы.
+        page (int): Номер страницы, начиная с 1.
+        pages_count (int): Количество страниц каталога или категории.
+        books_count (int): Количество книг в каталоге или категории.
+        books_per_page (int): Количество книг на полной странице.
+        root (str): Относительный путь от страницы до "/catalogue/".
+        categories (str): Разметка списка категорий в боковой панели.
+
+    Returns:
+        bytes: Страница в кодировке UTF-8.
+    """
+    return CATALOG_PAGE_TEMPLATE.format(
+        books_count=books_count,
+        first=(page - 1) * books_per_page + 1,
+        last=(page - 1) * books_per_page + len(books),
+        listings="".join(
+            LISTING_TEMPLATE.format(root=root, **book) for book in books
+        ),
+        page=page,
+        pages_count=pages_count,
+        root=root,
+        categories=categories.format(root=root),
+        previous=(
+            f'\n<li class="previous"><a href="page-{page - 1}.html">'
+            "previous</a></li>"
+            if page > 1
+            else ""
+        ),
+        next=(
+            f'\n<li class="next"><a href="page-{page + 1}.html">next</a></li>'
+            if page < pages_count
+            else ""
+        ),
+    ).encode()
+
+
+def _render_cover(variant: int) -> bytes:
+    """Формирует содержимое обложки книги.
+
+    Args:
+        variant (int): Номер варианта обложки.
+
+    Returns:
+        bytes: Псевдослучайные байты между маркерами начала и конца JPEG.
+    """
+    return (
+        b"\xff\xd8\xff\xe0"
+        + random.Random(variant).randbytes(COVER_SIZE)
+        + b"\xff\xd9"
+    )
+
+
+def generate_site(
+    pages_count: int,
+    books_per_page: int = BOOKS_PER_PAGE,
+    seed: int = 0,
+    categories_count: int = 0,
+    with_covers: bool = False,
+) -> dict[str, bytes]:
+    """Генерирует страницы сайта с разметкой books.toscrape.com.
+
+    Args:
+        pages_count (int): Количество страниц каталога.
+        books_per_page (int, optional): Количество книг на странице.
+            Значение по умолчанию - BOOKS_PER_PAGE.
+        seed (int, optional): Зерно генератора случайных данных.
+            Значение по умолчанию - 0.
+        categories_count (int, optional): Количество категорий, между
+            которыми распределяются книги. Значение по умолчанию - 0
+            (в боковой панели только общая категория "Books").
+        with_covers (bool, optional): Добавлять ли обложки книг по путям
+            "/media/cache/<хэш>.jpg". Обложки разных книг имеют один
+            из COVER_VARIANTS вариантов содержимого. Значение
+            по умолчанию - False.
+
+    Returns:
+        dict[str, bytes]: Страницы в кодировке UTF-8 по путям вида
+            "/catalogue/page-1.html", "/catalogue/<книга>/index.html"
+            и "/catalogue/category/books/<категория>/index.html".
+    """
+    randomizer = random.Random(seed)
+    books_count = pages_count * books_per_page
+    categories_names = [
+        f"{WORDS[index % len(WORDS)]}_{index + 2}"
+        for index in range(categories_count)
+    ]
+    categories = (
+        "\n          <ul>"
+        + "".join(
+            f'\n            <li><a href="{{root}}category/books/{name}/'
+            f'index.html">{name.split("_")[0].capitalize()}</a></li>'
+            for name in categories_names
+        )
+        + "\n          </ul>"
+        if categories_names
+        else ""
+    )
+    categories_books = {name: [] for name in categories_names}
+    site = {}
+
+    for page in range(1, pages_count + 1):
+        books = []
+        for position in range(books_per_page):
+            book_id = books_count - (page - 1) * books_per_page - position
+            title = " ".join(
+                randomizer.choice(WORDS).capitalize()
+                for _ in range(randomizer.randint(2, 6))
+            )
+            slug = f"{title.lower().replace(' ', '-')}_{book_id}"
+            image = hashlib.md5(slug.encode()).hexdigest()
+            book = {
+                "slug": slug,
+                "title": title,
+                "short_title": title[:20] + "..."
+                if len(title) > 20
+                else title,
+                "image": f"{image[:2]}/{image[2:4]}/{image}.jpg",
+                "rating": randomizer.choice(RATINGS),
+                "price": f"{randomizer.uniform(10, 60):.2f}",
+                "available": randomizer.randint(1, 22),
+                "upc": hashlib.sha1(slug.encode()).hexdigest()[:16],
+                "description": " ".join(
+                    randomizer.choice(WORDS) for _ in range(120)
+                ).capitalize()
+                + " ...more",
+            }
+            books.append(book)
+            if categories_names:
+                categories_books[
+                    categories_names[book_id % categories_count]
+                ].append(book)
+            site[f"/catalogue/{slug}/index.html"] = BOOK_PAGE_TEMPLATE.format(
+                **book
+            ).encode()
+            if with_covers:
+                site[f"/media/cache/{book['image']}"] = _render_cover(
+                    book_id % COVER_VARIANTS
+                )
+
+        site[f"/catalogue/page-{page}.html"] = _render_catalog_page(
+            books,
+            page,
+            pages_count,
+            books_count,
+            books_per_page,
+            root="",
+            categories=categories,
+        )
+
+    for name, category_books in categories_books.items():
+        category_pages_count = max(
+            1, -(-len(category_books) // books_per_page)
+        )
+        for page in range(1, category_pages_count + 1):
+            page_name = "index.html" if page == 1 else f"page-{page}.html"
+            site[f"/catalogue/category/books/{name}/{page_name}"] = (
+                _render_catalog_page(
+                    category_books[
+                        (page - 1) * books_per_page : page * books_per_page
+                    ],
+                    page,
+                    category_pages_count,
+                    len(category_books),
+                    books_per_page,
+                    root="../../../",
+                    categories=categories,
+                )
+            )
+
+    return site
+
+
+def write_site(site: dict[str, bytes], dir_path: Path) -> None:
+    """Сохраняет страницы сгенерированного сайта на диск.
+
+    Args:
+        site (dict[str, bytes]): Страницы сайта по путям.
+        dir_path (Path): Директория для сохранения.
+    """
+    for path, page in site.items():
+        page_path = Path(dir_path) / path.lstrip("/")
+        page_path.parent.mkdir(parents=True, exist_ok=True)
+        page_path.write_bytes(page)
+
+
+class FakeSiteServer:
+    """Локальный HTTP-сервер, отдающий сгенерированный сайт из памяти.
+
+    Как и books.toscrape.com, отдает страницы с ``Content-Type: text/html``
+    без указания кодировки, поддерживает постоянные соединения HTTP/1.1,
+    условные запросы по ``ETag`` и сжатие gzip, если клиент указал его
+    в ``Accept-Encoding``. Может добавлять задержку к каждому ответу,
+    имитируя сетевую задержку до удаленного сервера.
+
+    Attributes:
+        site (dict[str, bytes]): Страницы сайта по путям.
+        latency (float): Задержка ответа в секундах.
+        requests_count (int): Количество обработанных запросов.
+        compressed_count (int): Количество ответов, сжатых gzip.
+        active_count (int): Количество запросов, ожидающих задержки
+            ответа.
+        max_active_count (int): Наибольшее количество запросов,
+            одновременно ожидавших задержки ответа.
+    """
+
+    def __init__(self, site: dict[str, bytes], latency: float = 0.0) -> None:
+        self.site: dict[str, bytes] = site
+        self.latency: float = latency
+        self.requests_count: int = 0
+        self.compressed_count: int = 0
+        self.active_count: int = 0
+        self.max_active_count: int = 0
+        self._compressed: dict[str, tuple[bytes, bytes]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Базовый URL каталога, аналогичный BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/catalogue/"
+
+    def _compress(self, path: str, page: bytes) -> bytes:
+        """Сжимает страницу gzip, запоминая результат для повторных ответов.
+
+        Сжатая страница пересоздается, если содержимое страницы в ``site``
+        было заменено.
+
+        Args:
+            path (str): Путь страницы.
+            page (bytes): Содержимое страницы.
+
+        Returns:
+            bytes: Сжатое содержимое страницы.
+        """
+        with self._lock:
+            self.compressed_count += 1
+            cached = self._compressed.get(path)
+            if cached is None or cached[0] is not page:
+                cached = self._compressed[path] = (
+                    page,
+                    gzip.compress(page, mtime=0),
+                )
+            return cached[1]
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        """Создает класс обработчика запросов, связанный с сервером."""
+        fake_site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                with fake_site._lock:
+                    fake_site.requests_count += 1
+                    fake_site.active_count += 1
+                    fake_site.max_active_count = max(
+                        fake_site.max_active_count, fake_site.active_count
+                    )
+                try:
+                    if fake_site.latency:
+                        time.sleep(fake_site.latency)
+                finally:
+                    with fake_site._lock:
+                        fake_site.active_count -= 1
+
+                page = fake_site.site.get(self.path.split("?")[0])
+                if page is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                etag = f'"{hashlib.md5(page).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    page = fake_site._compress(self.path.split("?")[0], page)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(page)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(page)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> Self:
+        """Запускает сервер на свободном порту в фоновом потоке."""
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self._create_handler()
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
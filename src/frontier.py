@@ -0,0 +1,237 @@
+import hashlib
+import math
+import shutil
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Self
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+DEFAULT_PORTS: dict[str, int] = {"http": 80, "https": 443}
+FRONTIER_FILENAME: str = "frontier.sqlite3"
+
+
+def canonicalize_url(url: str, base_url: str | None = None) -> str:
+    """
+    Приводит URL к каноническому виду.
+
+    Относительный URL разрешается относительно ``base_url`` по правилам
+    RFC 3986, сегменты "." и ".." удаляются, схема и хост приводятся
+    к нижнему регистру, порт по умолчанию и фрагмент отбрасываются.
+
+    Args:
+        url: Абсолютный или относительный URL
+        base_url: URL страницы или директории, относительно которой
+            разрешается ``url``
+
+    Returns:
+        Абсолютный канонический URL
+    """
+    parts = urlsplit(urljoin(base_url, url) if base_url else url)
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if ":" in netloc:
+        netloc = f"[{netloc}]"
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc += f":{parts.port}"
+    path = urlsplit(urljoin(f"{scheme}://{netloc}/", parts.path or "/")).path
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+class BloomFilter:
+    """
+    Фильтр Блума для проверки принадлежности URL множеству.
+
+    Размер битового массива и количество хэш-функций подбираются под
+    ожидаемое количество элементов и долю ложноположительных ответов.
+    Позиции битов вычисляются двойным хэшированием 128-битного дайджеста.
+
+    Attributes:
+        size (int): Размер битового массива в битах
+        hashes_count (int): Количество хэш-функций
+    """
+
+    def __init__(
+        self, expected_items: int, false_positive_rate: float
+    ) -> None:
+        expected_items = max(1, expected_items)
+        self.size: int = max(
+            8,
+            math.ceil(
+                -expected_items
+                * math.log(false_positive_rate)
+                / math.log(2) ** 2
+            ),
+        )
+        self.hashes_count: int = max(
+            1, round(self.size / expected_items * math.log(2))
+        )
+        self._bits: bytearray = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> list[int]:
+        """
+        Вычисляет позиции битов элемента.
+
+        Args:
+            digest: 128-битный дайджест элемента
+
+        Returns:
+            Позиции битов в массиве
+        """
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [
+            (first + index * second) % self.size
+            for index in range(self.hashes_count)
+        ]
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Добавляет элемент в фильтр.
+
+        Args:
+            digest: 128-битный дайджест элемента
+
+        Returns:
+            True, если элемент мог быть добавлен ранее (все его биты уже
+            были установлены)
+        """
+        is_present = True
+        for position in self._positions(digest):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] >> bit & 1:
+                is_present = False
+                self._bits[byte] |= 1 << bit
+        return is_present
+
+
+class CrawlFrontier:
+    """
+    Множество URL, уже поставленных в обход в текущем запуске.
+
+    Проверка выполняется в два этапа. Фильтр Блума в памяти отвечает
+    на большинство проверок новых URL без обращения к диску. Если фильтр
+    сообщает, что URL мог встречаться, ответ уточняется по точному
+    множеству 128-битных дайджестов URL. Новые дайджесты накапливаются
+    в буфере из ``buffer_size`` элементов и пакетами сбрасываются в базу
+    SQLite на диске, поэтому расход памяти ограничен размером фильтра
+    и буфера, а не количеством URL. Если URL окажется больше
+    ``expected_urls``, доля обращений к диску растет, но ответы остаются
+    точными.
+
+    Attributes:
+        dir_path (Path | None): Директория для базы точного множества
+            или None для временной директории, удаляемой при закрытии
+        expected_urls (int): Ожидаемое количество URL
+        false_positive_rate (float): Доля ложноположительных ответов
+            фильтра Блума при ``expected_urls`` URL
+        buffer_size (int): Количество дайджестов в буфере записи
+        added (int): Количество добавленных уникальных URL
+        duplicates (int): Количество отклоненных повторных URL
+        disk_lookups (int): Количество проверок по базе на диске
+    """
+
+    def __init__(
+        self,
+        dir_path: Path | None,
+        expected_urls: int,
+        false_positive_rate: float,
+        buffer_size: int,
+    ) -> None:
+        self.dir_path: Path | None = Path(dir_path) if dir_path else None
+        self.expected_urls: int = expected_urls
+        self.false_positive_rate: float = false_positive_rate
+        self.buffer_size: int = buffer_size
+        self.added: int = 0
+        self.duplicates: int = 0
+        self.disk_lookups: int = 0
+        self._bloom: BloomFilter | None = None
+        self._buffer: set[bytes] = set()
+        self._connection: sqlite3.Connection | None = None
+        self._temp_dir: Path | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        if self.dir_path is None:
+            self._temp_dir = Path(tempfile.mkdtemp(prefix="frontier-"))
+        dir_path = self.dir_path or self._temp_dir
+        dir_path.mkdir(parents=True, exist_ok=True)
+        path = dir_path / FRONTIER_FILENAME
+        path.unlink(missing_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(
+            "CREATE TABLE seen (digest BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+        self._bloom = BloomFilter(self.expected_urls, self.false_positive_rate)
+        self._buffer = set()
+        self.added = self.duplicates = self.disk_lookups = 0
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._connection.close()
+        self._connection = None
+        self._bloom = None
+        self._buffer = set()
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def add(self, url: str) -> bool:
+        """
+        Добавляет URL, если он еще не встречался.
+
+        Args:
+            url: Канонический URL, см. ``canonicalize_url``
+
+        Returns:
+            True, если URL новый, и False для повторного URL
+        """
+        digest = hashlib.blake2b(url.encode(), digest_size=16).digest()
+        with self._lock:
+            if self._bloom.add(digest) and self._is_seen(digest):
+                self.duplicates += 1
+                return False
+
+            self._buffer.add(digest)
+            self.added += 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+        return True
+
+    def _is_seen(self, digest: bytes) -> bool:
+        """
+        Проверяет дайджест по точному множеству.
+
+        Вызывается под блокировкой.
+
+        Args:
+            digest: Дайджест URL
+
+        Returns:
+            True, если URL уже добавлялся
+        """
+        if digest in self._buffer:
+            return True
+        self.disk_lookups += 1
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM seen WHERE digest = ?", (digest,)
+            ).fetchone()
+            is not None
+        )
+
+    def _flush(self) -> None:
+        """Сбрасывает буфер дайджестов в базу. Вызывается под блокировкой."""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO seen VALUES (?)",
+                ((digest,) for digest in self._buffer),
+            )
+        self._buffer = set()
+
+    def __len__(self) -> int:
+        return self.added
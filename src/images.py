@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Self
+from urllib.parse import urlsplit
+
+from requests import Session
+from requests.exceptions import RequestException
+
+from constants import IMAGES_INDEX_FILENAME
+from logger import logger
+
+IMAGE_DEFAULT_SUFFIX: str = ".bin"
+
+
+class ImageStore:
+    """Хранилище изображений, адресуемых по содержимому.
+
+    Каждый файл сохраняется под именем SHA-256 своего содержимого в виде
+    ``<первые два символа хэша>/<хэш><расширение>``, поэтому одинаковые
+    изображения, загруженные по разным URL, хранятся в одном файле.
+    Индекс сопоставляет URL изображения с путем файла и сохраняется
+    между запусками, что позволяет не загружать сохраненные изображения
+    повторно.
+
+    Attributes:
+        dir_path (Path): Директория хранилища.
+        index_path (Path): Путь к JSON-файлу индекса.
+    """
+
+    def __init__(self, dir_path: Path) -> None:
+        self.dir_path: Path = Path(dir_path)
+        self.index_path: Path = self.dir_path / IMAGES_INDEX_FILENAME
+        self._index: dict[str, str] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def load(self) -> None:
+        """Загружает индекс предыдущих запусков, если файл существует."""
+        self.dir_path.mkdir(parents=True, exist_ok=True)
+        self._index = {}
+        if self.index_path.exists():
+            with open(self.index_path, encoding="utf-8") as read:
+                self._index = json.load(read)
+
+    def save(self) -> None:
+        """Атомарно сохраняет индекс на диск."""
+        temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with self._lock:
+            with open(temp_path, mode="w", encoding="utf-8") as write:
+                json.dump(self._index, write, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+
+    def get(self, url: str) -> str | None:
+        """Возвращает путь сохраненного изображения.
+
+        Args:
+            url (str): URL изображения.
+
+        Returns:
+            str | None: Путь файла относительно директории хранилища или
+                None, если изображение не загружалось или файл удален.
+        """
+        with self._lock:
+            path = self._index.get(url)
+        if path is None or not (self.dir_path / path).exists():
+            return None
+        return path
+
+    def create_temp_file(self) -> tuple[int, Path]:
+        """Создает временный файл для загрузки в директории хранилища.
+
+        Returns:
+            tuple[int, Path]: Дескриптор и путь временного файла.
+        """
+        descriptor, path = tempfile.mkstemp(dir=self.dir_path, suffix=".part")
+        return descriptor, Path(path)
+
+    def put(
+        self, url: str, temp_path: Path, digest: str, suffix: str
+    ) -> tuple[str, bool]:
+        """Переносит загруженный файл в хранилище и добавляет его в индекс.
+
+        Если файл с таким содержимым уже сохранен, временный файл
+        удаляется.
+
+        Args:
+            url (str): URL изображения.
+            temp_path (Path): Путь загруженного временного файла.
+            digest (str): SHA-256 содержимого файла.
+            suffix (str): Расширение файла.
+
+        Returns:
+            tuple[str, bool]: Путь файла относительно директории хранилища
+                и признак того, что файл с таким содержимым был новым.
+        """
+        path = f"{digest[:2]}/{digest}{suffix}"
+        target_path = self.dir_path / path
+        with self._lock:
+            is_new = not target_path.exists()
+            if is_new:
+                target_path.parent.mkdir(exist_ok=True)
+                os.replace(temp_path, target_path)
+            else:
+                temp_path.unlink()
+            self._index[url] = path
+        return path, is_new
+
+
+class ImageDownloader:
+    """Пул потоков для потоковой загрузки изображений в хранилище.
+
+    Изображение читается из ответа частями по ``chunk_size`` байт,
+    которые одновременно хэшируются и записываются во временный файл,
+    поэтому изображение целиком в памяти не держится. Одновременно
+    выполняется не больше ``workers`` загрузок. Изображения, уже
+    сохраненные в хранилище, не запрашиваются.
+
+    Attributes:
+        store (ImageStore): Хранилище изображений.
+        workers (int): Количество потоков загрузки.
+        chunk_size (int): Размер части ответа в байтах.
+        timeout (float | None): Таймаут запроса в секундах.
+        downloaded (int): Количество загруженных изображений.
+        duplicates (int): Количество загруженных изображений, содержимое
+            которых уже было в хранилище.
+        skipped (int): Количество изображений, взятых из хранилища
+            без запроса.
+        failed (int): Количество неудачных загрузок.
+    """
+
+    def __init__(
+        self,
+        store: ImageStore,
+        workers: int,
+        chunk_size: int,
+        timeout: float | None = None,
+    ) -> None:
+        self.store: ImageStore = store
+        self.workers: int = workers
+        self.chunk_size: int = chunk_size
+        self.timeout: float | None = timeout
+        self.downloaded: int = 0
+        self.duplicates: int = 0
+        self.skipped: int = 0
+        self.failed: int = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        self.store.load()
+        self.downloaded = self.duplicates = self.skipped = self.failed = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="image"
+        )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self.store.save()
+
+    def submit(self, session: Session, url: str) -> Future:
+        """Ставит изображение в очередь загрузки.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            url (str): Абсолютный URL изображения.
+
+        Returns:
+            Future: Результат с путем файла относительно директории
+                хранилища или None, если загрузка не удалась.
+        """
+        path = self.store.get(url)
+        if path is not None:
+            future = Future()
+            future.set_result(path)
+            with self._lock:
+                self.skipped += 1
+            return future
+        return self._executor.submit(self._download, session, url)
+
+    def _download(self, session: Session, url: str) -> str | None:
+        """Загружает изображение частями и сохраняет его в хранилище.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            url (str): Абсолютный URL изображения.
+
+        Returns:
+            str | None: Путь файла относительно директории хранилища или
+                None, если загрузка не удалась.
+        """
+        descriptor, temp_path = self.store.create_temp_file()
+        hasher = hashlib.sha256()
+        try:
+            with (
+                open(descriptor, "wb") as write,
+                session.get(
+                    url, stream=True, timeout=self.timeout
+                ) as response,
+            ):
+                response.raise_for_status()
+                for chunk in response.iter_content(self.chunk_size):
+                    hasher.update(chunk)
+                    write.write(chunk)
+        except (RequestException, OSError) as error:
+            temp_path.unlink(missing_ok=True)
+            logger.warning(f"Не удалось загрузить изображение {url}: {error}")
+            with self._lock:
+                self.failed += 1
+            return None
+
+        suffix = PurePosixPath(urlsplit(url).path).suffix or (
+            IMAGE_DEFAULT_SUFFIX
+        )
+        path, is_new = self.store.put(
+            url, temp_path, hasher.hexdigest(), suffix.lower()
+        )
+        with self._lock:
+            self.downloaded += 1
+            if not is_new:
+                self.duplicates += 1
+        return path
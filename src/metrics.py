@@ -0,0 +1,415 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, ParamSpec, TypeVar
+
+from profiling import ScrapeProfiler
+
+F_Spec = ParamSpec("F_Spec")
+F_Return = TypeVar("F_Return")
+
+STAGE_SECONDS: str = "scraper_stage_seconds"
+HTTP_RESPONSES: str = "scraper_http_responses_total"
+HTTP_BYTES: str = "scraper_http_downloaded_bytes_total"
+HTTP_CONNECTIONS: str = "scraper_http_connections_total"
+BOOKS_SCRAPED: str = "scraper_books_total"
+
+METRICS_PROMETHEUS_FILENAME: str = "metrics.prom"
+METRICS_JSON_FILENAME: str = "metrics.json"
+
+HISTOGRAM_BOUNDS: tuple[float, ...] = tuple(
+    0.00001 * 2**power for power in range(24)
+)
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+LabelsKey = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    Гистограмма значений с экспоненциальными границами корзин.
+
+    Хранит только количество значений в каждой корзине, сумму и число
+    наблюдений, поэтому память и время записи не зависят от количества
+    значений. Квантили оцениваются линейной интерполяцией внутри корзины
+    и ограничиваются минимальным и максимальным значением.
+
+    Attributes:
+        counts (list[int]): Количество значений в каждой корзине,
+            последняя корзина - значения больше последней границы
+        total (float): Сумма значений
+        count (int): Количество значений
+        min (float): Минимальное значение
+        max (float): Максимальное значение
+    """
+
+    def __init__(self) -> None:
+        self.counts: list[int] = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.total: float = 0.0
+        self.count: int = 0
+        self.min: float = float("inf")
+        self.max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Добавляет значение в гистограмму.
+
+        Args:
+            value: Наблюдаемое значение
+        """
+        self.counts[bisect_left(HISTOGRAM_BOUNDS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Добавляет значения другой гистограммы.
+
+        Args:
+            other: Гистограмма с теми же границами корзин
+        """
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценивает квантиль значений.
+
+        Args:
+            q: Уровень квантиля от 0 до 1
+
+        Returns:
+            Оценка квантиля или 0.0 для пустой гистограммы
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = HISTOGRAM_BOUNDS[index - 1] if index else 0.0
+                upper = (
+                    HISTOGRAM_BOUNDS[index]
+                    if index < len(HISTOGRAM_BOUNDS)
+                    else lower * 2
+                )
+                estimate = (
+                    lower + (upper - lower) * (rank - cumulative) / count
+                )
+                return min(max(estimate, self.min), self.max)
+            cumulative += count
+        return self.max
+
+
+class MetricsRegistry:
+    """
+    Реестр счетчиков и гистограмм длительностей внутри процесса.
+
+    Метрики идентифицируются именем и набором меток. В выключенном
+    состоянии методы записи сразу возвращаются, а декоратор ``timed``
+    не замеряет время, поэтому накладные расходы сводятся к одной
+    проверке флага.
+
+    Attributes:
+        enabled (bool): Включен ли сбор метрик
+        profiler (ScrapeProfiler | None): Профилировщик, которому
+            ``timed`` сообщает о вызовах стадий, или None
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled: bool = enabled
+        self.profiler: ScrapeProfiler | None = None
+        self._counters: dict[tuple[str, LabelsKey], float] = {}
+        self._histograms: dict[tuple[str, LabelsKey], Histogram] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            name: Имя счетчика
+            value: Приращение
+            **labels: Метки счетчика
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Добавляет значение в гистограмму.
+
+        Args:
+            name: Имя гистограммы
+            value: Наблюдаемое значение
+            **labels: Метки гистограммы
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def pop_state(self) -> dict[str, Any]:
+        """
+        Возвращает накопленные метрики и очищает реестр.
+
+        Returns:
+            Счетчики и гистограммы для передачи в ``merge``
+        """
+        with self._lock:
+            state = {
+                "counters": self._counters,
+                "histograms": self._histograms,
+            }
+            self._counters, self._histograms = {}, {}
+        return state
+
+    def merge(self, state: dict[str, Any]) -> None:
+        """
+        Добавляет метрики, накопленные другим реестром.
+
+        Args:
+            state: Результат ``pop_state`` другого реестра, например
+                реестра процесса разбора страниц
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for key, value in state["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, other in state["histograms"].items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram()
+                histogram.merge(other)
+
+    def reset(self) -> None:
+        """Очищает все метрики."""
+        self.pop_state()
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        """
+        Возвращает значение счетчика.
+
+        Args:
+            name: Имя счетчика
+            **labels: Метки счетчика
+
+        Returns:
+            Значение счетчика или 0, если он не увеличивался
+        """
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def get_histogram(self, name: str, **labels: str) -> Histogram | None:
+        """
+        Возвращает гистограмму.
+
+        Args:
+            name: Имя гистограммы
+            **labels: Метки гистограммы
+
+        Returns:
+            Гистограмма или None, если значений не было
+        """
+        with self._lock:
+            return self._histograms.get((name, tuple(sorted(labels.items()))))
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Возвращает текущие значения метрик в виде словаря.
+
+        Returns:
+            Списки счетчиков и гистограмм с метками, количеством, суммой
+            и квантилями p50/p95/p99
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    **{
+                        f"p{round(q * 100)}": histogram.quantile(q)
+                        for q in QUANTILES
+                    },
+                }
+                for (name, labels), histogram in sorted(
+                    self._histograms.items()
+                )
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """
+        Форматирует метрики в текстовом формате Prometheus.
+
+        Returns:
+            Текст для textfile-коллектора node_exporter
+        """
+
+        def format_labels(labels: dict[str, str], **extra: str) -> str:
+            labels = {**labels, **extra}
+            if not labels:
+                return ""
+            return "{%s}" % ",".join(
+                f'{name}="{value}"' for name, value in labels.items()
+            )
+
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{format_labels(dict(labels))} {value:g}")
+
+        for (name, labels), histogram in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip(HISTOGRAM_BOUNDS, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket"
+                    f"{format_labels(dict(labels), le=f'{bound:g}')} "
+                    f"{cumulative}"
+                )
+            lines.append(
+                f"{name}_bucket{format_labels(dict(labels), le='+Inf')} "
+                f"{histogram.count}"
+            )
+            lines.append(
+                f"{name}_sum{format_labels(dict(labels))} {histogram.total:g}"
+            )
+            lines.append(
+                f"{name}_count{format_labels(dict(labels))} {histogram.count}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def export(self, dir_path: Path) -> tuple[Path, Path]:
+        """
+        Сохраняет метрики в форматах Prometheus и JSON.
+
+        Файлы записываются атомарно, чтобы коллектор не прочитал их
+        частично записанными.
+
+        Args:
+            dir_path: Директория для файлов метрик
+
+        Returns:
+            Пути к файлу Prometheus и файлу JSON
+        """
+        dir_path = Path(dir_path)
+        dir_path.mkdir(parents=True, exist_ok=True)
+        prometheus_path = dir_path / METRICS_PROMETHEUS_FILENAME
+        json_path = dir_path / METRICS_JSON_FILENAME
+
+        for path, content in (
+            (prometheus_path, self.to_prometheus()),
+            (json_path, json.dumps(self.snapshot(), indent=2)),
+        ):
+            temp_path = path.with_name(path.name + ".tmp")
+            temp_path.write_text(content, encoding="utf-8")
+            temp_path.replace(path)
+        return prometheus_path, json_path
+
+
+def timed(
+    stage: str,
+) -> Callable[[Callable[F_Spec, F_Return]], Callable[F_Spec, F_Return]]:
+    """
+    Декоратор метода, записывающий время его выполнения в реестр.
+
+    Реестр берется из атрибута ``metrics`` экземпляра, время записывается
+    в гистограмму ``STAGE_SECONDS`` с меткой ``stage``. Если к реестру
+    подключен профилировщик, ему передается память, занятая вызовом.
+    Если метод возвращает Future, стадия завершается вместе с ним,
+    а не в момент возврата.
+
+    Args:
+        stage: Название стадии, например "fetch" или "parse"
+
+    Returns:
+        Декоратор метода
+    """
+
+    def decorator(
+        func: Callable[F_Spec, F_Return],
+    ) -> Callable[F_Spec, F_Return]:
+        @wraps(func)
+        def wrapper(
+            self, *args: F_Spec.args, **kwargs: F_Spec.kwargs
+        ) -> F_Return:
+            registry = self.metrics
+            if not registry.enabled:
+                return func(self, *args, **kwargs)
+
+            profiler = registry.profiler
+            started_memory = profiler.stage_started() if profiler else 0
+            start_time = time.perf_counter()
+
+            def finish() -> None:
+                registry.observe(
+                    STAGE_SECONDS,
+                    time.perf_counter() - start_time,
+                    stage=stage,
+                )
+                if profiler is not None:
+                    profiler.stage_finished(stage, started_memory)
+
+            try:
+                result = func(self, *args, **kwargs)
+            except BaseException:
+                finish()
+                raise
+            if not isinstance(result, Future):
+                finish()
+                return result
+
+            finished: Future = Future()
+
+            def resolve(future: Future) -> None:
+                # Стадию нужно записать до того, как вызывающий код
+                # получит результат, иначе последняя книга может не
+                # попасть в выгрузку метрик.
+                finish()
+                if future.exception() is not None:
+                    finished.set_exception(future.exception())
+                else:
+                    finished.set_result(future.result())
+
+            result.add_done_callback(resolve)
+            return finished  # type: ignore[return-value]
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,183 @@
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Self
+
+from constants import EMPTY_DATA
+from utils import parse_amount, parse_int
+
+INFO_TABLE_FIELDS: dict[str, str] = {
+    "UPC": "upc",
+    "Product Type": "product_type",
+    "Price (excl. tax)": "price_excl_tax",
+    "Price (incl. tax)": "price_incl_tax",
+    "Tax": "tax",
+    "Number of reviews": "number_of_reviews",
+}
+AMOUNT_FIELDS: frozenset[str] = frozenset(
+    ("price_excl_tax", "price_incl_tax", "tax")
+)
+
+
+@dataclass(slots=True)
+class Book:
+    """Компактная запись о книге с типизированными полями.
+
+    В отличие от словаря строк хранит цены и налог числами, наличие,
+    рейтинг и количество отзывов - целыми числами, а повторяющиеся
+    значения (символ валюты, тип продукта) - интернированными строками.
+    Отсутствующие на странице значения хранятся как None. Признак
+    наличия ``in_stock`` вычисляется по количеству доступных копий,
+    а для книг из карточек каталога, где количество не указано, берется
+    из ключа "In_stock" словаря.
+    """
+
+    title: str
+    price: float | None = None
+    available: int | None = None
+    in_stock: bool | None = None
+    rating: int | None = None
+    description: str | None = None
+    upc: str | None = None
+    product_type: str | None = None
+    price_excl_tax: float | None = None
+    price_incl_tax: float | None = None
+    tax: float | None = None
+    number_of_reviews: int | None = None
+    currency: str = ""
+    image: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Создает запись из словаря в формате ``Scraper._get_book_data``.
+
+        Args:
+            data (dict[str, Any]): Словарь с данными о книге.
+
+        Returns:
+            Book: Типизированная запись о книге.
+        """
+        price = parse_amount(data.get("Price"))
+        info_table = data.get("Info_table") or {}
+
+        info_values = {}
+        for key, field_name in INFO_TABLE_FIELDS.items():
+            value = info_table.get(key)
+            if field_name in AMOUNT_FIELDS:
+                amount = parse_amount(value)
+                value = amount[1] if amount else None
+            elif field_name == "number_of_reviews":
+                value = parse_int(value)
+            elif field_name == "product_type" and value:
+                value = sys.intern(value)
+            info_values[field_name] = value
+
+        description = data.get("Description")
+        available = parse_int(data.get("Available"))
+        return cls(
+            title=data.get("Title", EMPTY_DATA),
+            price=price[1] if price else None,
+            available=available,
+            in_stock=(
+                data.get("In_stock") if available is None else available > 0
+            ),
+            rating=parse_int(data.get("Rating")),
+            description=None if description == EMPTY_DATA else description,
+            currency=sys.intern(price[0]) if price else "",
+            image=data.get("Image"),
+            **info_values,
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> Self:
+        """Создает запись из JSON-строки в формате словаря книги.
+
+        Args:
+            text (str): JSON-строка с данными о книге.
+
+        Returns:
+            Book: Типизированная запись о книге.
+        """
+        return cls.from_dict(json.loads(text))
+
+    def _format_amount(self, amount: float | None) -> str:
+        """Форматирует сумму со символом валюты, как на странице книги.
+
+        Args:
+            amount (float | None): Сумма.
+
+        Returns:
+            str: Строка вида "£51.77" или EMPTY_DATA для пустой суммы.
+        """
+        return EMPTY_DATA if amount is None else f"{self.currency}{amount:.2f}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Преобразует запись в словарь в формате ``Scraper._get_book_data``.
+
+        Returns:
+            dict[str, Any]: Словарь строк, совместимый с прежним форматом.
+        """
+        info_table = {}
+        for key, field_name in INFO_TABLE_FIELDS.items():
+            value = getattr(self, field_name)
+            if value is None:
+                continue
+            if field_name in AMOUNT_FIELDS:
+                value = self._format_amount(value)
+            info_table[key] = str(value)
+
+        book = {
+            "Title": self.title,
+            "Price": self._format_amount(self.price),
+            "Available": (
+                EMPTY_DATA if self.available is None else str(self.available)
+            ),
+            "Rating": EMPTY_DATA if self.rating is None else str(self.rating),
+            "Description": self.description or EMPTY_DATA,
+            "Info_table": info_table,
+        }
+        if self.available is None and self.in_stock is not None:
+            book["In_stock"] = self.in_stock
+        if self.image is not None:
+            book["Image"] = self.image
+        return book
+
+    def to_json(self) -> str:
+        """Преобразует запись в JSON-строку в формате словаря книги.
+
+        Returns:
+            str: JSON-строка с данными о книге.
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+def book_to_dict(book: dict[str, Any] | Book) -> dict[str, Any]:
+    """Приводит книгу к словарю для сохранения в JSON.
+
+    Args:
+        book (dict[str, Any] | Book): Словарь или запись о книге.
+
+    Returns:
+        dict[str, Any]: Словарь с данными о книге.
+    """
+    return book.to_dict() if isinstance(book, Book) else book
+
+
+def merge_listing_book(
+    book: dict[str, Any], listing_book: dict[str, Any]
+) -> dict[str, Any]:
+    """Обновляет данные книги по её карточке в каталоге.
+
+    Название, цена, рейтинг и наличие берутся из карточки, остальные поля
+    (описание, таблица характеристик, обложка) - из данных книги.
+
+    Args:
+        book (dict[str, Any]): Данные книги, полученные с её страницы.
+        listing_book (dict[str, Any]): Данные карточки книги.
+
+    Returns:
+        dict[str, Any]: Словарь с данными о книге.
+    """
+    return {
+        key: value for key, value in book.items() if key != "In_stock"
+    } | listing_book
@@ -0,0 +1,204 @@
+import os
+import threading
+from collections import Counter
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Self
+
+from config import ScraperConfig
+from metrics import MetricsRegistry
+
+_worker_scraper = None
+
+
+def _init_parse_worker(config: ScraperConfig) -> None:
+    """Создает в процессе-обработчике парсер для разбора страниц.
+
+    Args:
+        config (ScraperConfig): Конфигурация парсера.
+    """
+    global _worker_scraper
+    from scraper import Scraper
+
+    _worker_scraper = Scraper(None, config)
+
+
+def _parse_book_pages(
+    pages: list[str | bytes],
+) -> tuple[list[tuple[bool, dict[str, Any] | Exception]], dict[str, Any], int]:
+    """Разбирает пакет страниц книг в процессе-обработчике.
+
+    Args:
+        pages (list[str | bytes]): HTML-тексты или тела страниц книг.
+
+    Returns:
+        tuple[list[tuple[bool, dict[str, Any] | Exception]], dict[str, Any],
+            int]: Для каждой страницы - признак успеха и данные о книге
+            или исключение, метрики разбора пакета и PID процесса.
+    """
+    results = []
+    for page in pages:
+        try:
+            results.append((True, _worker_scraper._parse_book_page(page)))
+        except Exception as error:
+            results.append((False, error))
+    return results, _worker_scraper.metrics.pop_state(), os.getpid()
+
+
+class ParsePool:
+    """Пул процессов для разбора страниц книг вне потоков загрузки.
+
+    Потоки загрузки передают полученный HTML в ``submit`` и, не дожидаясь
+    разбора, переходят к следующей странице, а результат забирается из
+    возвращенного Future, например при выдаче книг в порядке каталога.
+    Пул собирает страницы в пакеты и отправляет каждый пакет в отдельный
+    процесс. Пакет отправляется, когда в нем набирается ``batch_size``
+    страниц или по истечении ``max_delay`` секунд с момента поступления
+    первой страницы пакета. Одновременно разбирается до ``max_pending``
+    страниц, то есть по нескольку пакетов на процесс; при превышении
+    ``submit`` ждет освобождения места, ограничивая память под страницы.
+
+    Attributes:
+        config (ScraperConfig): Конфигурация парсера для процессов.
+        workers (int): Количество процессов разбора.
+        batch_size (int): Максимальный размер пакета.
+        max_delay (float): Максимальное время ожидания неполного пакета.
+        max_pending (int): Максимальное количество страниц, ожидающих
+            разбора.
+        metrics (MetricsRegistry | None): Реестр, в который переносятся
+            метрики разбора из процессов.
+        worker_batches (Counter[int]): Количество разобранных пакетов
+            по PID процессов.
+    """
+
+    def __init__(
+        self,
+        config: ScraperConfig,
+        workers: int,
+        batch_size: int,
+        max_delay: float,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        self.config: ScraperConfig = config
+        self.workers: int = workers
+        self.batch_size: int = max(1, batch_size)
+        self.max_delay: float = max_delay
+        self.max_pending: int = self.batch_size * workers * 4
+        self.metrics: MetricsRegistry | None = metrics
+        self.worker_batches: Counter[int] = Counter()
+        self._slots: threading.Semaphore = threading.Semaphore(
+            self.max_pending
+        )
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending: list[tuple[str | bytes, Future]] = []
+        self._timer: threading.Timer | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_parse_worker,
+            initargs=(self.config,),
+        )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with self._lock:
+            self._flush()
+        self._executor.shutdown(cancel_futures=True)
+        self._executor = None
+
+    def parse(self, page: str | bytes) -> dict[str, Any]:
+        """Разбирает страницу книги в одном из процессов пула и ждет его.
+
+        Args:
+            page (str | bytes): HTML-текст или тело страницы книги.
+
+        Raises:
+            ValueError: Если не найдена основная информация о книге.
+
+        Returns:
+            dict[str, Any]: Словарь с полной информацией о книге.
+        """
+        return self.submit(page).result()
+
+    def submit(self, page: str | bytes) -> Future:
+        """Ставит страницу книги в очередь разбора, не дожидаясь его.
+
+        Ждет, только если разбора ожидают ``max_pending`` страниц.
+
+        Args:
+            page (str | bytes): HTML-текст или тело страницы книги.
+
+        Returns:
+            Future: Результат со словарем с полной информацией о книге
+                или с ValueError, если не найдена основная информация
+                о книге.
+        """
+        self._slots.acquire()
+        future: Future = Future()
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._pending.append((page, future))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(
+                    self.max_delay, self._flush_by_timer
+                )
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+
+    def _flush_by_timer(self) -> None:
+        """Отправляет неполный пакет по истечении времени ожидания."""
+        with self._lock:
+            self._timer = None
+            self._flush()
+
+    def _flush(self) -> None:
+        """Отправляет накопленный пакет страниц в пул процессов.
+
+        Вызывается под блокировкой ``_lock``.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        batch_future = self._executor.submit(
+            _parse_book_pages, [page for page, _ in batch]
+        )
+        batch_future.add_done_callback(
+            lambda done: self._resolve(done, [future for _, future in batch])
+        )
+
+    def _resolve(self, batch_future: Future, futures: list[Future]) -> None:
+        """Передает результаты разбора пакета ожидающим потокам.
+
+        Args:
+            batch_future (Future): Результат разбора пакета.
+            futures (list[Future]): Ожидающие результатов страниц потоки.
+        """
+        error = (
+            CancelledError()
+            if batch_future.cancelled()
+            else batch_future.exception()
+        )
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        results, metrics_state, worker_pid = batch_future.result()
+        self.worker_batches[worker_pid] += 1
+        if self.metrics is not None:
+            self.metrics.merge(metrics_state)
+        for future, (is_parsed, result) in zip(futures, results):
+            if is_parsed:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
@@ -0,0 +1,200 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Self
+
+PROFILE_PSTATS_FILENAME: str = "profile.pstats"
+PROFILE_REPORT_FILENAME: str = "profile.txt"
+COLLAPSED_STACKS_FILENAME: str = "stacks.folded"
+MEMORY_SNAPSHOT_FILENAME: str = "memory.snapshot"
+MEMORY_REPORT_FILENAME: str = "memory.txt"
+PROFILE_DIR_NAME_FORMAT: str = "%Y-%m-%d_%H-%M-%S"
+
+THREAD_NUMBER_PATTERN = re.compile(r"[-_]\d+")
+
+
+class ScrapeProfiler:
+    """Профилировщик запуска парсера.
+
+    Собирает три вида данных:
+
+    - статистику cProfile по потоку, который запустил профилировщик;
+    - стеки вызовов всех потоков, в том числе потоков загрузки,
+      снимаемые с интервалом ``sample_interval``, в свернутом формате
+      для flamegraph.pl, speedscope и аналогичных инструментов;
+    - распределение памяти по стадиям парсера через tracemalloc: объем
+      памяти, оставшейся занятой после вызовов стадии, и итоговый снимок
+      с наиболее затратными строками.
+
+    Стадии сообщают о себе через ``stage_started``/``stage_finished``,
+    которые вызывает декоратор ``metrics.timed``. Разбор страниц
+    в пуле процессов (``parse_workers``) не профилируется.
+
+    cProfile включается только в вызывающем потоке: начиная с Python 3.12
+    одновременно может быть активен лишь один экземпляр cProfile, и
+    попытка включить его в другом потоке завершает этот поток ошибкой.
+
+    Attributes:
+        output_dir (Path): Директория для результатов профилирования.
+        sample_interval (float): Интервал снятия стеков в секундах.
+        tracemalloc_frames (int): Глубина стека для tracemalloc.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        sample_interval: float,
+        tracemalloc_frames: int = 10,
+    ) -> None:
+        self.output_dir: Path = Path(output_dir)
+        self.sample_interval: float = sample_interval
+        self.tracemalloc_frames: int = tracemalloc_frames
+        self._profile: cProfile.Profile = cProfile.Profile()
+        self._stacks: Counter[str] = Counter()
+        self._stages_memory: defaultdict[str, list[int]] = defaultdict(
+            lambda: [0, 0, 0]
+        )
+        self._stop_sampling: threading.Event = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def for_run(
+        cls, root_path: Path, sample_interval: float
+    ) -> "ScrapeProfiler":
+        """Создает профилировщик с директорией, названной по времени запуска.
+
+        Args:
+            root_path (Path): Директория для результатов всех запусков.
+            sample_interval (float): Интервал снятия стеков в секундах.
+
+        Returns:
+            ScrapeProfiler: Профилировщик запуска.
+        """
+        return cls(
+            Path(root_path) / datetime.now().strftime(PROFILE_DIR_NAME_FORMAT),
+            sample_interval,
+        )
+
+    def _sample_stacks(self) -> None:
+        """Периодически снимает стеки вызовов всех потоков."""
+        own_id = threading.get_ident()
+        while not self._stop_sampling.wait(self.sample_interval):
+            threads_names = {
+                thread.ident: THREAD_NUMBER_PATTERN.sub(
+                    "", thread.name
+                ).replace(" ", "_")
+                for thread in threading.enumerate()
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    module = os.path.splitext(
+                        os.path.basename(code.co_filename)
+                    )[0]
+                    stack.append(f"{module}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(threads_names.get(thread_id, "thread"))
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self) -> Self:
+        self._sampler = threading.Thread(
+            target=self._sample_stacks, name="profiler", daemon=True
+        )
+        self._sampler.start()
+        tracemalloc.start(self.tracemalloc_frames)
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._profile.disable()
+        self._stop_sampling.set()
+        self._sampler.join()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self._write_results(snapshot, peak_memory)
+
+    def stage_started(self) -> int:
+        """Отмечает начало вызова стадии.
+
+        Returns:
+            int: Объем памяти, занятой на момент начала вызова.
+        """
+        return tracemalloc.get_traced_memory()[0]
+
+    def stage_finished(self, stage: str, started_memory: int) -> None:
+        """Учитывает память, оставшуюся занятой после вызова стадии.
+
+        При параллельной работе потоков в разницу попадают и выделения
+        других потоков, поэтому значения следует сравнивать между
+        стадиями, а не рассматривать как точные.
+
+        Args:
+            stage (str): Название стадии.
+            started_memory (int): Результат ``stage_started``.
+        """
+        retained = tracemalloc.get_traced_memory()[0] - started_memory
+        with self._lock:
+            stage_memory = self._stages_memory[stage]
+            stage_memory[0] += 1
+            stage_memory[1] += retained
+            stage_memory[2] = max(stage_memory[2], retained)
+
+    def _write_results(
+        self, snapshot: tracemalloc.Snapshot, peak_memory: int
+    ) -> None:
+        """Сохраняет результаты профилирования в ``output_dir``.
+
+        Args:
+            snapshot (tracemalloc.Snapshot): Итоговый снимок памяти.
+            peak_memory (int): Пиковый объем отслеживаемой памяти.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        stats = pstats.Stats(self._profile)
+        stats.dump_stats(self.output_dir / PROFILE_PSTATS_FILENAME)
+        report = io.StringIO()
+        stats.stream = report
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(40)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(40)
+        (self.output_dir / PROFILE_REPORT_FILENAME).write_text(
+            report.getvalue(), encoding="utf-8"
+        )
+
+        (self.output_dir / COLLAPSED_STACKS_FILENAME).write_text(
+            "".join(
+                f"{stack} {count}\n"
+                for stack, count in self._stacks.most_common()
+            ),
+            encoding="utf-8",
+        )
+
+        snapshot.dump(str(self.output_dir / MEMORY_SNAPSHOT_FILENAME))
+        lines = [f"Пиковый объем памяти: {peak_memory / 1024:.1f} КиБ", ""]
+        lines.append("Стадия: вызовов, оставлено всего КиБ, максимум КиБ")
+        for stage, (calls, retained, max_retained) in sorted(
+            self._stages_memory.items()
+        ):
+            lines.append(
+                f"{stage}: {calls}, {retained / 1024:.1f}, "
+                f"{max_retained / 1024:.1f}"
+            )
+        lines.extend(["", "Наиболее затратные строки на конец запуска:"])
+        lines.extend(
+            str(statistic) for statistic in snapshot.statistics("lineno")[:20]
+        )
+        (self.output_dir / MEMORY_REPORT_FILENAME).write_text(
+            "\n".join(lines) + "\n", encoding="utf-8"
+        )
@@ -0,0 +1,313 @@
+import math
+import threading
+import time
+from typing import Any, Self
+
+from urllib3.util.retry import Retry
+
+THROTTLE_STATUSES: frozenset[int] = frozenset((429, 503))
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов по алгоритму "ведро токенов".
+
+    Токены пополняются со скоростью ``rate`` в секунду до ``burst``,
+    каждый запрос забирает один токен. Если токенов нет, ``acquire``
+    ждет пополнения.
+
+    Attributes:
+        rate (float): Количество запросов в секунду
+        burst (int): Максимальное количество запросов подряд без ожидания
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate: float = rate
+        self.burst: int = burst
+        self._tokens: float = burst
+        self._updated_at: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Забирает токен, при необходимости дожидаясь его пополнения."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated_at) * self.rate,
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AimdController:
+    """
+    Регулятор числа одновременных запросов к хосту по схеме AIMD.
+
+    Пока задержка ответов близка к минимальной наблюдаемой, лимит растет
+    на единицу за каждые ``limit`` успешных ответов (аддитивное
+    увеличение). При ответах 429/503 или росте задержки более чем
+    в ``latency_tolerance`` раз лимит умножается на ``decrease_factor``
+    (мультипликативное уменьшение), но не чаще одного раза за время
+    ответа. Заголовок ``Retry-After`` приостанавливает новые запросы
+    к хосту на указанное время.
+
+    Attributes:
+        limit (float): Текущий лимит одновременных запросов
+        min_limit (int): Минимальный лимит
+        max_limit (int): Максимальный лимит
+        decrease_factor (float): Множитель уменьшения лимита
+        latency_tolerance (float): Допустимый рост задержки относительно
+            минимальной
+        throttled (int): Количество ответов 429/503
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        decrease_factor: float,
+        latency_tolerance: float,
+    ) -> None:
+        self.limit: float = float(initial_limit)
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.decrease_factor: float = decrease_factor
+        self.latency_tolerance: float = latency_tolerance
+        self.throttled: int = 0
+        self._in_flight: int = 0
+        self._min_latency: float | None = None
+        self._latency: float | None = None
+        self._decreased_at: float = 0.0
+        self._blocked_until: float = 0.0
+        self._condition: threading.Condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Занимает слот запроса, дожидаясь свободного места и паузы."""
+        with self._condition:
+            while True:
+                wait = self._blocked_until - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                elif self._in_flight >= math.floor(self.limit):
+                    self._condition.wait()
+                else:
+                    self._in_flight += 1
+                    return
+
+    def release(self, latency: float, status: int | None = None) -> None:
+        """
+        Освобождает слот и корректирует лимит по результату запроса.
+
+        Args:
+            latency: Время выполнения запроса в секундах
+            status: Статус ответа или None при ошибке соединения
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if status in THROTTLE_STATUSES:
+                self._decrease()
+            elif status is not None:
+                self._observe_latency(latency)
+            self._condition.notify_all()
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """
+        Учитывает ответ 429/503, полученный при повторной попытке.
+
+        Args:
+            retry_after: Пауза из заголовка ``Retry-After`` в секундах
+        """
+        with self._condition:
+            self.throttled += 1
+            self._decrease()
+            if retry_after:
+                self._blocked_until = max(
+                    self._blocked_until, time.monotonic() + retry_after
+                )
+            self._condition.notify_all()
+
+    def _observe_latency(self, latency: float) -> None:
+        """Учитывает задержку успешного ответа. Вызывается под блокировкой."""
+        self._latency = (
+            latency
+            if self._latency is None
+            else 0.8 * self._latency + 0.2 * latency
+        )
+        if self._min_latency is None or self._latency < self._min_latency:
+            self._min_latency = self._latency
+
+        if latency > self._min_latency * self.latency_tolerance:
+            self._decrease()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _decrease(self) -> None:
+        """Уменьшает лимит не чаще одного раза за время ответа."""
+        now = time.monotonic()
+        if now - self._decreased_at < (self._latency or 0.0):
+            return
+        self._decreased_at = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+
+class HostRateLimiter:
+    """
+    Ограничитель запросов к каждому хосту: частота и параллельность.
+
+    Для каждого хоста создаются собственные ``TokenBucket`` (если задана
+    частота) и ``AimdController``. Задержка ответа, передаваемая
+    регулятору, измеряется от начала последней попытки запроса
+    в текущем потоке, поэтому повторы urllib3 и паузы между ними
+    (в том числе по ``Retry-After``) в нее не входят.
+
+    Attributes:
+        rate (float | None): Запросов в секунду к одному хосту или None,
+            если частота не ограничивается
+        burst (int): Размер "ведра токенов"
+        controller_params (dict[str, Any]): Параметры ``AimdController``
+    """
+
+    def __init__(
+        self, rate: float | None, burst: int, **controller_params: Any
+    ) -> None:
+        self.rate: float | None = rate
+        self.burst: int = burst
+        self.controller_params: dict[str, Any] = controller_params
+        self._buckets: dict[str, TokenBucket] = {}
+        self._controllers: dict[str, AimdController] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._attempts: threading.local = threading.local()
+
+    def _get_controller(self, host: str) -> AimdController:
+        """
+        Возвращает регулятор хоста, создавая его при первом обращении.
+
+        Args:
+            host: Имя хоста
+
+        Returns:
+            Регулятор числа одновременных запросов к хосту
+        """
+        with self._lock:
+            if host not in self._controllers:
+                self._controllers[host] = AimdController(
+                    **self.controller_params
+                )
+                if self.rate:
+                    self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._controllers[host]
+
+    def acquire(self, host: str) -> None:
+        """
+        Дожидается разрешения на запрос к хосту.
+
+        Args:
+            host: Имя хоста
+        """
+        self._get_controller(host).acquire()
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            bucket.acquire()
+
+    def start_attempt(self) -> None:
+        """Запоминает время начала попытки запроса в текущем потоке."""
+        self._attempts.started_at = time.perf_counter()
+
+    def get_attempt_latency(self) -> float:
+        """
+        Возвращает время, прошедшее с начала последней попытки запроса.
+
+        Returns:
+            Время в секундах с последнего ``start_attempt`` в текущем потоке
+        """
+        return time.perf_counter() - self._attempts.started_at
+
+    def release(
+        self, host: str, latency: float, status: int | None = None
+    ) -> None:
+        """
+        Сообщает о завершении запроса к хосту.
+
+        Args:
+            host: Имя хоста
+            latency: Время выполнения запроса в секундах
+            status: Статус ответа или None при ошибке соединения
+        """
+        self._get_controller(host).release(latency, status)
+
+    def throttle(self, host: str, retry_after: float | None = None) -> None:
+        """
+        Сообщает об ответе 429/503 от хоста.
+
+        Args:
+            host: Имя хоста
+            retry_after: Пауза из заголовка ``Retry-After`` в секундах
+        """
+        self._get_controller(host).throttle(retry_after)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Возвращает текущий лимит и число ответов 429/503 по хостам.
+
+        Returns:
+            Словарь вида {хост: {"limit": ..., "throttled": ...}}
+        """
+        with self._lock:
+            return {
+                host: {
+                    "limit": controller.limit,
+                    "throttled": controller.throttled,
+                }
+                for host, controller in self._controllers.items()
+            }
+
+
+class ThrottleAwareRetry(Retry):
+    """
+    Стратегия повторных попыток, сообщающая ограничителю о 429/503.
+
+    urllib3 повторяет запросы внутри ``HTTPAdapter.send``, поэтому
+    ограничитель не видит промежуточных ответов. Эта стратегия передает
+    ему каждый ответ 429/503 вместе с паузой из ``Retry-After``, чтобы
+    остальные потоки приостановили запросы к хосту, а после паузы перед
+    повтором отмечает начало новой попытки, чтобы задержка ответа
+    измерялась без предыдущих попыток и пауз.
+
+    Attributes:
+        limiter (HostRateLimiter | None): Ограничитель запросов
+    """
+
+    def __init__(
+        self, *args, limiter: HostRateLimiter | None = None, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.limiter: HostRateLimiter | None = limiter
+
+    def new(self, **kw: Any) -> Self:
+        retry = super().new(**kw)
+        retry.limiter = self.limiter
+        return retry
+
+    def increment(self, *args, **kwargs) -> Self:
+        response = kwargs.get("response")
+        pool = kwargs.get("_pool")
+        if (
+            self.limiter is not None
+            and response is not None
+            and pool is not None
+            and response.status in THROTTLE_STATUSES
+        ):
+            self.limiter.throttle(pool.host, self.get_retry_after(response))
+        return super().increment(*args, **kwargs)
+
+    def sleep(self, response: Any = None) -> None:
+        super().sleep(response)
+        if self.limiter is not None:
+            self.limiter.start_attempt()
@@ -0,0 +1,304 @@
+import heapq
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from itertools import count
+from typing import Any
+
+from logger import logger
+
+
+class ConcurrencyBudget:
+    """Общий для нескольких задач лимит одновременных запросов.
+
+    Задача перед запуском занимает столько единиц бюджета, сколько
+    запросов она выполняет одновременно, и освобождает их по окончании.
+    Если свободных единиц не хватает, задача ждет завершения других задач.
+
+    Attributes:
+        total (int): Размер бюджета.
+        used (int): Занятые единицы бюджета.
+    """
+
+    def __init__(self, total: int) -> None:
+        self.total: int = total
+        self.used: int = 0
+        self._condition: threading.Condition = threading.Condition()
+
+    def acquire(self, slots: int) -> int:
+        """Занимает единицы бюджета, дожидаясь их освобождения.
+
+        Args:
+            slots (int): Требуемое количество единиц. Значение больше
+                размера бюджета уменьшается до размера бюджета.
+
+        Returns:
+            int: Количество занятых единиц.
+        """
+        slots = max(1, min(slots, self.total))
+        with self._condition:
+            self._condition.wait_for(lambda: self.used + slots <= self.total)
+            self.used += slots
+        return slots
+
+    def release(self, slots: int) -> None:
+        """Освобождает единицы бюджета.
+
+        Args:
+            slots (int): Количество единиц, возвращаемое ``acquire``.
+        """
+        with self._condition:
+            self.used -= slots
+            self._condition.notify_all()
+
+
+@dataclass(eq=False)
+class ScheduledJob:
+    """Задача планировщика.
+
+    Запускается ежедневно в ``at`` или через каждые ``interval`` после
+    предыдущего запланированного запуска.
+
+    Attributes:
+        name (str): Название задачи для журнала.
+        func (Callable[[], Any]): Выполняемая функция.
+        slots (int): Количество единиц общего бюджета параллельности,
+            занимаемых задачей во время выполнения.
+        at (time | None): Время ежедневного запуска.
+        interval (timedelta | None): Интервал между запусками.
+        runs (int): Количество завершенных запусков.
+        skipped (int): Количество запусков, пропущенных из-за того, что
+            предыдущий запуск задачи еще выполнялся.
+        is_running (bool): Выполняется ли задача или ждет бюджета.
+        next_run (datetime | None): Время следующего запуска.
+    """
+
+    name: str
+    func: Callable[[], Any]
+    slots: int = 1
+    at: time | None = None
+    interval: timedelta | None = None
+    runs: int = 0
+    skipped: int = 0
+    is_running: bool = False
+    next_run: datetime | None = field(default=None, repr=False)
+
+    def get_next_run(self, now: datetime) -> datetime:
+        """Вычисляет время следующего запуска.
+
+        Запуски, пропущенные, пока процесс не работал или был занят,
+        не наверстываются: следующий запуск всегда позже ``now``.
+
+        Args:
+            now (datetime): Текущее время.
+
+        Returns:
+            datetime: Время следующего запуска.
+        """
+        if self.at is not None:
+            next_run = datetime.combine(now.date(), self.at)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            return next_run
+
+        next_run = (self.next_run or now) + self.interval
+        if next_run <= now:
+            next_run = now + self.interval
+        return next_run
+
+
+class JobScheduler:
+    """Событийный планировщик задач парсинга.
+
+    Поток планировщика спит ровно до ближайшего запланированного запуска
+    (или до добавления задачи и остановки), после чего запускает задачу
+    в отдельном потоке и сразу планирует её следующий запуск. Одновременно
+    выполняется не больше ``workers`` задач, остальные ждут свободного
+    потока.
+    Если предыдущий запуск задачи еще не завершился, очередной запуск
+    пропускается. Все задачи делят общий бюджет параллельности
+    ``ConcurrencyBudget``, поэтому, например, полный обход каталога
+    и частые обновления не превышают вместе заданного числа
+    одновременных запросов.
+
+    Attributes:
+        workers (int): Количество потоков выполнения задач.
+        budget (ConcurrencyBudget): Общий бюджет параллельности.
+        jobs (list[ScheduledJob]): Добавленные задачи.
+    """
+
+    def __init__(self, workers: int, concurrency_budget: int) -> None:
+        self.workers: int = workers
+        self.budget: ConcurrencyBudget = ConcurrencyBudget(concurrency_budget)
+        self.jobs: list[ScheduledJob] = []
+        self._queue: list[tuple[datetime, int, ScheduledJob]] = []
+        self._sequence = count()
+        self._condition: threading.Condition = threading.Condition()
+        self._is_stopped: bool = False
+        self._workers: threading.Semaphore = threading.Semaphore(workers)
+        self._threads: list[threading.Thread] = []
+
+    def every_day(
+        self, name: str, at: str, func: Callable[[], Any], slots: int = 1
+    ) -> ScheduledJob:
+        """Добавляет ежедневную задачу.
+
+        Args:
+            name (str): Название задачи.
+            at (str): Время запуска в формате HH:MM.
+            func (Callable[[], Any]): Выполняемая функция.
+            slots (int, optional): Единицы бюджета параллельности.
+                Значение по умолчанию - 1.
+
+        Returns:
+            ScheduledJob: Добавленная задача.
+        """
+        return self.add(
+            ScheduledJob(name, func, slots, at=time.fromisoformat(at))
+        )
+
+    def every(
+        self,
+        name: str,
+        seconds: float,
+        func: Callable[[], Any],
+        slots: int = 1,
+    ) -> ScheduledJob:
+        """Добавляет задачу, повторяющуюся через заданный интервал.
+
+        Args:
+            name (str): Название задачи.
+            seconds (float): Интервал между запусками в секундах.
+            func (Callable[[], Any]): Выполняемая функция.
+            slots (int, optional): Единицы бюджета параллельности.
+                Значение по умолчанию - 1.
+
+        Returns:
+            ScheduledJob: Добавленная задача.
+        """
+        return self.add(
+            ScheduledJob(
+                name, func, slots, interval=timedelta(seconds=seconds)
+            )
+        )
+
+    def add(self, job: ScheduledJob) -> ScheduledJob:
+        """Добавляет задачу и планирует её первый запуск.
+
+        Args:
+            job (ScheduledJob): Задача.
+
+        Returns:
+            ScheduledJob: Добавленная задача.
+        """
+        with self._condition:
+            self.jobs.append(job)
+            self._push(job, datetime.now())
+            self._condition.notify()
+        logger.info(f"Задача {job.name} запланирована на {job.next_run}.")
+        return job
+
+    def _push(self, job: ScheduledJob, now: datetime) -> None:
+        """Планирует следующий запуск задачи. Вызывается под блокировкой.
+
+        Args:
+            job (ScheduledJob): Задача.
+            now (datetime): Текущее время.
+        """
+        job.next_run = job.get_next_run(now)
+        heapq.heappush(self._queue, (job.next_run, next(self._sequence), job))
+
+    def run(self) -> None:
+        """Выполняет задачи по расписанию до вызова ``stop``.
+
+        После ``stop`` ждет завершения выполняющихся задач. При
+        ``KeyboardInterrupt`` (Ctrl+C) новые задачи не запускаются,
+        а исключение сразу передается вызывающему коду без ожидания:
+        потоки задач служебные (daemon), поэтому выполняющиеся задачи
+        прерываются вместе с процессом.
+
+        Raises:
+            KeyboardInterrupt: Если выполнение прервано пользователем.
+        """
+        try:
+            with self._condition:
+                while not self._is_stopped:
+                    now = datetime.now()
+                    if not self._queue or self._queue[0][0] > now:
+                        self._condition.wait(
+                            (self._queue[0][0] - now).total_seconds()
+                            if self._queue
+                            else None
+                        )
+                        continue
+
+                    _, _, job = heapq.heappop(self._queue)
+                    if job.is_running:
+                        job.skipped += 1
+                        logger.warning(
+                            f"Запуск задачи {job.name} пропущен: "
+                            "предыдущий запуск еще выполняется."
+                        )
+                    else:
+                        job.is_running = True
+                        self._start_job(job)
+                    self._push(job, now)
+        except KeyboardInterrupt:
+            self.stop()
+            logger.warning(
+                "Планировщик прерван, выполняющиеся задачи: "
+                f"#{sum(job.is_running for job in self.jobs)}."
+            )
+            raise
+
+        for thread in self._threads:
+            thread.join()
+
+    def _start_job(self, job: ScheduledJob) -> None:
+        """Запускает задачу в служебном потоке. Вызывается под блокировкой.
+
+        Args:
+            job (ScheduledJob): Задача.
+        """
+        self._threads = [
+            thread for thread in self._threads if thread.is_alive()
+        ]
+        thread = threading.Thread(
+            target=self._run_job,
+            args=(job,),
+            name=f"job-{job.name}",
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _run_job(self, job: ScheduledJob) -> None:
+        """Выполняет задачу в пределах общего бюджета параллельности.
+
+        Args:
+            job (ScheduledJob): Задача.
+        """
+        self._workers.acquire()
+        slots = self.budget.acquire(job.slots)
+        try:
+            logger.info(f"Запуск задачи {job.name}.")
+            job.func()
+        except Exception:
+            logger.exception(f"Ошибка при выполнении задачи {job.name}.")
+        finally:
+            self.budget.release(slots)
+            self._workers.release()
+            with self._condition:
+                job.is_running = False
+                job.runs += 1
+                logger.info(
+                    f"Задача {job.name} завершена, следующий запуск "
+                    f"{job.next_run}."
+                )
+
+    def stop(self) -> None:
+        """Останавливает планировщик, не прерывая выполняющиеся задачи."""
+        with self._condition:
+            self._is_stopped = True
+            self._condition.notify()
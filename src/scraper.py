@@ -1,17 +1,109 @@
+import hashlib
 import json
+import re
+import sys
 import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import nullcontext
+from datetime import datetime
+from functools import partial
+from itertools import chain
+from pathlib import Path
 from typing import Any
 
-import schedule
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from requests import Session
 from requests.exceptions import RequestException
 
-from adapters import HttpClientManager, scraper_http_manager
-from config import ScraperConfig, scraper_conf
-from constants import DELAY
+from adapters import HttpClientManager
+from books_index import BooksIndex
+from checkpoint import CrawlCheckpoint
+from columnar import save_columnar
+from config import ScraperConfig
+from constants import (
+    CATALOG_DISCOVERY_FANOUT,
+    OUTPUT_FORMAT_COLUMNAR,
+    OUTPUT_FORMAT_JSONL,
+    OUTPUT_FORMAT_SQLITE,
+    SCRAPE_MODE_HYBRID,
+    SCRAPE_MODE_LISTING,
+)
+from frontier import CrawlFrontier, canonicalize_url
+from images import ImageDownloader, ImageStore
 from logger import logger
-from utils import timer
+from metrics import (
+    BOOKS_SCRAPED,
+    HTTP_BYTES,
+    HTTP_CONNECTIONS,
+    HTTP_RESPONSES,
+    STAGE_SECONDS,
+    MetricsRegistry,
+    timed,
+)
+from models import Book, book_to_dict, merge_listing_book
+from parse_pool import ParsePool
+from profiling import ScrapeProfiler
+from storage import BooksStorage, JsonLinesWriter, SqliteBooksStorage
+
+
+def _then(value: Any, func: Callable[[Any], Any]) -> Any:
+    """Применяет функцию к значению или к результату Future.
+
+    Если значение - Future, функция вызывается по его завершении в потоке,
+    завершившем Future, а её результат возвращается через новый Future.
+    Если функция сама вернула Future, новый Future завершается вместе
+    с ним. Исключения передаются в новый Future.
+
+    Args:
+        value (Any): Значение или Future.
+        func (Callable[[Any], Any]): Функция от значения.
+
+    Returns:
+        Any: Результат функции или Future с ним.
+    """
+    if not isinstance(value, Future):
+        return func(value)
+
+    chained = Future()
+
+    def set_result(done: Future) -> None:
+        try:
+            chained.set_result(done.result())
+        except Exception as error:
+            chained.set_exception(error)
+
+    def on_done(done: Future) -> None:
+        try:
+            result = func(done.result())
+        except Exception as error:
+            chained.set_exception(error)
+            return
+        if isinstance(result, Future):
+            result.add_done_callback(set_result)
+        else:
+            chained.set_result(result)
+
+    value.add_done_callback(on_done)
+    return chained
+
+
+def _resolve(value: Any) -> Any:
+    """Возвращает значение или дожидается результата Future.
+
+    Args:
+        value (Any): Значение или Future.
+
+    Returns:
+        Any: Значение или результат Future.
+    """
+    return value.result() if isinstance(value, Future) else value
 
 
 class Scraper:
@@ -28,9 +120,23 @@ class Scraper:
     ):
         self.http_manager: HttpClientManager = http_manager
         self.config: ScraperConfig = scraper_config
+        self._books_index: BooksIndex | None = None
+        self._parse_pool: ParsePool | None = None
+        self._checkpoint: CrawlCheckpoint | None = None
+        self._frontier: CrawlFrontier | None = None
+        self._image_downloader: ImageDownloader | None = None
+        self.metrics: MetricsRegistry = MetricsRegistry(
+            enabled=scraper_config.metrics_enabled or scraper_config.profiling
+        )
+
+    @timed("fetch")
+    def _get_response_content(self, session: Session, url: str) -> bytes:
+        """Выполняет HTTP-запрос и возвращает тело ответа.
 
-    def _get_response_as_text(self, session: Session, url: str) -> str:
-        """Выполняет HTTP-запрос и возвращает текст ответа.
+        Тело возвращается в байтах без декодирования: сайт не указывает
+        кодировку в заголовках, и обращение к ``response.text`` запускало бы
+        определение кодировки по содержимому для каждой страницы.
+        Декодирование выполняет парсер в ``_get_soup``.
 
         Args:
             session (Session): Сессия для выполнения запроса.
@@ -41,35 +147,75 @@ class Scraper:
                 или получен статус код ошибки.
 
         Returns:
-            str: Текст HTML-страницы.
+            bytes: Тело HTML-страницы.
         """
         try:
             response = session.get(
                 url,
                 timeout=self.config.response_timeout,
             )
+            if self.metrics.enabled:
+                self.metrics.inc(
+                    HTTP_RESPONSES, status=str(response.status_code)
+                )
+                self.metrics.inc(HTTP_BYTES, len(response.content))
             response.raise_for_status()
-            return response.text
+            return response.content
         except RequestException as error:
             raise RequestException(
                 f"Ошибка при попытке выполнить запрос к {url}: {error}"
             )
 
+    @timed("parse")
     def _get_soup(
-        self, text: str, pars_lib: str = "html.parser"
+        self,
+        markup: str | bytes,
+        pars_lib: str | None = None,
+        parse_only: SoupStrainer | None = None,
     ) -> BeautifulSoup:
-        """Создает объект BeautifulSoup из HTML-текста.
+        """Создает объект BeautifulSoup из HTML-страницы.
+
+        Байты декодируются в кодировке ``response_encoding`` из конфигурации,
+        а если она не задана, BeautifulSoup определяет кодировку сам.
 
         Args:
-            text (str): HTML-текст для парсинга.
-            pars_lib (str, optional): Парсер для BeautifulSoup.
-                Значение по умолчанию - "html.parser".
+            markup (str | bytes): HTML-текст или тело HTML-страницы.
+            pars_lib (str | None, optional): Парсер для BeautifulSoup.
+                Значение по умолчанию - None (парсер из конфигурации).
+            parse_only (SoupStrainer | None, optional): Фильтр, ограничивающий
+                построение дерева нужными элементами. Значение по умолчанию -
+                None (строится дерево всей страницы).
 
         Returns:
             BeautifulSoup: Объект для парсинга HTML.
         """
-        return BeautifulSoup(text, pars_lib)
+        return BeautifulSoup(
+            markup,
+            pars_lib or self.config.parser,
+            parse_only=parse_only,
+            from_encoding=(
+                self.config.response_encoding
+                if isinstance(markup, bytes)
+                else None
+            ),
+        )
+
+    def _get_strainer(self, parse_only: dict[str, Any]) -> SoupStrainer | None:
+        """Создает фильтр частичного парсинга страницы.
 
+        Args:
+            parse_only (dict[str, Any]): Параметры SoupStrainer, описывающие
+                элемент, внутри которого находятся извлекаемые данные.
+
+        Returns:
+            SoupStrainer | None: Фильтр, если частичный парсинг включен
+                в конфигурации, иначе None.
+        """
+        if not self.config.partial_parsing:
+            return None
+        return SoupStrainer(**parse_only)
+
+    @timed("extract_next_page")
     def _get_next_page(self, soup: BeautifulSoup) -> str | None:
         """Извлекает URL следующей страницы каталога.
 
@@ -82,6 +228,52 @@ class Scraper:
         next = soup.select_one("li.next a")
         return next.get("href", self.config.link_not_found) if next else None
 
+    def _get_pages_count(self, soup: BeautifulSoup) -> int:
+        """Извлекает общее количество страниц каталога.
+
+        Args:
+            soup (BeautifulSoup): Объект BeautifulSoup страницы каталога.
+
+        Returns:
+            int: Количество страниц из строки вида "Page 1 of N" или 1,
+                если пагинация на странице отсутствует.
+        """
+        current = soup.select_one("li.current")
+        if not current:
+            return 1
+
+        pages_count = re.search(r"of\s+(\d+)", current.get_text(strip=True))
+        return int(pages_count.group(1)) if pages_count else 1
+
+    def _get_catalog_page_url(self, page_number: int) -> str:
+        """Формирует URL страницы каталога по её номеру.
+
+        Args:
+            page_number (int): Номер страницы каталога, начиная с 1.
+
+        Returns:
+            str: Абсолютный URL страницы каталога.
+        """
+        return canonicalize_url(
+            self.config.catalog_page_template.format(page_number),
+            self.config.base_url,
+        )
+
+    def _get_catalog_soup(self, session: Session, url: str) -> BeautifulSoup:
+        """Загружает страницу каталога и создает для неё объект BeautifulSoup.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            url (str): URL страницы каталога.
+
+        Returns:
+            BeautifulSoup: Объект для парсинга страницы каталога.
+        """
+        return self._get_soup(
+            self._get_response_content(session, url),
+            parse_only=self._get_strainer(self.config.catalog_parse_only),
+        )
+
     def _get_books_redirections(self, soup: BeautifulSoup) -> list[str]:
         """Извлекает список URL книг со страницы каталога.
 
@@ -96,6 +288,7 @@ class Scraper:
             for a in soup.select("section ol.row div.image_container a")
         ]
 
+    @timed("extract_title")
     def _get_title(self, main_data: Tag) -> str:
         """Извлекает название книги из основного блока информации.
 
@@ -108,6 +301,7 @@ class Scraper:
         title = main_data.find("h1")
         return title.get_text(strip=True) if title else self.config.empty_data
 
+    @timed("extract_price")
     def _get_price(self, main_data: Tag) -> str:
         """Извлекает цену книги из основного блока информации.
 
@@ -115,14 +309,10 @@ class Scraper:
             main_data (Tag): HTML-элемент с основной информацией о книге.
 
         Returns:
-            str: Цена книги без символа валюты или EMPTY_DATA, если не найдено.
+            str: Цена книги с символом валюты или EMPTY_DATA, если не найдено.
         """
         price = main_data.find(class_="price_color")
-        return (
-            price.text.replace(self.config.clean_currency, "")
-            if price
-            else self.config.empty_data
-        )
+        return price.text if price else self.config.empty_data
 
     def _formatter_avialable(self, available_data: str):
         """Извлекает числовое значение доступности из строки.
@@ -135,6 +325,7 @@ class Scraper:
         """
         return "".join(i for i in available_data if i.isdigit())
 
+    @timed("extract_available")
     def _get_available(self, main_data: Tag) -> str | None:
         """Извлекает количество доступных копий книги.
 
@@ -151,6 +342,7 @@ class Scraper:
 
         return self.config.empty_data
 
+    @timed("extract_rating")
     def _get_rating(self, main_data: Tag) -> str:
         """Извлекает рейтинг книги из CSS-классов.
 
@@ -170,6 +362,7 @@ class Scraper:
             rating, self.config.unknown_rating_value
         )
 
+    @timed("extract_description")
     def _get_description(self, soup: Tag) -> str:
         """Извлекает описание книги.
 
@@ -191,6 +384,21 @@ class Scraper:
             else self.config.empty_data
         )
 
+    @timed("extract_image")
+    def _get_image(self, soup: Tag) -> str | None:
+        """Извлекает ссылку на обложку книги.
+
+        Args:
+            soup (Tag): Объект BeautifulSoup страницы книги.
+
+        Returns:
+            str | None: Относительная ссылка на обложку или None,
+                если обложка не найдена.
+        """
+        image = soup.select_one("#product_gallery img[src]")
+        return image["src"] if image else None
+
+    @timed("extract_info_table")
     def _get_info_table(self, soup: Tag) -> dict[str, Any]:
         """Извлекает дополнительную информацию из таблицы характеристик.
 
@@ -211,9 +419,6 @@ class Scraper:
             key = row.select_one("th").get_text(strip=True)
             value = row.select_one("td").get_text(strip=True)
 
-            if "Price" in key or "Tax" in key:
-                value = value.replace(self.config.clean_currency, "")
-
             if "Availability" in key:
                 continue
 
@@ -221,22 +426,60 @@ class Scraper:
 
         return info_table
 
-    def _save_books_data_as_file(self, result_data: list[dict[str, Any]]):
+    @timed("save")
+    def _save_books_data_as_file(
+        self, result_data: list[dict[str, Any] | Book]
+    ):
         """Сохраняет данные о книгах в JSON-файл.
 
         Args:
-            result_data (list[dict[str, Any]]): Список словарей с данными о книгах.
+            result_data (list[dict[str, Any] | Book]): Список словарей
+                или записей с данными о книгах.
         """
         self.config.save_dir_path.mkdir(parents=True, exist_ok=True)
         with open(self.config.file_path, mode="w", encoding="utf-8") as write:
-            json.dump(result_data, write, ensure_ascii=False, indent=2)
+            json.dump(
+                [book_to_dict(book) for book in result_data],
+                write,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+    @timed("save")
+    def _save_books_data_as_columnar(
+        self, result_data: list[dict[str, Any] | Book]
+    ) -> Path:
+        """Сохраняет данные о книгах в столбцовый снимок.
+
+        Снимок создается в поддиректории ``snapshots_dir_path`` с именем,
+        соответствующим дате запуска, и может читаться через
+        ``columnar.ColumnarSnapshot`` без разбора всех записей.
 
-    @timer
+        Args:
+            result_data (list[dict[str, Any] | Book]): Список словарей
+                или записей с данными о книгах.
+
+        Returns:
+            Path: Директория сохраненного снимка.
+        """
+        snapshot_path = Path(self.config.snapshots_dir_path) / (
+            datetime.now().strftime(self.config.snapshot_name_format)
+        )
+        save_columnar(result_data, snapshot_path)
+        return snapshot_path
+
+    @timed("book")
     def _get_book_data(
         self, session: Session, book_url: str
-    ) -> dict[str, Any]:
+    ) -> dict[str, Any] | Future:
         """Извлекает полную информацию о книге с её страницы.
 
+        Если запущен пул процессов разбора или включена загрузка обложек,
+        страница и обложка обрабатываются без ожидания, и возвращается
+        Future с данными книги, поэтому поток может сразу загружать
+        следующую страницу. Стадия "book" в этом случае длится до
+        готовности Future, то есть включает разбор и загрузку обложки.
+
         Args:
             session (Session): Сессия для HTTP-запросов.
             book_url (str): URL страницы книги.
@@ -244,18 +487,107 @@ class Scraper:
         Raises:
             ValueError: Если не найдена основная информация о книге.
 
+        Returns:
+            dict[str, Any] | Future: Словарь с полной информацией о книге
+                или Future с ним.
+        """
+        content = self._get_response_content(session, book_url)
+        book = (
+            self._parse_pool.submit(content)
+            if self._parse_pool is not None
+            else self._parse_book_page(content)
+        )
+        if self._image_downloader is not None:
+            book = _then(book, partial(self._add_image, session, book_url))
+        return book
+
+    def _add_image(
+        self, session: Session, book_url: str, book: dict[str, Any]
+    ) -> dict[str, Any] | Future:
+        """Ставит обложку книги в очередь загрузки в хранилище изображений.
+
+        Загрузка выполняется в пуле ``ImageDownloader``, а текущий поток
+        её не ждет: ссылка на обложку заменяется путем файла, когда
+        загрузка завершится. Обложки, сохраненные в предыдущих запусках,
+        повторно не запрашиваются.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            book_url (str): URL страницы книги.
+            book (dict[str, Any]): Данные книги со ссылкой на обложку.
+
+        Returns:
+            dict[str, Any] | Future: Данные книги или Future с ними.
+                "Image" содержит путь файла обложки относительно
+                ``images_dir_path`` или EMPTY_DATA, если обложки нет
+                или загрузка не удалась.
+        """
+        if not book["Image"]:
+            return self._set_image(book, None)
+        return _then(
+            self._image_downloader.submit(
+                session, canonicalize_url(book["Image"], book_url)
+            ),
+            partial(self._set_image, book),
+        )
+
+    def _set_image(
+        self, book: dict[str, Any], path: str | None
+    ) -> dict[str, Any]:
+        """Записывает в данные книги путь файла обложки.
+
+        Args:
+            book (dict[str, Any]): Данные книги.
+            path (str | None): Путь файла обложки или None.
+
+        Returns:
+            dict[str, Any]: Данные книги.
+        """
+        book["Image"] = path or self.config.empty_data
+        return book
+
+    def _parse_book_page(self, page: str | bytes) -> dict[str, Any]:
+        """Разбирает HTML страницы книги и извлекает данные о ней.
+
+        Если запущен пул процессов разбора, страница передается в него,
+        а текущий поток загрузки ждет результата.
+
+        Args:
+            page (str | bytes): HTML-текст или тело страницы книги.
+
+        Raises:
+            ValueError: Если не найдена основная информация о книге.
+
         Returns:
             dict[str, Any]: Словарь с полной информацией о книге.
         """
-        text = self._get_response_as_text(session, book_url)
-        soup = self._get_soup(text)
+        if self._parse_pool is not None:
+            return self._parse_pool.parse(page)
+
+        soup = self._get_soup(
+            page, parse_only=self._get_strainer(self.config.book_parse_only)
+        )
+        return self._extract_book(soup)
+
+    @timed("extract_book")
+    def _extract_book(self, soup: BeautifulSoup) -> dict[str, Any]:
+        """Извлекает данные о книге из разобранной страницы книги.
+
+        Args:
+            soup (BeautifulSoup): Объект BeautifulSoup страницы книги.
+
+        Raises:
+            ValueError: Если не найдена основная информация о книге.
 
+        Returns:
+            dict[str, Any]: Словарь с полной информацией о книге.
+        """
         main_data = soup.find(class_="col-sm-6 product_main")
 
         if not main_data:
             raise ValueError("Не найдена основная информация о книге")
 
-        return {
+        book = {
             "Title": self._get_title(main_data),
             "Price": self._get_price(main_data),
             "Available": self._get_available(main_data),
@@ -263,88 +595,796 @@ class Scraper:
             "Description": self._get_description(soup),
             "Info_table": self._get_info_table(soup),
         }
+        if self.config.download_images:
+            book["Image"] = self._get_image(soup)
+        return book
+
+    def _get_image_downloader(self) -> ImageDownloader | nullcontext:
+        """Создает пул загрузки обложек книг.
+
+        Returns:
+            ImageDownloader | nullcontext: Пул загрузки в хранилище
+                ``images_dir_path``, если в конфигурации включен
+                ``download_images``, иначе пустой контекст, возвращающий
+                None.
+        """
+        if self.config.download_images:
+            return ImageDownloader(
+                ImageStore(self.config.images_dir_path),
+                workers=self.config.image_workers,
+                chunk_size=self.config.image_chunk_size,
+                timeout=self.config.response_timeout,
+            )
+        return nullcontext()
+
+    def _get_executor(self) -> ThreadPoolExecutor | nullcontext:
+        """Создает пул потоков для параллельной загрузки страниц книг.
+
+        Returns:
+            ThreadPoolExecutor | nullcontext: Пул потоков, если в конфигурации
+                задано более одного воркера, иначе пустой контекст,
+                возвращающий None.
+        """
+        if self.config.max_workers > 1:
+            return ThreadPoolExecutor(max_workers=self.config.max_workers)
+        return nullcontext()
+
+    def _get_parse_pool(self) -> ParsePool | nullcontext:
+        """Создает пул процессов для разбора страниц книг.
+
+        Returns:
+            ParsePool | nullcontext: Пул процессов, если в конфигурации
+                задано ``parse_workers`` больше нуля, иначе пустой контекст,
+                возвращающий None.
+        """
+        if self.config.parse_workers > 0:
+            return ParsePool(
+                self.config,
+                workers=self.config.parse_workers,
+                batch_size=self.config.parse_batch_size,
+                max_delay=self.config.parse_batch_delay,
+                metrics=self.metrics,
+            )
+        return nullcontext()
+
+    def _get_frontier(self) -> CrawlFrontier:
+        """Создает множество URL, уже поставленных в обход.
+
+        Returns:
+            CrawlFrontier: Множество URL с фильтром Блума в памяти
+                и точной проверкой по базе на диске.
+        """
+        return CrawlFrontier(
+            self.config.frontier_dir_path,
+            expected_urls=self.config.frontier_expected_urls,
+            false_positive_rate=self.config.frontier_false_positive_rate,
+            buffer_size=self.config.frontier_buffer_size,
+        )
+
+    def _get_listing_fingerprint(self, listing: Tag) -> str:
+        """Вычисляет отпечаток карточки книги на странице каталога.
+
+        В отпечаток входят название, цена, наличие и рейтинг книги, поэтому
+        он меняется при изменении любого из этих полей.
+
+        Args:
+            listing (Tag): HTML-элемент карточки книги в каталоге.
+
+        Returns:
+            str: Хэш данных карточки книги.
+        """
+        title = listing.select_one("h3 a")
+        availability = listing.find(class_="availability")
+        listing_data = (
+            title.get("title", title.get_text(strip=True)) if title else "",
+            self._get_price(listing),
+            availability.get_text(strip=True) if availability else "",
+            self._get_rating(listing),
+        )
+        return hashlib.sha1("\x1f".join(listing_data).encode()).hexdigest()
+
+    @timed("extract_listing")
+    def _get_listing_book(self, listing: Tag) -> dict[str, Any]:
+        """Извлекает данные книги из её карточки на странице каталога.
 
-    @timer
-    def scrape_books(self, is_save: bool = False) -> list[dict[str, Any]]:
+        Карточка содержит полное название, цену, рейтинг и признак
+        наличия, но не количество доступных копий: если оно не указано,
+        "Available" равно EMPTY_DATA, а признак наличия записывается
+        в "In_stock".
+
+        Args:
+            listing (Tag): HTML-элемент карточки книги в каталоге.
+
+        Returns:
+            dict[str, Any]: Словарь с данными карточки книги.
+        """
+        title = listing.select_one("h3 a")
+        availability = listing.find(class_="availability")
+        in_stock = (
+            "instock" in availability.get("class", [])
+            if availability
+            else None
+        )
+        available = (
+            self._formatter_avialable(availability.get_text(strip=True))
+            if availability
+            else ""
+        )
+        if not available and in_stock is False:
+            available = "0"
+
+        book = {
+            "Title": (
+                title.get("title", title.get_text(strip=True))
+                if title
+                else self.config.empty_data
+            ),
+            "Price": self._get_price(listing),
+            "Available": available or self.config.empty_data,
+            "Rating": self._get_rating(listing),
+        }
+        if not available and in_stock is not None:
+            book["In_stock"] = in_stock
+        return book
+
+    @timed("extract_catalog_books")
+    def _get_catalog_books(
+        self, soup: BeautifulSoup
+    ) -> list[tuple[str, str | None, dict[str, Any] | None]]:
+        """Извлекает книги со страницы каталога.
+
+        Книги, уже встречавшиеся в текущем обходе, пропускаются.
+
+        Args:
+            soup (BeautifulSoup): Объект BeautifulSoup страницы каталога.
+
+        Returns:
+            list[tuple[str, str | None, dict[str, Any] | None]]: Тройки из
+                канонического URL страницы книги, отпечатка её карточки
+                и данных карточки. Отпечаток вычисляется только при
+                открытом индексе книг, данные карточки - только при
+                ``scrape_mode`` равном "listing" или "hybrid", иначе -
+                None.
+        """
+        is_listing_needed = self.config.scrape_mode in (
+            SCRAPE_MODE_LISTING,
+            SCRAPE_MODE_HYBRID,
+        )
+        catalog_books = []
+        for link in soup.select("section ol.row div.image_container a"):
+            book_url = canonicalize_url(
+                link.get("href", self.config.link_not_found),
+                self.config.base_url,
+            )
+            if self._frontier is not None and not self._frontier.add(book_url):
+                continue
+            listing = link.find_parent("li") or link
+            fingerprint = (
+                self._get_listing_fingerprint(listing)
+                if self._books_index is not None
+                else None
+            )
+            listing_book = (
+                self._get_listing_book(listing) if is_listing_needed else None
+            )
+            catalog_books.append((book_url, fingerprint, listing_book))
+        return catalog_books
+
+    def _get_catalog_book(
+        self,
+        session: Session,
+        book_url: str,
+        fingerprint: str | None = None,
+        listing_book: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | Future:
+        """Возвращает данные книги из каталога.
+
+        При ``scrape_mode`` равном "listing" возвращаются данные карточки
+        книги без запроса её страницы. В инкрементальном режиме страница
+        книги запрашивается, только если книга новая или отпечаток её
+        карточки изменился, иначе данные переносятся из индекса
+        предыдущего запуска. При ``scrape_mode`` равном "hybrid" страница
+        запрашивается только для книг, которых не было в предыдущем
+        запуске, а данные остальных книг обновляются по карточке. Книги,
+        сохраненные в контрольной точке прерванного запуска, повторно
+        не запрашиваются, а новые книги дописываются в контрольную точку.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            book_url (str): URL страницы книги.
+            fingerprint (str | None, optional): Отпечаток карточки книги.
+                Значение по умолчанию - None.
+            listing_book (dict[str, Any] | None, optional): Данные карточки
+                книги. Значение по умолчанию - None.
+
+        Returns:
+            dict[str, Any] | Future: Словарь с информацией о книге или
+                Future с ним, если страница книги разбирается в пуле
+                процессов.
+        """
+        if self.config.scrape_mode == SCRAPE_MODE_LISTING:
+            return listing_book
+
+        restored = (
+            self._checkpoint.get(book_url)
+            if self._checkpoint is not None
+            else None
+        )
+
+        book = restored
+        if book is None and self._books_index is not None:
+            book = self._books_index.get(book_url, fingerprint)
+            if book is None and listing_book is not None:
+                previous_book = self._books_index.get_previous(book_url)
+                if previous_book is not None:
+                    book = merge_listing_book(previous_book, listing_book)
+        is_reused = book is not None
+        if not is_reused:
+            book = self._get_book_data(session, book_url)
+        return _then(
+            book,
+            partial(
+                self._record_book,
+                book_url,
+                fingerprint,
+                is_reused,
+                restored is not None,
+            ),
+        )
+
+    def _record_book(
+        self,
+        book_url: str,
+        fingerprint: str | None,
+        is_reused: bool,
+        is_restored: bool,
+        book: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Добавляет книгу в индекс книг и в контрольную точку.
+
+        Args:
+            book_url (str): URL страницы книги.
+            fingerprint (str | None): Отпечаток карточки книги.
+            is_reused (bool): Взяты ли данные без запроса страницы книги.
+            is_restored (bool): Взяты ли данные из контрольной точки.
+            book (dict[str, Any]): Данные книги.
+
+        Returns:
+            dict[str, Any]: Данные книги.
+        """
+        if self._books_index is not None:
+            self._books_index.add(book_url, fingerprint, book, is_reused)
+        if not is_restored and self._checkpoint is not None:
+            self._checkpoint.add(book_url, book)
+        return book
+
+    def _get_books_data(
+        self,
+        session: Session,
+        catalog_books: list[tuple[str, str | None, dict[str, Any] | None]],
+        executor: Executor | None = None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Извлекает данные о книгах со страницы каталога.
+
+        При наличии пула потоков страницы книг загружаются параллельно,
+        при этом порядок результатов совпадает с порядком ссылок. Сначала
+        загружаются все страницы книг, а разбор в пуле процессов
+        дожидается только при выдаче очередной книги.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            catalog_books (list[tuple[str, str | None, dict[str, Any] |
+                None]]): Тройки из URL страницы книги, отпечатка и данных
+                её карточки.
+            executor (Executor | None, optional): Пул для параллельной
+                загрузки. Значение по умолчанию - None (последовательно).
+
+        Yields:
+            tuple[str, dict[str, Any]]: URL страницы книги и словарь
+                с данными о книге.
+        """
+        if executor is None:
+            books = [
+                self._get_catalog_book(session, *catalog_book)
+                for catalog_book in catalog_books
+            ]
+        else:
+            books = list(
+                executor.map(
+                    partial(self._get_catalog_book, session),
+                    *zip(*catalog_books),
+                )
+            )
+        for (book_url, *_), book in zip(catalog_books, books):
+            yield book_url, _resolve(book)
+
+    def _iter_books_sequential(
+        self,
+        session: Session,
+        soup: BeautifulSoup,
+        executor: Executor | None = None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Обходит каталог, переходя по ссылкам "next" страница за страницей.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            soup (BeautifulSoup): Объект BeautifulSoup первой страницы.
+            executor (Executor | None, optional): Пул для параллельной
+                загрузки страниц книг. Значение по умолчанию - None.
+
+        Yields:
+            tuple[str, dict[str, Any]]: URL страницы книги и словарь
+                с данными о книге.
+        """
+        while True:
+            yield from self._get_books_data(
+                session, self._get_catalog_books(soup), executor
+            )
+
+            next_page = self._get_next_page(soup)
+            if not next_page:
+                break
+
+            page_url = canonicalize_url(next_page, self.config.base_url)
+            if self._frontier is not None and not self._frontier.add(page_url):
+                break
+            soup = self._get_catalog_soup(session, page_url)
+
+    def _iter_books_fanout(
+        self,
+        session: Session,
+        soup: BeautifulSoup,
+        executor: Executor | None = None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Обходит каталог, запрашивая все его страницы одновременно.
+
+        Количество страниц определяется по первой странице, после чего
+        URL остальных страниц формируются по шаблону и ставятся в очередь
+        пула сразу. Книги каждой загруженной страницы каталога попадают
+        в ту же очередь, поэтому загрузка книг идет параллельно с загрузкой
+        каталога. Порядок результатов совпадает с порядком книг в каталоге.
+
+        Args:
+            session (Session): Сессия для HTTP-запросов.
+            soup (BeautifulSoup): Объект BeautifulSoup первой страницы.
+            executor (Executor | None, optional): Пул для параллельной
+                загрузки. Без пула страницы обходятся последовательно.
+                Значение по умолчанию - None.
+
+        Yields:
+            tuple[str, dict[str, Any]]: URL страницы книги и словарь
+                с данными о книге.
+        """
+        pages_urls = [
+            self._get_catalog_page_url(page_number)
+            for page_number in range(2, self._get_pages_count(soup) + 1)
+        ]
+
+        if executor is None:
+            yield from self._get_books_data(
+                session, self._get_catalog_books(soup)
+            )
+            for page_url in pages_urls:
+                yield from self._get_books_data(
+                    session,
+                    self._get_catalog_books(
+                        self._get_catalog_soup(session, page_url)
+                    ),
+                )
+            return
+
+        pages_futures: dict[Future, int] = {
+            executor.submit(self._get_catalog_soup, session, page_url): index
+            for index, page_url in enumerate(pages_urls, start=1)
+        }
+        books_futures: dict[int, list[tuple[str, Future]]] = {}
+        ordered_futures: deque[tuple[str, Future]] = deque()
+        next_page_index = 0
+
+        def submit_books(page_index: int, page_soup: BeautifulSoup) -> None:
+            nonlocal next_page_index
+            books_futures[page_index] = [
+                (
+                    catalog_book[0],
+                    executor.submit(
+                        self._get_catalog_book, session, *catalog_book
+                    ),
+                )
+                for catalog_book in self._get_catalog_books(page_soup)
+            ]
+            while next_page_index in books_futures:
+                ordered_futures.extend(books_futures.pop(next_page_index))
+                next_page_index += 1
+
+        try:
+            submit_books(0, soup)
+            for page_future in as_completed(pages_futures):
+                submit_books(pages_futures[page_future], page_future.result())
+                while ordered_futures and ordered_futures[0][1].done():
+                    book_url, book_future = ordered_futures.popleft()
+                    yield book_url, _resolve(book_future.result())
+
+            while ordered_futures:
+                book_url, book_future = ordered_futures.popleft()
+                yield book_url, _resolve(book_future.result())
+        finally:
+            for future in pages_futures:
+                future.cancel()
+            for _, future in chain(ordered_futures, *books_futures.values()):
+                future.cancel()
+
+    def _get_checkpoint(self, resume: bool) -> CrawlCheckpoint | None:
+        """Открывает контрольную точку обхода, если она задана в конфигурации.
+
+        Args:
+            resume (bool): Продолжить ли прерванный обход.
+
+        Returns:
+            CrawlCheckpoint | None: Открытая контрольная точка или None,
+                если ``checkpoint_path`` не задан.
+        """
+        if not self.config.checkpoint_path:
+            return None
+
+        checkpoint = CrawlCheckpoint(
+            self.config.checkpoint_path, self.config.checkpoint_interval
+        )
+        checkpoint.open(resume=resume)
+        if resume:
+            logger.info(
+                "Продолжение прерванного парсинга: книг в контрольной точке "
+                f"#{len(checkpoint)}."
+            )
+        return checkpoint
+
+    def iter_books(
+        self, resume: bool = False
+    ) -> Iterator[dict[str, Any] | Book]:
+        """Перебирает книги каталога по мере их извлечения.
+
+        Каждая книга возвращается сразу после разбора её страницы, поэтому
+        потребитель может обрабатывать и сохранять данные, не дожидаясь
+        окончания обхода всего каталога. Если в конфигурации задано
+        ``max_workers`` больше единицы, страницы книг загружаются
+        параллельно. При ``catalog_discovery`` равном "fanout" все страницы
+        каталога запрашиваются сразу, не дожидаясь ссылки "next". При
+        ``incremental`` страницы запрашиваются только для новых или
+        изменившихся в каталоге книг, остальные данные переносятся из
+        индекса предыдущего запуска. При ``scrape_mode`` равном "listing"
+        страницы книг не запрашиваются: данные (название, цена, рейтинг,
+        наличие) берутся из карточек каталога, поэтому обход требует
+        по одному запросу на страницу каталога. При "hybrid" страницы
+        запрашиваются только для книг, не встречавшихся в предыдущем
+        запуске, а данные остальных книг обновляются по карточкам
+        каталога. При ``parse_workers`` больше нуля
+        потоки только загружают страницы книг, а разбор выполняется
+        пакетами в пуле процессов. При ``download_images`` обложки книг
+        загружаются в хранилище ``images_dir_path``, а в данные книги
+        добавляется путь файла обложки. При ``as_records`` вместо словарей
+        возвращаются компактные записи ``Book``.
+
+        Обработанные книги периодически сохраняются в контрольную точку
+        ``checkpoint_path``, которая удаляется после успешного обхода.
+        При ``resume`` каталог обходится заново, но страницы книг из
+        контрольной точки прерванного запуска повторно не запрашиваются.
+        При ``scrape_mode`` равном "listing" страницы книг не загружаются,
+        поэтому контрольная точка не открывается и не изменяется.
+
+        Args:
+            resume (bool, optional): Продолжить ли прерванный обход
+                с последней контрольной точки. Значение по умолчанию - False.
+
+        Yields:
+            dict[str, Any] | Book: Данные о книге в порядке каталога.
+        """
+        for _, book in self._iter_books(resume):
+            yield book
+
+    def _iter_books(
+        self, resume: bool = False
+    ) -> Iterator[tuple[str, dict[str, Any] | Book]]:
+        """Перебирает книги каталога вместе с URL их страниц.
+
+        Args:
+            resume (bool, optional): Продолжить ли прерванный обход
+                с последней контрольной точки. Значение по умолчанию - False.
+
+        Yields:
+            tuple[str, dict[str, Any] | Book]: URL страницы книги и данные
+                о книге в порядке каталога.
+        """
+        logger.info("Начало процесса парсинга.")
+        is_listing_only = self.config.scrape_mode == SCRAPE_MODE_LISTING
+        self._books_index = (
+            BooksIndex(self.config.books_index_path)
+            if not is_listing_only
+            and (
+                self.config.incremental
+                or self.config.scrape_mode == SCRAPE_MODE_HYBRID
+            )
+            else None
+        )
+        if self._books_index is not None:
+            self._books_index.load()
+        self._checkpoint = (
+            self._get_checkpoint(resume) if not is_listing_only else None
+        )
+        self.http_manager.ensure_pool_size(
+            self.config.max_workers
+            + self.config.download_images * self.config.image_workers
+        )
+
+        try:
+            with (
+                self.http_manager.run_session() as session,
+                self._get_parse_pool() as parse_pool,
+                self._get_executor() as executor,
+                self._get_frontier() as frontier,
+                self._get_image_downloader() as image_downloader,
+            ):
+                self._parse_pool = parse_pool
+                self._frontier = frontier
+                self._image_downloader = image_downloader
+                frontier.add(canonicalize_url(self.config.start_catalog_page))
+                soup = self._get_catalog_soup(
+                    session, self.config.start_catalog_page
+                )
+
+                if self.config.catalog_discovery == CATALOG_DISCOVERY_FANOUT:
+                    books = self._iter_books_fanout(session, soup, executor)
+                else:
+                    books = self._iter_books_sequential(
+                        session, soup, executor
+                    )
+
+                if self.config.as_records:
+                    books = (
+                        (book_url, Book.from_dict(book))
+                        for book_url, book in books
+                    )
+                yield from books
+                logger.info(
+                    f"Уникальных URL в обходе: #{frontier.added}, "
+                    f"пропущено повторов: #{frontier.duplicates}."
+                )
+                if image_downloader is not None:
+                    logger.info(
+                        f"Обложки: загружено #{image_downloader.downloaded} "
+                        f"(из них дубликатов #{image_downloader.duplicates}), "
+                        f"взято из хранилища #{image_downloader.skipped}, "
+                        f"ошибок #{image_downloader.failed}."
+                    )
+        finally:
+            self._parse_pool = None
+            self._frontier = None
+            self._image_downloader = None
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+
+        logger.info("Парсинг сайта завершен.")
+        if self._checkpoint is not None:
+            if resume:
+                logger.info(
+                    "Взято из контрольной точки книг: "
+                    f"#{self._checkpoint.restored}."
+                )
+            self._checkpoint.remove()
+            self._checkpoint = None
+        if self._books_index is not None:
+            self._books_index.save()
+            logger.info(
+                f"Загружено книг: #{self._books_index.fetched}, "
+                f"перенесено из индекса: #{self._books_index.reused}."
+            )
+        if self.http_manager.cache:
+            cache_stats = self.http_manager.cache.pop_stats()
+            logger.info(
+                f"HTTP-кэш: попаданий #{cache_stats['hits']}, "
+                f"промахов #{cache_stats['misses']} "
+                f"({cache_stats['hit_ratio']:.0%} попаданий)."
+            )
+        connection_stats = self.http_manager.pop_connection_stats()
+        logger.info(
+            f"HTTP-соединения: запросов #{connection_stats['requests']}, "
+            f"новых соединений #{connection_stats['connections']} "
+            f"({connection_stats['reuse_ratio']:.0%} запросов по открытым "
+            "соединениям)."
+        )
+        if self.metrics.enabled:
+            self.metrics.inc(
+                HTTP_CONNECTIONS,
+                connection_stats["connections"],
+                reused="false",
+            )
+            self.metrics.inc(
+                HTTP_CONNECTIONS, connection_stats["reused"], reused="true"
+            )
+        if self.http_manager.limiter:
+            for host, host_stats in self.http_manager.limiter.stats().items():
+                logger.info(
+                    f"Ограничение запросов к {host}: лимит параллельности "
+                    f"{host_stats['limit']:.1f}, ответов 429/503 "
+                    f"#{host_stats['throttled']}."
+                )
+
+    def scrape_books(
+        self, is_save: bool = False, resume: bool = False
+    ) -> list[dict[str, Any] | Book]:
         """Парсит данные о всех книгах из каталога.
 
-        Обходит все страницы каталога, извлекает информацию о каждой книге
-        и возвращает список с данными. Может сохранять результаты в файл.
+        Собирает в список книги, возвращаемые ``iter_books``. Может
+        сохранять результаты в файл: при ``output_format`` равном "jsonl"
+        каждая книга дописывается в файл JSON Lines сразу после разбора,
+        при "sqlite" книги пакетами записываются в базу ``sqlite_path``
+        (перезаписываются только изменившиеся книги), при "columnar"
+        по окончании обхода создается столбцовый снимок, иначе весь
+        список записывается в JSON-файл.
+
+        Если в конфигурации включен ``metrics_enabled``, по окончании
+        обхода метрики запуска (время стадий, статусы и объем ответов)
+        записываются в ``metrics_dir_path`` в форматах Prometheus и JSON.
+        Если включен ``profiling``, запуск профилируется, а результаты
+        сохраняются в поддиректорию ``profile_dir_path``.
 
         Args:
             is_save (bool, optional): Сохранять ли данные в файл.
                 Значение по умолчанию - False.
+            resume (bool, optional): Продолжить ли прерванный обход
+                с последней контрольной точки. Значение по умолчанию - False.
+
+        Raises:
+            ValueError: Если при ``scrape_mode`` равном "listing" данные
+                сохраняются не в базу SQLite.
 
         Returns:
-            list[dict[str, Any]]: Список словарей с данными о книгах.
+            list[dict[str, Any] | Book]: Список словарей или записей
+                с данными о книгах.
         """
-        logger.info("Начало процесса парсинга.")
-        with self.http_manager.session as session:
-            text = self._get_response_as_text(
-                session,
-                self.config.start_catalog_page,
+        with self._get_profiler() as profiler:
+            self.metrics.profiler = profiler
+            try:
+                scraped_books = self._scrape_books(is_save, resume)
+            finally:
+                self.metrics.profiler = None
+
+        if profiler is not None:
+            logger.info(
+                f"Результаты профилирования сохранены в {profiler.output_dir}."
             )
-            soup = self._get_soup(text)
+        return scraped_books
 
-            scraped_books = []
-            while True:
-                books_redirections = self._get_books_redirections(soup)
-                for book_redirect in books_redirections:
-                    book_url = self.config.base_url + book_redirect
-                    scraped_book = self._get_book_data(session, book_url)
-                    scraped_books.append(scraped_book)
+    def _get_profiler(self) -> ScrapeProfiler | nullcontext:
+        """Создает профилировщик запуска.
 
-                next_page = self._get_next_page(soup)
-                if not next_page:
-                    break
+        Returns:
+            ScrapeProfiler | nullcontext: Профилировщик, если в конфигурации
+                включен ``profiling``, иначе пустой контекст, возвращающий
+                None.
+        """
+        if self.config.profiling:
+            return ScrapeProfiler.for_run(
+                self.config.profile_dir_path,
+                self.config.profile_sample_interval,
+            )
+        return nullcontext()
 
-                next_page_url = self.config.base_url + next_page
-                text = self._get_response_as_text(session, next_page_url)
-                soup = self._get_soup(text)
+    def _scrape_books(
+        self, is_save: bool, resume: bool
+    ) -> list[dict[str, Any] | Book]:
+        """Собирает, сохраняет книги и выгружает метрики запуска.
 
-        if is_save:
-            self._save_books_data_as_file(scraped_books)
+        Args:
+            is_save (bool): Сохранять ли данные в файл.
+            resume (bool): Продолжить ли прерванный обход.
+
+        Raises:
+            ValueError: Если при ``scrape_mode`` равном "listing" данные
+                сохраняются не в базу SQLite.
+
+        Returns:
+            list[dict[str, Any] | Book]: Список словарей или записей
+                с данными о книгах.
+        """
+        if (
+            is_save
+            and self.config.scrape_mode == SCRAPE_MODE_LISTING
+            and self.config.output_format != OUTPUT_FORMAT_SQLITE
+        ):
+            raise ValueError(
+                "Результаты обхода по карточкам каталога сохраняются только "
+                "в базу SQLite: файлы других форматов перезаписываются, "
+                "и полные данные книг в них были бы потеряны"
+            )
+
+        self.metrics.reset()
+        start_time = time.perf_counter()
+        storage = self._get_storage() if is_save else None
+        scraped_books = []
+        with nullcontext() if storage is None else storage:
+            for book_url, book in self._iter_books(resume):
+                if storage is not None:
+                    self._save_book_to_storage(storage, book, book_url)
+                scraped_books.append(book)
+
+        if isinstance(storage, SqliteBooksStorage):
+            logger.info(
+                f"База книг: записано #{storage.written}, без изменений "
+                f"#{storage.unchanged}, удалено #{storage.removed}."
+            )
+        if is_save and storage is None:
+            if self.config.output_format == OUTPUT_FORMAT_COLUMNAR:
+                self._save_books_data_as_columnar(scraped_books)
+            else:
+                self._save_books_data_as_file(scraped_books)
 
-        logger.info("Парсинг сайта завершен.")
         logger.info(f"Обработано страниц с книгами: #{len(scraped_books)}.")
+        if self.metrics.enabled:
+            self.metrics.inc(BOOKS_SCRAPED, len(scraped_books))
+            self.metrics.observe(
+                STAGE_SECONDS, time.perf_counter() - start_time, stage="scrape"
+            )
+            self._export_metrics()
         return scraped_books
 
-    def create_dayly_task(
-        self,
-        start_time: str | None = None,
-    ) -> schedule.Job:
-        """Создает ежедневную задачу для автоматического парсинга.
+    def _get_storage(self) -> BooksStorage | None:
+        """Создает хранилище для записи книг по мере парсинга.
 
-        Args:
-            start_time (str, optional): Время запуска в формате HH:MM.
-                Значение по умолчанию - TASK_START_TIME.
+        При ``scrape_mode`` равном "listing" карточки книг обновляют
+        существующие строки базы SQLite по URL книги, а книги, не
+        встретившиеся в обходе, не удаляются.
 
         Returns:
-            schedule.Job: Объект запланированной задачи.
+            BooksStorage | None: Файл JSON Lines при ``output_format``
+                равном "jsonl", база SQLite при "sqlite", иначе None
+                (книги сохраняются по окончании обхода).
         """
-        if not start_time:
-            start_time = self.config.start_time
+        if self.config.output_format == OUTPUT_FORMAT_JSONL:
+            return JsonLinesWriter(self.config.jsonl_file_path)
+        if self.config.output_format == OUTPUT_FORMAT_SQLITE:
+            is_listing_only = self.config.scrape_mode == SCRAPE_MODE_LISTING
+            return SqliteBooksStorage(
+                self.config.sqlite_path,
+                batch_size=self.config.storage_batch_size,
+                prune_missing=not is_listing_only,
+                merge_listings=is_listing_only,
+            )
+        return None
 
-        schedule.every().day.at(start_time).do(self.scrape_books, is_save=True)
-        logger.info(f"Запланирован запус на {start_time}")
+    @timed("save")
+    def _save_book_to_storage(
+        self,
+        storage: BooksStorage,
+        book: dict[str, Any] | Book,
+        book_url: str | None = None,
+    ) -> None:
+        """Записывает книгу в хранилище.
 
+        Args:
+            storage (BooksStorage): Открытое хранилище.
+            book (dict[str, Any] | Book): Словарь или запись о книге.
+            book_url (str | None, optional): URL страницы книги.
+                Значение по умолчанию - None.
+        """
+        storage.write(book, book_url)
 
-if __name__ == "__main__":
-    book_scraper = Scraper(
-        http_manager=scraper_http_manager,
-        scraper_config=scraper_conf,
-    )
+    def _export_metrics(self) -> None:
+        """Сохраняет метрики запуска и выводит сводку по стадиям в лог."""
+        for histogram in self.metrics.snapshot()["histograms"]:
+            if histogram["name"] != STAGE_SECONDS:
+                continue
+            logger.info(
+                f"Стадия {histogram['labels']['stage']}: "
+                f"вызовов #{histogram['count']}, "
+                f"всего {histogram['sum']:.2f} с, "
+                f"p50 {histogram['p50'] * 1000:.1f} мс, "
+                f"p95 {histogram['p95'] * 1000:.1f} мс, "
+                f"p99 {histogram['p99'] * 1000:.1f} мс."
+            )
+        prometheus_path, _ = self.metrics.export(self.config.metrics_dir_path)
+        logger.info(f"Метрики запуска сохранены в {prometheus_path.parent}.")
 
-    book_scraper.create_dayly_task()
 
-    try:
-        while True:
-            logger.info("Отслеживаем начало времени запуска...")
-            schedule.run_pending()
-            next_run = schedule.idle_seconds()
-            logger.info(f"Следующий запуск через: {next_run:.2f} секунд")
-            time.sleep(min(next_run, DELAY))
-    except Exception as error:
-        print(f"Возникла ошибка при парсинге данных: {error}")
-    except KeyboardInterrupt:
-        print("Ручная остановка работы программы")
+if __name__ == "__main__":
+    from cli import main
+
+    main(["daemon", *sys.argv[1:]])
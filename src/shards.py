@@ -0,0 +1,560 @@
+import argparse
+import os
+import socket
+import sqlite3
+import time
+from dataclasses import replace
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from adapters import HttpClientManager
+from config import ScraperConfig, SessionConfig
+from constants import (
+    ARCHIVE_MODE_RECORD,
+    OUTPUT_FORMAT_COLUMNAR,
+    SCRAPE_MODE_FULL,
+    SCRAPE_MODE_HYBRID,
+    SCRAPE_MODE_LISTING,
+    SHARD_POLL_INTERVAL,
+)
+from frontier import canonicalize_url
+from logger import logger
+from scraper import Scraper
+from storage import JsonLinesWriter, read_json_lines
+
+SHARD_PENDING: str = "pending"
+SHARD_RUNNING: str = "running"
+SHARD_DONE: str = "done"
+SHARD_FAILED: str = "failed"
+
+
+class ShardQueue:
+    """
+    Очередь шардов обхода каталога в базе SQLite.
+
+    Шард - категория каталога, которую один обработчик обходит целиком.
+    Обработчик забирает шард в аренду на ``lease_timeout`` секунд
+    и продлевает её во время обхода. Если обработчик завершился аварийно,
+    аренда истекает и шард забирает другой обработчик; после
+    ``max_attempts`` попыток шард помечается как неудачный.
+
+    Состояние хранится только в файле базы, поэтому к очереди могут
+    подключаться процессы, запущенные позже, в том числе на других
+    машинах с общей файловой системой. Для этого база использует журнал
+    отката, а не WAL, которому нужна общая память, а сроки аренды
+    считаются по системным часам, которые на машинах должны быть
+    синхронизированы.
+
+    Attributes:
+        path (Path): Путь к файлу базы очереди
+        lease_timeout (float): Срок аренды шарда в секундах
+        max_attempts (int): Максимальное количество попыток обхода шарда
+    """
+
+    def __init__(
+        self, path: Path, lease_timeout: float, max_attempts: int
+    ) -> None:
+        self.path: Path = Path(path)
+        self.lease_timeout: float = lease_timeout
+        self.max_attempts: int = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None
+        )
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS shards (
+                url TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result_path TEXT,
+                error TEXT
+            )
+            """
+        )
+
+    def close(self) -> None:
+        """Закрывает соединение с базой очереди."""
+        self._connection.close()
+
+    def reset(self, shards: list[tuple[str, str]]) -> None:
+        """
+        Заменяет содержимое очереди новым набором шардов.
+
+        Args:
+            shards: Пары из названия и URL первой страницы категории
+        """
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute("DELETE FROM shards")
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO shards (url, name, position, status) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (url, name, position, SHARD_PENDING)
+                    for position, (name, url) in enumerate(shards)
+                ],
+            )
+
+    def claim(self, worker: str) -> tuple[str, str, int] | None:
+        """
+        Забирает в аренду следующий свободный шард.
+
+        Свободными считаются ожидающие шарды и шарды с истекшей арендой.
+        Шарды с истекшей арендой, исчерпавшие попытки, помечаются как
+        неудачные.
+
+        Args:
+            worker: Идентификатор обработчика
+
+        Returns:
+            URL, название и позиция шарда или None, если свободных
+            шардов нет
+        """
+        now = time.time()
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute(
+                "UPDATE shards SET status = ?, error = 'Истек срок аренды' "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (SHARD_FAILED, SHARD_RUNNING, now, self.max_attempts),
+            )
+            shard = self._connection.execute(
+                "SELECT url, name, position FROM shards "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY position LIMIT 1",
+                (SHARD_PENDING, SHARD_RUNNING, now),
+            ).fetchone()
+            if shard is None:
+                return None
+            self._connection.execute(
+                "UPDATE shards SET status = ?, worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE url = ?",
+                (SHARD_RUNNING, worker, now + self.lease_timeout, shard[0]),
+            )
+        return shard
+
+    def extend(self, url: str, worker: str) -> bool:
+        """
+        Продлевает аренду шарда.
+
+        Args:
+            url: URL шарда
+            worker: Идентификатор обработчика
+
+        Returns:
+            True, если шард все еще арендован этим обработчиком
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                "UPDATE shards SET lease_expires = ? "
+                "WHERE url = ? AND worker = ? AND status = ?",
+                (time.time() + self.lease_timeout, url, worker, SHARD_RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, url: str, worker: str, result_path: Path) -> None:
+        """
+        Отмечает шард как обработанный.
+
+        Args:
+            url: URL шарда
+            worker: Идентификатор обработчика
+            result_path: Путь к файлу с книгами шарда
+        """
+        with self._connection:
+            self._connection.execute(
+                "UPDATE shards SET status = ?, result_path = ?, error = NULL "
+                "WHERE url = ? AND worker = ?",
+                (SHARD_DONE, str(result_path), url, worker),
+            )
+
+    def fail(self, url: str, worker: str, error: str) -> None:
+        """
+        Возвращает шард в очередь после ошибки обхода.
+
+        Если попытки исчерпаны, шард помечается как неудачный.
+
+        Args:
+            url: URL шарда
+            worker: Идентификатор обработчика
+            error: Описание ошибки
+        """
+        with self._connection:
+            self._connection.execute(
+                "UPDATE shards SET status = CASE WHEN attempts >= ? "
+                "THEN ? ELSE ? END, worker = NULL, lease_expires = NULL, "
+                "error = ? WHERE url = ? AND worker = ?",
+                (
+                    self.max_attempts,
+                    SHARD_FAILED,
+                    SHARD_PENDING,
+                    error,
+                    url,
+                    worker,
+                ),
+            )
+
+    def stats(self) -> dict[str, int]:
+        """
+        Возвращает количество шардов в каждом состоянии.
+
+        Returns:
+            Словарь вида {состояние: количество}
+        """
+        return dict(
+            self._connection.execute(
+                "SELECT status, COUNT(*) FROM shards GROUP BY status"
+            ).fetchall()
+        )
+
+    def is_finished(self) -> bool:
+        """
+        Проверяет, завершена ли обработка всех шардов.
+
+        Returns:
+            True, если не осталось ожидающих и арендованных шардов
+        """
+        return not self._connection.execute(
+            "SELECT 1 FROM shards WHERE status IN (?, ?) LIMIT 1",
+            (SHARD_PENDING, SHARD_RUNNING),
+        ).fetchone()
+
+    def results(self) -> list[Path]:
+        """
+        Возвращает файлы с книгами обработанных шардов.
+
+        Returns:
+            Пути к файлам в порядке категорий
+        """
+        return [
+            Path(result_path)
+            for (result_path,) in self._connection.execute(
+                "SELECT result_path FROM shards WHERE status = ? "
+                "ORDER BY position",
+                (SHARD_DONE,),
+            )
+        ]
+
+
+def get_categories(scraper: Scraper) -> list[tuple[str, str]]:
+    """Извлекает категории каталога из боковой панели стартовой страницы.
+
+    Общая категория "Books" содержит все книги, поэтому в шарды попадают
+    только вложенные в неё категории. Если их нет, весь каталог
+    обрабатывается одним шардом.
+
+    Args:
+        scraper (Scraper): Парсер, через который загружается страница.
+
+    Returns:
+        list[tuple[str, str]]: Пары из названия категории и абсолютного
+            URL её первой страницы.
+    """
+    start_page = scraper.config.start_catalog_page
+    with scraper.http_manager.run_session() as session:
+        soup = scraper._get_soup(
+            scraper._get_response_content(session, start_page)
+        )
+    categories = [
+        (
+            link.get_text(strip=True),
+            canonicalize_url(link["href"], start_page),
+        )
+        for link in soup.select(".side_categories ul.nav-list ul a[href]")
+    ]
+    return categories or [("Books", start_page)]
+
+
+def get_worker_id() -> str:
+    """Возвращает идентификатор текущего процесса-обработчика.
+
+    Returns:
+        str: Имя машины и PID процесса.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _scrape_shard(
+    queue: ShardQueue,
+    worker: str,
+    scraper: Scraper,
+    url: str,
+    result_path: Path,
+) -> None:
+    """Обходит категорию и записывает её книги в файл JSON Lines.
+
+    Книги записываются во временный файл, который переименовывается
+    после успешного обхода, поэтому в очереди не появляются ссылки
+    на частично записанные результаты. Во время обхода продлевается
+    аренда шарда.
+
+    Args:
+        queue (ShardQueue): Очередь шардов.
+        worker (str): Идентификатор обработчика.
+        scraper (Scraper): Парсер, настроенный на категорию.
+        url (str): URL первой страницы категории.
+        result_path (Path): Путь к файлу с книгами шарда.
+
+    Raises:
+        RuntimeError: Если аренда шарда перешла к другому обработчику.
+    """
+    temp_path = result_path.with_name(result_path.name + f".{os.getpid()}")
+    extended_at = time.monotonic()
+    with JsonLinesWriter(temp_path) as writer:
+        for book in scraper.iter_books():
+            writer.write(book)
+            if time.monotonic() - extended_at > queue.lease_timeout / 3:
+                if not queue.extend(url, worker):
+                    raise RuntimeError("Аренда шарда перешла к другому")
+                extended_at = time.monotonic()
+    temp_path.replace(result_path)
+
+
+def run_shard_worker(
+    session_config: SessionConfig, scraper_config: ScraperConfig
+) -> int:
+    """Обрабатывает шарды из очереди, пока все они не будут завершены.
+
+    Для каждой категории существующий ``Scraper`` запускается
+    с ``base_url`` и ``start_catalog_page`` категории. Контрольные точки,
+    инкрементальный и гибридный режимы и выгрузка метрик в обработчиках
+    отключены, так как их файлы общие для всех запусков: единицей
+    повторной обработки служит шард. Если свободных шардов нет, но другие
+    обработчики еще работают, обработчик ждет, чтобы забрать шарды
+    с истекшей арендой.
+
+    Args:
+        session_config (SessionConfig): Конфигурация HTTP-сессии.
+        scraper_config (ScraperConfig): Конфигурация парсера.
+
+    Returns:
+        int: Количество обработанных шардов.
+    """
+    worker = get_worker_id()
+    queue = ShardQueue(
+        scraper_config.shard_queue_path,
+        scraper_config.shard_lease_timeout,
+        scraper_config.shard_max_attempts,
+    )
+    results_dir = Path(scraper_config.shard_results_dir_path)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    http_manager = HttpClientManager(session_config)
+    processed = 0
+
+    try:
+        while not queue.is_finished():
+            shard = queue.claim(worker)
+            if shard is None:
+                time.sleep(SHARD_POLL_INTERVAL)
+                continue
+
+            url, name, position = shard
+            logger.info(f"Обработчик {worker}: категория {name}.")
+            scraper = Scraper(
+                http_manager,
+                replace(
+                    scraper_config,
+                    base_url=url.rsplit("/", 1)[0] + "/",
+                    start_catalog_page=url,
+                    checkpoint_path=None,
+                    incremental=False,
+                    scrape_mode=(
+                        SCRAPE_MODE_FULL
+                        if scraper_config.scrape_mode == SCRAPE_MODE_HYBRID
+                        else scraper_config.scrape_mode
+                    ),
+                    metrics_enabled=False,
+                    profiling=False,
+                    as_records=False,
+                ),
+            )
+            result_path = results_dir / f"shard-{position:04d}.jsonl"
+            try:
+                _scrape_shard(queue, worker, scraper, url, result_path)
+            except Exception as error:
+                logger.error(
+                    f"Обработчик {worker}: ошибка в категории {name}: {error}"
+                )
+                queue.fail(url, worker, str(error))
+                continue
+            queue.complete(url, worker, result_path)
+            processed += 1
+    finally:
+        queue.close()
+    return processed
+
+
+def merge_shards(queue: ShardQueue) -> list[dict[str, Any]]:
+    """Объединяет книги обработанных шардов без повторов.
+
+    Книги различаются по UPC из таблицы характеристик, а при его
+    отсутствии - по названию и цене. Порядок книг соответствует
+    порядку категорий в боковой панели.
+
+    Args:
+        queue (ShardQueue): Очередь шардов.
+
+    Returns:
+        list[dict[str, Any]]: Список словарей с данными о книгах.
+    """
+    books = {}
+    for result_path in queue.results():
+        for book in read_json_lines(result_path):
+            key = book.get("Info_table", {}).get("UPC") or (
+                book.get("Title"),
+                book.get("Price"),
+            )
+            books.setdefault(key, book)
+    return list(books.values())
+
+
+def save_merged_books(scraper: Scraper, books: list[dict[str, Any]]) -> None:
+    """Сохраняет объединенные книги в формате ``output_format``.
+
+    Args:
+        scraper (Scraper): Парсер с конфигурацией сохранения.
+        books (list[dict[str, Any]]): Список словарей с данными о книгах.
+    """
+    storage = scraper._get_storage()
+    if storage is not None:
+        with storage:
+            for book in books:
+                storage.write(book)
+    elif scraper.config.output_format == OUTPUT_FORMAT_COLUMNAR:
+        scraper._save_books_data_as_columnar(books)
+    else:
+        scraper._save_books_data_as_file(books)
+
+
+def crawl_sharded(
+    session_config: SessionConfig,
+    scraper_config: ScraperConfig,
+    is_save: bool = False,
+    resume: bool = False,
+) -> list[dict[str, Any]]:
+    """Обходит каталог по категориям в нескольких процессах.
+
+    Категории из боковой панели записываются в очередь
+    ``shard_queue_path``, после чего запускается ``shard_workers``
+    процессов ``run_shard_worker``. Пока идет обход, к очереди можно
+    подключить дополнительные обработчики командой
+    ``python3 src/shards.py worker``. После завершения всех шардов книги
+    объединяются без повторов.
+
+    Args:
+        session_config (SessionConfig): Конфигурация HTTP-сессии.
+        scraper_config (ScraperConfig): Конфигурация парсера.
+        is_save (bool, optional): Сохранять ли данные в файл.
+            Значение по умолчанию - False.
+        resume (bool, optional): Продолжить ли обработку существующей
+            очереди без повторного получения категорий. Значение
+            по умолчанию - False.
+
+    Raises:
+        ValueError: Если в конфигурации сессии включена запись архива,
+            файлы которого нельзя дописывать из нескольких процессов,
+            или если сохраняются результаты обхода по карточкам каталога.
+
+    Returns:
+        list[dict[str, Any]]: Список словарей с данными о книгах.
+    """
+    if session_config.archive_mode == ARCHIVE_MODE_RECORD:
+        raise ValueError("Запись архива не поддерживается при шардировании")
+    if is_save and scraper_config.scrape_mode == SCRAPE_MODE_LISTING:
+        raise ValueError(
+            "Сохранение результатов обхода по карточкам каталога "
+            "не поддерживается при шардировании"
+        )
+
+    scraper = Scraper(HttpClientManager(session_config), scraper_config)
+    queue = ShardQueue(
+        scraper_config.shard_queue_path,
+        scraper_config.shard_lease_timeout,
+        scraper_config.shard_max_attempts,
+    )
+    try:
+        if not resume or not queue.stats():
+            categories = get_categories(scraper)
+            queue.reset(categories)
+            logger.info(f"Категорий в очереди: #{len(categories)}.")
+
+        context = get_context("spawn")
+        workers = [
+            context.Process(
+                target=run_shard_worker, args=(session_config, scraper_config)
+            )
+            for _ in range(max(1, scraper_config.shard_workers))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        stats = queue.stats()
+        logger.info(
+            "Шарды: "
+            + ", ".join(
+                f"{status} #{count}" for status, count in stats.items()
+            )
+            + "."
+        )
+        books = merge_shards(queue)
+    finally:
+        queue.close()
+
+    if is_save:
+        save_merged_books(scraper, books)
+    logger.info(f"Обработано страниц с книгами: #{len(books)}.")
+    return books
+
+
+if __name__ == "__main__":
+    from config import scraper_conf, session_conf
+
+    arg_parser = argparse.ArgumentParser(
+        description="Параллельный обход каталога по категориям"
+    )
+    arg_parser.add_argument(
+        "command",
+        choices=("crawl", "worker", "merge"),
+        help=(
+            "crawl - заполнить очередь и обойти каталог, worker - подключить "
+            "обработчик к существующей очереди, merge - объединить "
+            "результаты обработанных шардов"
+        ),
+    )
+    arg_parser.add_argument("--workers", type=int)
+    arg_parser.add_argument("--queue", type=Path)
+    arg_parser.add_argument("--resume", action="store_true")
+    arg_parser.add_argument("--no-save", action="store_true")
+    args = arg_parser.parse_args()
+
+    config = replace(
+        scraper_conf,
+        shard_workers=args.workers or scraper_conf.shard_workers,
+        shard_queue_path=args.queue or scraper_conf.shard_queue_path,
+    )
+    if args.command == "crawl":
+        crawl_sharded(
+            session_conf, config, is_save=not args.no_save, resume=args.resume
+        )
+    elif args.command == "worker":
+        run_shard_worker(session_conf, config)
+    else:
+        merge_queue = ShardQueue(
+            config.shard_queue_path,
+            config.shard_lease_timeout,
+            config.shard_max_attempts,
+        )
+        merged_books = merge_shards(merge_queue)
+        merge_queue.close()
+        if not args.no_save:
+            save_merged_books(
+                Scraper(HttpClientManager(session_conf), config), merged_books
+            )
@@ -0,0 +1,425 @@
+import hashlib
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Self
+
+from models import Book, book_to_dict, merge_listing_book
+
+SQLITE_BOOK_COLUMNS: tuple[str, ...] = (
+    "title",
+    "price",
+    "currency",
+    "available",
+    "in_stock",
+    "rating",
+    "description",
+    "product_type",
+    "price_excl_tax",
+    "price_incl_tax",
+    "tax",
+    "number_of_reviews",
+)
+
+
+class BooksStorage(ABC):
+    """Хранилище, в которое книги записываются по мере парсинга.
+
+    Используется как контекстный менеджер: ``__enter__`` открывает
+    хранилище, ``write`` записывает очередную книгу, ``__exit__``
+    сохраняет оставшиеся данные и закрывает хранилище.
+    """
+
+    @abstractmethod
+    def __enter__(self) -> Self: ...
+
+    @abstractmethod
+    def __exit__(self, *exc_info) -> None: ...
+
+    @abstractmethod
+    def write(
+        self, book: dict[str, Any] | Book, url: str | None = None
+    ) -> None:
+        """Записывает книгу в хранилище.
+
+        Args:
+            book (dict[str, Any] | Book): Словарь или запись о книге.
+            url (str | None, optional): URL страницы книги. Значение
+                по умолчанию - None.
+        """
+
+
+class JsonLinesWriter(BooksStorage):
+    """Потоковая запись книг в файл формата JSON Lines.
+
+    Каждая книга записывается отдельной строкой и сразу сбрасывается
+    на диск, поэтому при аварийном завершении процесса уже обработанные
+    книги сохраняются.
+
+    Attributes:
+        path (Path): Путь к файлу JSON Lines.
+        is_append (bool): Дописывать ли книги в существующий файл.
+    """
+
+    def __init__(self, path: Path, is_append: bool = False) -> None:
+        self.path: Path = Path(path)
+        self.is_append: bool = is_append
+        self._file = None
+
+    def __enter__(self) -> Self:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(
+            self.path,
+            mode="a" if self.is_append else "w",
+            encoding="utf-8",
+        )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._file.close()
+        self._file = None
+
+    def write(
+        self, book: dict[str, Any] | Book, url: str | None = None
+    ) -> None:
+        """Дописывает книгу в файл и сбрасывает буфер записи.
+
+        Args:
+            book (dict[str, Any] | Book): Словарь или запись о книге.
+            url (str | None, optional): URL страницы книги, в файл
+                не записывается. Значение по умолчанию - None.
+        """
+        self._file.write(
+            json.dumps(book_to_dict(book), ensure_ascii=False) + "\n"
+        )
+        self._file.flush()
+
+
+def read_json_lines(path: Path) -> list[dict[str, Any]]:
+    """Читает книги из файла формата JSON Lines.
+
+    Args:
+        path (Path): Путь к файлу JSON Lines.
+
+    Returns:
+        list[dict[str, Any]]: Список словарей с данными о книгах.
+    """
+    with open(path, encoding="utf-8") as read:
+        return [json.loads(line) for line in read if line.strip()]
+
+
+class SqliteBooksStorage(BooksStorage):
+    """Хранилище последней версии каталога в базе SQLite.
+
+    Книги записываются пакетами по ``batch_size`` в одной транзакции
+    через upsert по UPC из ``Info_table`` (для книг без UPC - по
+    названию). Для каждой книги хранится хэш её данных, и существующая
+    строка обновляется, только если хэш изменился, поэтому ежедневный
+    запуск переписывает лишь изменившиеся книги. Цены, наличие и рейтинг
+    хранятся в отдельных индексированных столбцах, что позволяет
+    выбирать книги через ``query``, не загружая весь каталог.
+
+    При выходе из контекста записывается последний неполный пакет, даже
+    если запись прервана исключением. При ``prune_missing`` после
+    успешного завершения записи из базы удаляются книги, которые в этом
+    запуске не встретились; после прерванной записи ничего не удаляется.
+
+    Для каждой книги сохраняется URL её страницы. При ``merge_listings``
+    записываются данные карточек каталога: название, цена, рейтинг
+    и наличие обновляются в строке книги с тем же URL, а её описание
+    и таблица характеристик сохраняются. Книги, которых в базе нет,
+    добавляются с ключом по URL.
+
+    Attributes:
+        path (Path): Путь к файлу базы.
+        batch_size (int): Количество книг в одной транзакции.
+        prune_missing (bool): Удалять ли книги, отсутствующие в запуске.
+        merge_listings (bool): Обновлять ли существующие книги данными
+            карточек каталога.
+        written (int): Количество добавленных или измененных книг.
+        unchanged (int): Количество книг, данные которых не изменились.
+        removed (int): Количество удаленных книг.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = 500,
+        prune_missing: bool = False,
+        merge_listings: bool = False,
+    ) -> None:
+        self.path: Path = Path(path)
+        self.batch_size: int = batch_size
+        self.prune_missing: bool = prune_missing
+        self.merge_listings: bool = merge_listings
+        self.written: int = 0
+        self.unchanged: int = 0
+        self.removed: int = 0
+        self._batch: list[tuple[Any, ...]] = []
+        self._listings: list[tuple[str | None, dict[str, Any]]] = []
+        self._seen: set[str] = set()
+        self._updated_at: str = ""
+        self._connection: sqlite3.Connection | None = None
+
+    def __enter__(self) -> Self:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS books (
+                    upc TEXT PRIMARY KEY,
+                    url TEXT,
+                    title TEXT NOT NULL,
+                    price REAL,
+                    currency TEXT,
+                    available INTEGER,
+                    in_stock INTEGER,
+                    rating INTEGER,
+                    description TEXT,
+                    product_type TEXT,
+                    price_excl_tax REAL,
+                    price_incl_tax REAL,
+                    tax REAL,
+                    number_of_reviews INTEGER,
+                    data TEXT NOT NULL,
+                    data_hash TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            table_columns = {
+                row[1]
+                for row in self._connection.execute("PRAGMA table_info(books)")
+            }
+            if "in_stock" not in table_columns:
+                self._connection.execute(
+                    "ALTER TABLE books ADD COLUMN in_stock INTEGER"
+                )
+                self._connection.execute(
+                    "UPDATE books SET in_stock = available > 0 "
+                    "WHERE available IS NOT NULL"
+                )
+            if "url" not in table_columns:
+                self._connection.execute(
+                    "ALTER TABLE books ADD COLUMN url TEXT"
+                )
+            for column in ("price", "rating", "available", "in_stock", "url"):
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS books_{column} "
+                    f"ON books ({column})"
+                )
+        self.written = self.unchanged = self.removed = 0
+        self._batch = []
+        self._listings = []
+        self._seen = set()
+        self._updated_at = datetime.now().isoformat(timespec="seconds")
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        try:
+            self.flush()
+            if exc_type is None and self.prune_missing:
+                self._remove_missing()
+        finally:
+            self._connection.close()
+            self._connection = None
+
+    def write(
+        self, book: dict[str, Any] | Book, url: str | None = None
+    ) -> None:
+        """Добавляет книгу в текущий пакет и записывает заполненный пакет.
+
+        Args:
+            book (dict[str, Any] | Book): Словарь или запись о книге.
+            url (str | None, optional): URL страницы книги. Значение
+                по умолчанию - None.
+        """
+        if self.merge_listings:
+            self._listings.append((url, book_to_dict(book)))
+            if len(self._listings) >= self.batch_size:
+                self.flush()
+            return
+
+        self._add_row(book, url)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def _add_row(
+        self,
+        book: dict[str, Any] | Book,
+        url: str | None,
+        key: str | None = None,
+    ) -> None:
+        """Добавляет строку книги в текущий пакет.
+
+        Args:
+            book (dict[str, Any] | Book): Словарь или запись о книге.
+            url (str | None): URL страницы книги.
+            key (str | None, optional): Ключ строки. Значение
+                по умолчанию - None (UPC книги, для книг без UPC - URL
+                или название).
+        """
+        record = book if isinstance(book, Book) else Book.from_dict(book)
+        data = json.dumps(book_to_dict(book), ensure_ascii=False)
+        key = (
+            key
+            or record.upc
+            or (f"url:{url}" if url else f"title:{record.title}")
+        )
+        self._seen.add(key)
+        self._batch.append(
+            (
+                key,
+                url,
+                *(getattr(record, column) for column in SQLITE_BOOK_COLUMNS),
+                data,
+                hashlib.sha1(data.encode()).hexdigest(),
+                self._updated_at,
+            )
+        )
+
+    def _merge_listings(self) -> None:
+        """Объединяет накопленные карточки каталога с книгами из базы."""
+        listings, self._listings = self._listings, []
+        for url, listing_book in listings:
+            row = (
+                self._connection.execute(
+                    "SELECT upc, data FROM books WHERE url = ? "
+                    "ORDER BY upc LIKE 'url:%' LIMIT 1",
+                    (url,),
+                ).fetchone()
+                if url
+                else None
+            )
+            if row is None:
+                self._add_row(listing_book, url)
+            else:
+                key, data = row
+                self._add_row(
+                    merge_listing_book(json.loads(data), listing_book),
+                    url,
+                    key,
+                )
+
+    def flush(self) -> None:
+        """Записывает текущий пакет книг в одной транзакции."""
+        if self._listings:
+            self._merge_listings()
+        if not self._batch:
+            return
+
+        columns = ("upc", "url", *SQLITE_BOOK_COLUMNS, "data", "data_hash")
+        updates = ", ".join(
+            f"{column} = excluded.{column}"
+            for column in (*columns[2:], "updated_at")
+        )
+        with self._connection:
+            cursor = self._connection.executemany(
+                f"INSERT INTO books ({', '.join(columns)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(columns) + 1))}) "
+                "ON CONFLICT (upc) DO UPDATE SET "
+                f"url = coalesce(excluded.url, books.url), {updates} "
+                "WHERE books.data_hash != excluded.data_hash "
+                "OR books.url IS NULL AND excluded.url IS NOT NULL",
+                self._batch,
+            )
+        self.written += cursor.rowcount
+        self.unchanged += len(self._batch) - cursor.rowcount
+        self._batch = []
+
+    def _remove_missing(self) -> None:
+        """Удаляет книги, которые не встретились в текущем запуске."""
+        with self._connection:
+            self._connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS seen (upc TEXT PRIMARY KEY)"
+            )
+            self._connection.execute("DELETE FROM seen")
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO seen VALUES (?)",
+                ((key,) for key in self._seen),
+            )
+            cursor = self._connection.execute(
+                "DELETE FROM books WHERE upc NOT IN (SELECT upc FROM seen)"
+            )
+        self.removed = cursor.rowcount
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM books"
+        ).fetchone()
+        return count
+
+    def get(self, upc: str) -> dict[str, Any] | None:
+        """Возвращает книгу по UPC.
+
+        Args:
+            upc (str): UPC книги.
+
+        Returns:
+            dict[str, Any] | None: Словарь с данными о книге или None,
+                если книги нет в базе.
+        """
+        row = self._connection.execute(
+            "SELECT data FROM books WHERE upc = ?", (upc,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(
+        self,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_rating: int | None = None,
+        in_stock: bool | None = None,
+        order_by: str = "upc",
+        limit: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Перебирает книги, подходящие под условия, по индексам базы.
+
+        Args:
+            min_price (float | None, optional): Минимальная цена.
+            max_price (float | None, optional): Максимальная цена.
+            min_rating (int | None, optional): Минимальный рейтинг.
+            in_stock (bool | None, optional): Только книги в наличии (True)
+                или только отсутствующие (False).
+            order_by (str, optional): Столбец сортировки. Значение
+                по умолчанию - "upc".
+            limit (int | None, optional): Максимальное количество книг.
+
+        Raises:
+            ValueError: Если ``order_by`` не является столбцом книги.
+
+        Yields:
+            dict[str, Any]: Словарь с данными о книге.
+        """
+        if order_by not in ("upc", *SQLITE_BOOK_COLUMNS):
+            raise ValueError(f"Неизвестный столбец сортировки: {order_by}")
+
+        conditions, params = [], []
+        for condition, value in (
+            ("price >= ?", min_price),
+            ("price <= ?", max_price),
+            ("rating >= ?", min_rating),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        if in_stock is not None:
+            conditions.append("in_stock = ?")
+            params.append(in_stock)
+
+        sql = "SELECT data FROM books"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        for (data,) in self._connection.execute(sql, params):
+            yield json.loads(data)
@@ -1,8 +1,15 @@
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
 import pytest
 from bs4 import BeautifulSoup
 from requests import Session
 
 from src.adapters import HttpClientManager
+from src.async_scraper import AsyncScraper
 from src.config import ScraperConfig, SessionConfig
 from src.scraper import Scraper
 
@@ -12,6 +19,7 @@ EXAMPLE_BOOK_PAGE: str = (
 BAD_URL_MIXIN: str = "/something-bad"
 TOTAL_BOOKS_SCRAPED: int = 9
 TOTAL_BOOKS_PAGES: int = 3
+ETAG_PAGE_BODY: bytes = "<html><p>£51.77</p></html>".encode()
 
 
 @pytest.fixture
@@ -39,6 +47,16 @@ def scraper(
     )
 
 
+@pytest.fixture
+def async_scraper(
+    scraper_config: ScraperConfig, session_config: SessionConfig
+) -> AsyncScraper:
+    return AsyncScraper(
+        scraper_config=scraper_config,
+        session_config=session_config,
+    )
+
+
 @pytest.fixture
 def session(scraper: Scraper) -> Session:
     return scraper.http_manager.session
@@ -47,8 +65,8 @@ def session(scraper: Scraper) -> Session:
 @pytest.fixture
 def example_book_page_correct_request(
     scraper: Scraper, session: Session
-) -> str:
-    return scraper._get_response_as_text(session, EXAMPLE_BOOK_PAGE)
+) -> bytes:
+    return scraper._get_response_content(session, EXAMPLE_BOOK_PAGE)
 
 
 @pytest.fixture
@@ -173,6 +191,69 @@ def page3_html_without_next():
     """
 
 
+@pytest.fixture
+def catalog_page_with_listings_html() -> str:
+    listings = "".join(
+        f"""
+          <li class="col-xs-6 col-sm-4 col-md-3 col-lg-3">
+            <article class="product_pod">
+              <div class="image_container">
+                <a href="book-{i}_{i}/index.html"><img alt="Book {i}"></a>
+              </div>
+              <p class="star-rating {rating}"><i class="icon-star"></i></p>
+              <h3><a href="book-{i}_{i}/index.html" title="Book {i}">Bo...</a></h3>
+              <div class="product_price">
+                <p class="price_color">£{price}</p>
+                <p class="instock availability">
+                  <i class="icon-ok"></i> In stock
+                </p>
+              </div>
+            </article>
+          </li>"""
+        for i, rating, price in (
+            (1, "Three", "51.77"),
+            (2, "One", "53.74"),
+            (3, "Four", "50.10"),
+        )
+    )
+    return f"""
+    <html>
+      <section>
+        <ol class="row">{listings}
+        </ol>
+        <ul class="pager"><li class="current">Page 1 of 1</li></ul>
+      </section>
+    </html>
+    """
+
+
+@pytest.fixture
+def product_page_html(
+    book_main_data_html, book_description_html, info_table_html
+) -> str:
+    return f"""
+    <!DOCTYPE html>
+    <html lang="en-us">
+      <head><meta charset="utf-8"><title>A Light in the Attic</title></head>
+      <body>
+        <header><div class="page_inner">Books to Scrape</div></header>
+        <ul class="breadcrumb"><li><a href="../index.html">Home</a></li></ul>
+        <article class="product_page">
+          <div class="row">
+            <div class="col-sm-6"><div id="product_gallery"></div></div>
+            {book_main_data_html}
+            </div>
+          </div>
+          {book_description_html}
+          <div class="sub-header"><h2>Product Information</h2></div>
+          {info_table_html}
+        </article>
+        <footer><p>Footer</p></footer>
+      </body>
+    </html>
+    """
+
+
 @pytest.fixture
 def books_titles() -> list[dict[str, str]]:
     return [{"Title": f"Book {i}"} for i in range(1, TOTAL_BOOKS_SCRAPED + 1)]
@@ -215,3 +296,80 @@ def example_book_full_html(
       </body>
     </html>
     """
+
+
+class ETagRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик, отдающий страницу с ETag и поддерживающий ответ 304."""
+
+    etag: str = '"v1"'
+    requests_headers: list[dict[str, str]] = []
+
+    def do_GET(self) -> None:
+        self.requests_headers.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(ETAG_PAGE_BODY)))
+        self.end_headers()
+        self.wfile.write(ETAG_PAGE_BODY)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def etag_server_url() -> Iterator[str]:
+    ETagRequestHandler.requests_headers = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/page.html"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    return tmp_path / "http_cache.sqlite3"
+
+
+class ThrottlingRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик, отвечающий 429 с Retry-After на первый запрос."""
+
+    retry_after: int = 1
+    requests_times: list[float] = []
+
+    def do_GET(self) -> None:
+        self.requests_times.append(time.monotonic())
+        if len(self.requests_times) == 1:
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(ETAG_PAGE_BODY)))
+        self.end_headers()
+        self.wfile.write(ETAG_PAGE_BODY)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def throttling_server_url() -> Iterator[str]:
+    ThrottlingRequestHandler.requests_times = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/page.html"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import pytest
+
+from src.adapters import HttpClientManager
+from src.cache import CacheEntry, HttpCache
+from src.config import ScraperConfig, SessionConfig
+from src.fake_site import FakeSiteServer, generate_site
+from src.metrics import HTTP_CONNECTIONS
+from src.scraper import Scraper
+from tests.conftest import ETAG_PAGE_BODY, ETagRequestHandler
+
+
+class TestHttpCache:
+    """Набор тестов для дискового кэша условных HTTP-запросов."""
+
+    def test_conditional_request_served_from_cache(
+        self, etag_server_url: str, cache_path: Path
+    ):
+        """Тестирует повторный запрос страницы, не изменившейся на сервере.
+
+        Проверяет, что второй запрос отправляется с ``If-None-Match``,
+        сервер отвечает 304, а клиент получает сохраненное тело со
+        статусом 200 и счетчики попаданий/промахов учитываются.
+        """
+        manager = HttpClientManager(SessionConfig(cache_path=cache_path))
+
+        first = manager.session.get(etag_server_url)
+        second = manager.session.get(etag_server_url)
+
+        assert first.status_code == second.status_code == 200
+        assert second.content == ETAG_PAGE_BODY
+        assert second.text == ETAG_PAGE_BODY.decode()
+        assert "If-None-Match" not in ETagRequestHandler.requests_headers[0]
+        assert ETagRequestHandler.requests_headers[1]["If-None-Match"] == (
+            ETagRequestHandler.etag
+        )
+        assert manager.cache.pop_stats() == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    def test_cached_gzip_page_restored_without_encoding_headers(
+        self, cache_path: Path
+    ):
+        """Тестирует восстановление из кэша страницы, сжатой gzip.
+
+        Тело хранится распакованным, поэтому ответ, восстановленный
+        по 304, не должен содержать Content-Encoding и Content-Length
+        сжатого ответа.
+        """
+        manager = HttpClientManager(SessionConfig(cache_path=cache_path))
+
+        with FakeSiteServer(generate_site(1)) as server:
+            page_url = server.base_url + "page-1.html"
+            first = manager.session.get(page_url)
+            second = manager.session.get(page_url)
+            compressed_count = server.compressed_count
+
+        assert compressed_count == 1
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert second.content == first.content
+        assert "Content-Encoding" not in second.headers
+        assert "Content-Length" not in second.headers
+        assert "Content-Encoding" not in manager.cache.get(page_url).headers
+
+    def test_cache_evicts_least_recently_used(self, cache_path: Path):
+        """Тестирует вытеснение давно не использованных записей.
+
+        Проверяет, что при превышении ``max_size`` удаляется запись,
+        к которой дольше всего не обращались.
+        """
+        cache = HttpCache(cache_path, max_size=10)
+        cache.set(CacheEntry(url="first", content=b"12345", etag="a"))
+        cache.set(CacheEntry(url="second", content=b"12345", etag="b"))
+        cache.touch("first")
+        cache.set(CacheEntry(url="third", content=b"12345", etag="c"))
+
+        assert cache.get("first") is not None
+        assert cache.get("second") is None
+        assert cache.get("third").content == b"12345"
+
+
+class TestConnectionPool:
+    """Набор тестов для общего пула соединений HTTP-клиента."""
+
+    @pytest.mark.parametrize(
+        "keep_connections_alive, reconnects", [(True, False), (False, True)]
+    )
+    def test_connections_reused_across_runs(
+        self, keep_connections_alive: bool, reconnects: bool, tmp_path: Path
+    ):
+        """Тестирует размер пула и повторное использование соединений.
+
+        Проверяет, что пул расширяется до числа потоков парсера,
+        соединений открывается не больше этого числа, а при
+        ``keep_connections_alive`` второй запуск переиспользует соединения
+        первого и открывает новые только до заполнения пула.
+        """
+        manager = HttpClientManager(
+            SessionConfig(keep_connections_alive=keep_connections_alive)
+        )
+        runs = []
+
+        with FakeSiteServer(generate_site(2)) as server:
+            scraper = Scraper(
+                manager,
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    max_workers=12,
+                    metrics_enabled=True,
+                    metrics_dir_path=tmp_path,
+                ),
+            )
+            for _ in range(2):
+                scraper.scrape_books()
+                runs.append(
+                    {
+                        reused: scraper.metrics.get_counter(
+                            HTTP_CONNECTIONS, reused=reused
+                        )
+                        for reused in ("true", "false")
+                    }
+                )
+        manager.close()
+
+        assert manager.pool_maxsize == 12
+        assert all(run["true"] + run["false"] == 42 for run in runs)
+        assert 1 <= runs[0]["false"] <= 12
+        if reconnects:
+            assert runs[1]["false"] >= 1
+        else:
+            assert runs[0]["false"] + runs[1]["false"] <= 12
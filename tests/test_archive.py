@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from src.adapters import HttpClientManager
+from src.archive import ArchiveRecord, HtmlArchive
+from src.config import ScraperConfig, SessionConfig
+from src.constants import ARCHIVE_MODE_RECORD, ARCHIVE_MODE_REPLAY
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.scraper import Scraper
+
+
+class TestHtmlArchive:
+    """Набор тестов для архива исходных ответов и режима воспроизведения."""
+
+    def test_archive_keeps_last_record(self, tmp_path: Path):
+        """Тестирует дозапись ответов и чтение архива новым экземпляром.
+
+        Проверяет, что тело ответа восстанавливается без изменений,
+        а при повторной записи URL действует последняя запись.
+        """
+        archive = HtmlArchive(tmp_path)
+        archive.add(ArchiveRecord("first", 200, b"old", {"ETag": '"a"'}))
+        archive.add(ArchiveRecord("second", 404, b""))
+        archive.add(
+            ArchiveRecord("first", 200, b"new", {"Content-Encoding": "gzip"})
+        )
+        archive.close()
+
+        reopened = HtmlArchive(tmp_path)
+        record = reopened.get("first")
+
+        assert len(reopened) == 2
+        assert record.content == b"new"
+        assert record.headers == {}
+        assert reopened.get("second").status == 404
+        assert reopened.get("missing") is None
+
+    def test_replay_scrape_without_network(self, tmp_path: Path):
+        """Тестирует повторный разбор записанного обхода без сервера.
+
+        Проверяет, что воспроизведение из архива после остановки сервера
+        возвращает те же данные о книгах, что и исходный обход, а запрос
+        отсутствующего в архиве URL завершается ошибкой соединения.
+        """
+        site = generate_site(2)
+
+        with FakeSiteServer(site) as server:
+            scraper_config = ScraperConfig(
+                base_url=server.base_url,
+                start_catalog_page=server.base_url + "page-1.html",
+            )
+            recorded_books = Scraper(
+                HttpClientManager(
+                    SessionConfig(
+                        archive_path=tmp_path,
+                        archive_mode=ARCHIVE_MODE_RECORD,
+                    )
+                ),
+                scraper_config,
+            ).scrape_books()
+
+        replay_manager = HttpClientManager(
+            SessionConfig(
+                archive_path=tmp_path, archive_mode=ARCHIVE_MODE_REPLAY
+            )
+        )
+        replayed_books = Scraper(replay_manager, scraper_config).scrape_books()
+
+        assert len(recorded_books) == 2 * BOOKS_PER_PAGE
+        assert replayed_books == recorded_books
+        with pytest.raises(ConnectionError):
+            replay_manager.session.get(server.base_url + "page-3.html")
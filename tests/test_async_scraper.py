@@ -0,0 +1,120 @@
+import asyncio
+from dataclasses import replace
+from unittest.mock import patch
+from urllib.parse import urljoin
+
+import pytest
+
+from src.adapters import HttpClientManager
+from src.async_scraper import AsyncScraper
+from src.config import ScraperConfig, SessionConfig
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.scraper import Scraper
+from tests.conftest import TOTAL_BOOKS_SCRAPED
+
+
+class TestAsyncScraper:
+    """Набор тестов для проверки асинхронного парсера AsyncScraper."""
+
+    def test_scrape_books_keeps_catalog_order(
+        self,
+        async_scraper: AsyncScraper,
+        page1_html_with_next2: str,
+        page2_html_with_next3: str,
+        page3_html_without_next: str,
+        example_book_full_html: str,
+    ):
+        """Тестирует полный цикл асинхронного парсинга каталога.
+
+        Проверяет, что все страницы каталога обходятся, каждая книга
+        разбирается общими методами извлечения, а порядок результатов
+        совпадает с порядком ссылок в каталоге.
+        """
+        pages = {
+            async_scraper.config.start_catalog_page: page1_html_with_next2,
+            urljoin(async_scraper.config.base_url, "/page2.html"): (
+                page2_html_with_next3
+            ),
+            urljoin(async_scraper.config.base_url, "/page3.html"): (
+                page3_html_without_next
+            ),
+        }
+        requested_books = []
+
+        async def fake_fetch(session, url, host_semaphores):
+            if url in pages:
+                return pages[url]
+            requested_books.append(url)
+            await asyncio.sleep(0.01 * (TOTAL_BOOKS_SCRAPED - len(url) % 5))
+            return example_book_full_html.replace(
+                "A Light in the Attic</h1>", f"{url}</h1>"
+            )
+
+        with patch.object(async_scraper, "_fetch", side_effect=fake_fetch):
+            books = asyncio.run(async_scraper.scrape_books())
+
+        assert len(books) == TOTAL_BOOKS_SCRAPED
+        assert len(requested_books) == TOTAL_BOOKS_SCRAPED
+        assert [book["Title"] for book in books] == [
+            urljoin(async_scraper.config.base_url, f"/book{i}.html")
+            for i in range(1, TOTAL_BOOKS_SCRAPED + 1)
+        ]
+        assert all(book["Rating"] == "3" for book in books)
+        assert all(book["Price"] == "£51.77" for book in books)
+        assert all(
+            book["Info_table"]["UPC"] == "a897fe39b1053632" for book in books
+        )
+
+    def test_scrape_fake_site_within_connection_limit(self):
+        """Тестирует асинхронный парсинг локального сайта.
+
+        Проверяет, что книги совпадают с результатами синхронного
+        парсера, а число одновременных запросов к серверу не превышает
+        ``max_connections_per_host``, но больше одного. Повторный обход
+        тем же экземпляром в новом цикле событий дает те же книги.
+        """
+        session_config = SessionConfig()
+        with FakeSiteServer(generate_site(2), latency=0.02) as server:
+            config = ScraperConfig(
+                base_url=server.base_url,
+                start_catalog_page=server.base_url + "page-1.html",
+                max_connections_per_host=4,
+            )
+            async_scraper = AsyncScraper(config, session_config)
+            books = asyncio.run(async_scraper.scrape_books())
+            max_active_count = server.max_active_count
+            repeated_books = asyncio.run(async_scraper.scrape_books())
+            expected_books = Scraper(
+                HttpClientManager(session_config),
+                replace(config, max_workers=1),
+            ).scrape_books()
+
+        assert len(books) == 2 * BOOKS_PER_PAGE
+        assert books == repeated_books == expected_books
+        assert 1 < max_active_count <= config.max_connections_per_host
+
+    def test_host_semaphore_is_shared_per_host(
+        self, async_scraper: AsyncScraper
+    ):
+        """Тестирует, что запросы к одному хосту используют один семафор."""
+        host_semaphores = {}
+        first = async_scraper._get_host_semaphore(
+            host_semaphores, "https://books.toscrape.com/catalogue/page-1.html"
+        )
+        second = async_scraper._get_host_semaphore(
+            host_semaphores,
+            "https://books.toscrape.com/catalogue/book_1/index.html",
+        )
+        other = async_scraper._get_host_semaphore(
+            host_semaphores, "https://example.com/"
+        )
+
+        assert first is second
+        assert first is not other
+
+    def test_sync_iter_books_is_not_supported(
+        self, async_scraper: AsyncScraper
+    ):
+        """Тестирует понятную ошибку синхронного обхода."""
+        with pytest.raises(TypeError, match="aiter_books"):
+            async_scraper.iter_books()
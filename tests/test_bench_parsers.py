@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from src.bench_parsers import compare_parsers
+from src.config import ScraperConfig
+from src.constants import HTML_PARSERS, LXML_PARSER
+from src.scraper import Scraper
+
+
+class TestParsers:
+    """Набор тестов для выбора HTML-парсера и частичного парсинга."""
+
+    @pytest.mark.parametrize("parser", HTML_PARSERS)
+    @pytest.mark.parametrize("partial_parsing", [False, True])
+    def test_book_page_parsed_equally(
+        self,
+        scraper: Scraper,
+        product_page_html: str,
+        parser: str,
+        partial_parsing: bool,
+    ):
+        """Тестирует извлечение данных книги разными парсерами.
+
+        Проверяет, что при любом парсере и частичном парсинге страницы
+        книги извлекаются те же данные, что и при полном разборе
+        ``html.parser``.
+        """
+        reference = scraper._parse_book_page(product_page_html)
+        scraper.config.parser = parser
+        scraper.config.partial_parsing = partial_parsing
+
+        assert scraper._parse_book_page(product_page_html) == reference
+        assert reference["Info_table"]["UPC"] == "a897fe39b1053632"
+
+    def test_compare_parsers_report(
+        self,
+        product_page_html: str,
+        catalog_page_with_listings_html: str,
+        tmp_path: Path,
+    ):
+        """Тестирует отчет сравнения парсеров на сохраненных страницах."""
+        (tmp_path / "book.html").write_text(product_page_html)
+        (tmp_path / "page-1.html").write_text(catalog_page_with_listings_html)
+
+        report = compare_parsers(tmp_path, ScraperConfig(), repeat=1)
+
+        assert len(report) == len(HTML_PARSERS) * 2
+        assert {row["parser"] for row in report} >= {LXML_PARSER}
+        assert all(row["pages"] == 2 for row in report)
+        assert all(row["matches_reference"] for row in report)
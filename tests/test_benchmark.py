@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+
+from src.adapters import HttpClientManager
+from src.benchmark import (
+    STAGES,
+    _run_scrape,
+    get_stages_totals,
+    measure_startup,
+    run_benchmark,
+)
+from src.config import ScraperConfig, SessionConfig
+from src.constants import (
+    CATALOG_DISCOVERY_FANOUT,
+    IMAGES_INDEX_FILENAME,
+    OUTPUT_FORMAT_SQLITE,
+    SCRAPE_MODE_HYBRID,
+)
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.metrics import STAGE_SECONDS
+from src.scraper import Scraper
+
+FAKE_SITE_PAGES: int = 2
+
+
+class TestFakeSite:
+    """Набор тестов для парсинга локальной копии сайта и замеров."""
+
+    @pytest.mark.parametrize(
+        "config_overrides",
+        [
+            {},
+            {"max_workers": 4, "catalog_discovery": CATALOG_DISCOVERY_FANOUT},
+            {"max_workers": 4, "parse_workers": 2},
+        ],
+    )
+    def test_scrape_books_from_fake_site(self, config_overrides: dict):
+        """Тестирует полный парсинг сгенерированного сайта без моков.
+
+        Проверяет, что все страницы каталога обходятся, данные каждой
+        книги извлекаются с реальной разметки, а порядок книг совпадает
+        с порядком в каталоге.
+        """
+        site = generate_site(FAKE_SITE_PAGES)
+
+        with FakeSiteServer(site) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    **config_overrides,
+                ),
+            )
+            books = scraper.scrape_books()
+
+        assert len(books) == FAKE_SITE_PAGES * BOOKS_PER_PAGE
+        assert server.requests_count == len(books) + FAKE_SITE_PAGES
+        assert books[0]["Title"] in site["/catalogue/page-1.html"].decode()
+        assert books[-1]["Title"] in site["/catalogue/page-2.html"].decode()
+        assert all(book["Price"].startswith("£") for book in books)
+        assert all(book["Info_table"]["Tax"] == "£0.00" for book in books)
+        assert all(book["Rating"] in "12345" for book in books)
+
+    def test_run_benchmark_report(self):
+        """Тестирует отчет замера производительности парсера."""
+        result = run_benchmark(pages_count=1)
+
+        assert result["books"] == BOOKS_PER_PAGE
+        assert result["requests"] == BOOKS_PER_PAGE + 1
+        assert result["pages_per_second"] > 0
+        assert set(result["stages"]) == set(STAGES)
+
+    def test_extraction_stage_counts_nested_timers_once(self, tmp_path: Path):
+        """Тестирует сумму стадии extraction в отчете замера.
+
+        В гибридном режиме цена и рейтинг извлекаются и из карточек
+        каталога внутри extract_catalog_books, и со страниц книг. Стадия
+        складывается только из внешних таймеров: разбор каждой страницы
+        каталога и каждой книги учитывается один раз.
+        """
+        with FakeSiteServer(generate_site(FAKE_SITE_PAGES)) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    scrape_mode=SCRAPE_MODE_HYBRID,
+                    books_index_path=tmp_path / "books_index.json",
+                    metrics_enabled=True,
+                ),
+            )
+            books = scraper.scrape_books()
+        stages_seconds, stages_calls = get_stages_totals(scraper.metrics)
+        nested_seconds = sum(
+            scraper.metrics.get_histogram(STAGE_SECONDS, stage=stage).total
+            for stage in (
+                "extract_listing",
+                "extract_title",
+                "extract_price",
+                "extract_rating",
+                "extract_info_table",
+            )
+        )
+
+        assert stages_calls["extraction"] == len(books) + 2 * FAKE_SITE_PAGES
+        assert 0 < nested_seconds < stages_seconds["extraction"]
+
+    def test_run_scrape_writes_outputs_to_save_dir(self, tmp_path: Path):
+        """Тестирует, что замер не пишет в рабочие файлы парсера.
+
+        База SQLite, обложки и профили сохраняются в директорию замера.
+        """
+        with FakeSiteServer(generate_site(1, with_covers=True)) as server:
+            result = _run_scrape(
+                server.base_url,
+                {
+                    "output_format": OUTPUT_FORMAT_SQLITE,
+                    "download_images": True,
+                    "profiling": True,
+                },
+                str(tmp_path),
+            )
+
+        assert result["books"] == BOOKS_PER_PAGE
+        assert (tmp_path / "books.sqlite3").exists()
+        assert (tmp_path / "images" / IMAGES_INDEX_FILENAME).exists()
+        assert any((tmp_path / "profiles").iterdir())
+
+    def test_measure_startup(self):
+        """Тестирует замер времени запуска команд командной строки."""
+        startup_ms = measure_startup((("--help",), ("status",)), repeat=1)
+
+        assert list(startup_ms) == ["python", "--help", "status"]
+        assert all(milliseconds > 0 for milliseconds in startup_ms.values())
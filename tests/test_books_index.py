@@ -0,0 +1,40 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.books_index import BooksIndex
+
+BOOKS_COUNT: int = 2000
+
+
+class TestBooksIndex:
+    """Набор тестов для индекса книг инкрементального парсинга."""
+
+    def test_concurrent_add_counts_every_book(self, tmp_path: Path):
+        """Тестирует добавление книг из нескольких потоков.
+
+        Книги добавляются так же, как в парсере с max_workers > 1.
+        Проверяет, что ни одно увеличение счетчиков не теряется
+        и в сохраненный индекс попадают все книги.
+        """
+        index = BooksIndex(tmp_path / "books_index.json")
+        index.load()
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for number in range(BOOKS_COUNT):
+                    executor.submit(
+                        index.add,
+                        f"book-{number}",
+                        str(number),
+                        {"Title": f"Book {number}"},
+                        is_reused=number % 2 == 0,
+                    )
+        finally:
+            sys.setswitchinterval(switch_interval)
+        index.save()
+
+        assert index.reused == index.fetched == BOOKS_COUNT // 2
+        assert len(json.loads(index.path.read_text("utf-8"))) == BOOKS_COUNT
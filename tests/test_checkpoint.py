@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+from src.adapters import HttpClientManager
+from src.checkpoint import CrawlCheckpoint
+from src.config import ScraperConfig, SessionConfig
+from src.constants import SCRAPE_MODE_LISTING
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.scraper import Scraper
+
+FAKE_SITE_PAGES: int = 2
+
+
+class TestCrawlCheckpoint:
+    """Набор тестов для контрольной точки обхода каталога."""
+
+    def test_resume_skips_torn_last_line(self, tmp_path: Path):
+        """Тестирует загрузку контрольной точки после аварийной остановки.
+
+        Оборванная последняя строка пропускается, а книги из остальных
+        строк возвращаются при продолжении.
+        """
+        path = tmp_path / "checkpoint.jsonl"
+        checkpoint = CrawlCheckpoint(path, interval=1)
+        checkpoint.open()
+        checkpoint.add("book-1", {"Title": "Book 1"})
+        checkpoint.add("book-2", {"Title": "Book 2"})
+        checkpoint.close()
+        with open(path, mode="a", encoding="utf-8") as write:
+            write.write(json.dumps({"url": "book-3"})[:-3])
+
+        checkpoint.open(resume=True)
+        restored_book = checkpoint.get("book-2")
+        checkpoint.remove()
+
+        assert len(checkpoint) == 2
+        assert restored_book == {"Title": "Book 2"}
+        assert checkpoint.get("book-3") is None
+        assert checkpoint.restored == 1
+        assert not path.exists()
+
+    def test_resume_fetches_only_missing_books(self, tmp_path: Path):
+        """Тестирует продолжение прерванного обхода с контрольной точки.
+
+        Проверяет, что после остановки обхода на середине повторный запуск
+        с ``resume=True`` запрашивает только страницы каталога и книги,
+        не попавшие в контрольную точку, возвращает полный каталог
+        и удаляет контрольную точку.
+        """
+        site = generate_site(FAKE_SITE_PAGES)
+        processed_count = 5
+
+        with FakeSiteServer(site) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    checkpoint_path=tmp_path / "checkpoint.jsonl",
+                    checkpoint_interval=10,
+                ),
+            )
+            books = scraper.iter_books()
+            interrupted_books = [next(books) for _ in range(processed_count)]
+            books.close()
+            requests_before_resume = server.requests_count
+
+            resumed_books = scraper.scrape_books(resume=True)
+            resume_requests = server.requests_count - requests_before_resume
+
+        assert resumed_books[:processed_count] == interrupted_books
+        assert len(resumed_books) == FAKE_SITE_PAGES * BOOKS_PER_PAGE
+        # Книги первой страницы каталога обрабатываются целиком до выдачи
+        # первой из них, поэтому в контрольную точку попадает вся страница.
+        assert resume_requests == FAKE_SITE_PAGES + (
+            len(resumed_books) - BOOKS_PER_PAGE
+        )
+        assert not (tmp_path / "checkpoint.jsonl").exists()
+
+    def test_listing_run_keeps_crawl_checkpoint(self, tmp_path: Path):
+        """Тестирует, что обход по карточкам не трогает контрольную точку.
+
+        Контрольная точка прерванного полного обхода должна сохраниться
+        после запуска в режиме "listing" с тем же ``checkpoint_path``.
+        """
+        checkpoint_path = tmp_path / "checkpoint.jsonl"
+        checkpoint = CrawlCheckpoint(checkpoint_path, interval=1)
+        checkpoint.open()
+        checkpoint.add("book-1", {"Title": "Book 1"})
+        checkpoint.close()
+        saved_checkpoint = checkpoint_path.read_bytes()
+
+        with FakeSiteServer(generate_site(1)) as server:
+            books = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    scrape_mode=SCRAPE_MODE_LISTING,
+                    checkpoint_path=checkpoint_path,
+                ),
+            ).scrape_books()
+
+        assert len(books) == BOOKS_PER_PAGE
+        assert checkpoint_path.read_bytes() == saved_checkpoint
@@ -0,0 +1,140 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+from src.cli import get_scheduler, get_status, main
+from src.config import ScraperConfig
+from src.constants import (
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_SQLITE,
+    SCRAPE_MODE_FULL,
+    SCRAPE_MODE_LISTING,
+)
+from src.storage import SqliteBooksStorage
+from tests.test_storage import make_book
+
+SRC_PATH = Path(__file__).parent.parent / "src"
+
+
+class TestCli:
+    """Набор тестов для командной строки."""
+
+    def test_quick_commands_do_not_import_scraper(self, tmp_path: Path):
+        """Тестирует, что status и export не загружают модули парсера."""
+        books_path = tmp_path / "books.json"
+        books_path.write_text(json.dumps([make_book("a1", "10.00", "3", "5")]))
+        code = (
+            "import sys, cli; "
+            "cli.main(['status']); "
+            f"cli.main(['export', '--source', 'json', '--path', "
+            f"{str(books_path)!r}, '--to', 'csv']); "
+            "print(sorted(set(sys.modules) & "
+            "{'bs4', 'requests', 'numpy', 'adapters', 'scraper'}))"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": str(SRC_PATH)},
+        )
+
+        assert result.stdout.splitlines()[-1] == "[]"
+
+    def test_export_sqlite_to_csv(self, tmp_path: Path):
+        """Тестирует выгрузку книг из базы SQLite в CSV."""
+        with SqliteBooksStorage(tmp_path / "books.sqlite3") as storage:
+            for book in (
+                make_book("a1", "10.00", "3", "5"),
+                make_book("b2", "20.00", "5", "0"),
+            ):
+                storage.write(book)
+        output_path = tmp_path / "export" / "books.csv"
+
+        main(
+            [
+                "export",
+                "--source",
+                "sqlite",
+                "--path",
+                str(tmp_path / "books.sqlite3"),
+                "--to",
+                "csv",
+                "--output",
+                str(output_path),
+            ]
+        )
+
+        with open(output_path, encoding="utf-8", newline="") as read:
+            rows = list(csv.DictReader(read))
+        assert [(row["upc"], row["price"]) for row in rows] == [
+            ("a1", "10.0"),
+            ("b2", "20.0"),
+        ]
+
+    def test_status(self, tmp_path: Path):
+        """Тестирует сведения о сохраненных результатах."""
+        config = replace(
+            ScraperConfig(),
+            output_format="jsonl",
+            jsonl_file_path=tmp_path / "books.jsonl",
+            snapshots_dir_path=tmp_path / "snapshots",
+            checkpoint_path=tmp_path / "checkpoint.jsonl",
+            images_dir_path=tmp_path / "images",
+        )
+        config.jsonl_file_path.write_text(
+            "".join(
+                json.dumps(make_book(upc, "10.00", "3", "5")) + "\n"
+                for upc in ("a1", "b2", "c3")
+            )
+        )
+        config.checkpoint_path.write_text("")
+
+        status = get_status(config)
+
+        assert status["books"] == 3
+        assert status["updated_at"] is not None
+        assert status["latest_snapshot"] is None
+        assert status["interrupted_run"] is True
+        assert status["images"] is None
+
+    def test_daemon_schedules_crawl_and_listing_refresh(self):
+        """Тестирует задачи планировщика, создаваемые командой daemon.
+
+        Проверяет, что ежедневный обход и частое обновление по карточкам
+        каталога выполняются разными экземплярами парсера, а обновление
+        записывается в базу SQLite.
+        """
+        config = ScraperConfig(
+            output_format=OUTPUT_FORMAT_JSON,
+            listing_refresh_interval=600,
+            checkpoint_path=Path("checkpoint.jsonl"),
+            metrics_dir_path=Path("metrics"),
+        )
+
+        crawl, listing = get_scheduler(config).jobs
+        crawl_scraper = crawl.func.func.__self__
+        listing_scraper = listing.func.func.__self__
+
+        assert (crawl.name, listing.name) == ("crawl", "listing")
+        assert crawl_scraper is not listing_scraper
+        assert crawl_scraper.config.scrape_mode == SCRAPE_MODE_FULL
+        assert crawl_scraper.config.output_format == OUTPUT_FORMAT_JSON
+        assert listing_scraper.config.scrape_mode == SCRAPE_MODE_LISTING
+        assert listing_scraper.config.output_format == OUTPUT_FORMAT_SQLITE
+        assert listing.interval.total_seconds() == 600
+        assert listing_scraper.http_manager is not crawl_scraper.http_manager
+        assert listing_scraper.http_manager.cache is None
+        assert crawl_scraper.config.checkpoint_path == config.checkpoint_path
+        assert listing_scraper.config.checkpoint_path is None
+        assert listing_scraper.config.metrics_dir_path == Path(
+            "metrics", "listing"
+        )
+        assert [job.name for job in get_scheduler(ScraperConfig()).jobs] == [
+            "crawl"
+        ]
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.columnar import (
+    ColumnarSnapshot,
+    books_from_snapshot,
+    export_json_to_columnar,
+    iter_snapshots,
+    save_columnar,
+)
+from src.constants import FILE_PATH, SNAPSHOT_META_FILENAME
+from tests.test_storage import make_book
+
+
+class TestColumnarSnapshot:
+    """Набор тестов для столбцового экспорта и чтения снимков."""
+
+    def test_export_and_read_snapshot(self, tmp_path: Path):
+        """Тестирует экспорт сохраненного JSON-файла в столбцовый снимок.
+
+        Проверяет, что числовые столбцы открываются через отображение
+        в память, агрегации совпадают с расчетом по JSON, а книги
+        восстанавливаются из снимка без потерь.
+        """
+        with open(FILE_PATH, encoding="utf-8") as read:
+            books = json.load(read)
+
+        rows = export_json_to_columnar(FILE_PATH, tmp_path / "2025-10-01")
+        snapshot = ColumnarSnapshot(tmp_path / "2025-10-01")
+        prices = snapshot.column("price")
+
+        assert rows == len(snapshot) == len(books)
+        assert isinstance(prices, np.memmap)
+        assert prices.sum() == pytest.approx(
+            sum(float(book["Price"][1:]) for book in books)
+        )
+        assert snapshot.column("rating").max() == 5
+        assert snapshot.strings("title")[0] == books[0]["Title"]
+        assert books_from_snapshot(snapshot) == books
+        assert [len(item) for item in iter_snapshots(tmp_path)] == [rows]
+
+    def test_image_column_and_older_snapshots(self, tmp_path: Path):
+        """Тестирует столбец пути к обложке.
+
+        Проверяет, что путь к обложке и признак наличия сохраняются
+        в снимке, а снимок без этих столбцов, записанный предыдущей
+        версией, по-прежнему читается.
+        """
+        books = [
+            make_book("a1", "10.00", "3", "5") | {"Image": "images/a1.jpg"},
+            make_book("b2", "20.00", "5", "Нет данных") | {"In_stock": True},
+        ]
+        snapshot_path = tmp_path / "2025-10-01"
+        save_columnar(books, snapshot_path)
+
+        restored_books = books_from_snapshot(ColumnarSnapshot(snapshot_path))
+
+        meta_path = snapshot_path / SNAPSHOT_META_FILENAME
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["numeric_columns"].remove("in_stock")
+        meta["string_columns"].remove("image")
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        for file_name in (
+            "in_stock.npy",
+            "image.data.npy",
+            "image.offsets.npy",
+        ):
+            (snapshot_path / file_name).unlink()
+        old_books = books_from_snapshot(ColumnarSnapshot(snapshot_path))
+
+        assert restored_books == books
+        assert old_books == [
+            {
+                key: value
+                for key, value in book.items()
+                if key not in ("In_stock", "Image")
+            }
+            for book in books
+        ]
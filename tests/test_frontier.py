@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from src.adapters import HttpClientManager
+from src.config import ScraperConfig, SessionConfig
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.frontier import CrawlFrontier, canonicalize_url
+from src.scraper import Scraper
+
+BASE_URL: str = "https://books.toscrape.com/catalogue/category/books/travel_2/"
+
+
+class TestFrontier:
+    """Набор тестов для канонизации URL и множества URL обхода."""
+
+    @pytest.mark.parametrize(
+        "url, expected_url",
+        [
+            (
+                "../../../its-only-the-himalayas_981/index.html",
+                "https://books.toscrape.com/catalogue/"
+                "its-only-the-himalayas_981/index.html",
+            ),
+            (
+                "page-2.html#top",
+                BASE_URL + "page-2.html",
+            ),
+            (
+                "/catalogue/./page-1.html?sort=price",
+                "https://books.toscrape.com/catalogue/page-1.html?sort=price",
+            ),
+            (
+                "HTTPS://Books.ToScrape.com:443/catalogue/a/../index.html",
+                "https://books.toscrape.com/catalogue/index.html",
+            ),
+            (
+                "http://127.0.0.1:8000/catalogue/",
+                "http://127.0.0.1:8000/catalogue/",
+            ),
+        ],
+    )
+    def test_canonicalize_url(self, url: str, expected_url: str):
+        """Тестирует разрешение относительных URL и их нормализацию."""
+        assert canonicalize_url(url, BASE_URL) == expected_url
+
+    @pytest.mark.parametrize("buffer_size", [1, 1000])
+    def test_frontier_deduplicates_urls(
+        self, tmp_path: Path, buffer_size: int
+    ):
+        """Тестирует точность множества URL при переполнении фильтра Блума.
+
+        Фильтр рассчитан на 10 URL, поэтому большая часть проверок
+        уточняется по базе на диске, но повторы определяются точно.
+        """
+        urls = [f"https://example.com/book_{index}/" for index in range(500)]
+
+        with CrawlFrontier(
+            tmp_path,
+            expected_urls=10,
+            false_positive_rate=0.01,
+            buffer_size=buffer_size,
+        ) as frontier:
+            first_pass = [frontier.add(url) for url in urls]
+            second_pass = [frontier.add(url) for url in urls]
+
+        assert all(first_pass)
+        assert not any(second_pass)
+        assert frontier.added == len(urls)
+        assert frontier.duplicates == len(urls)
+        assert frontier.disk_lookups > 0
+
+    def test_book_from_several_entry_points_is_fetched_once(self):
+        """Тестирует пропуск книги, повторно встретившейся в каталоге.
+
+        Страница каталога ссылается на книгу первой страницы по другому,
+        но эквивалентному относительному пути; страница этой книги
+        запрашивается один раз.
+        """
+        site = generate_site(2)
+        first_page = site["/catalogue/page-1.html"].decode()
+        slug = first_page.split('<h3><a href="')[1].split("/index.html")[0]
+        site["/catalogue/page-2.html"] = (
+            site["/catalogue/page-2.html"]
+            .decode()
+            .replace(
+                '<ol class="row">',
+                '<ol class="row"><li><div class="image_container">'
+                f'<a href="../catalogue/{slug}/index.html#reviews"></a>'
+                "</div></li>",
+            )
+            .encode()
+        )
+
+        with FakeSiteServer(site) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                ),
+            )
+            books = scraper.scrape_books()
+
+        assert len(books) == 2 * BOOKS_PER_PAGE
+        assert server.requests_count == len(books) + 2
@@ -0,0 +1,114 @@
+import hashlib
+from pathlib import Path
+
+from src.adapters import HttpClientManager
+from src.config import ScraperConfig, SessionConfig
+from src.constants import EMPTY_DATA
+from src.fake_site import (
+    BOOKS_PER_PAGE,
+    COVER_VARIANTS,
+    FakeSiteServer,
+    generate_site,
+)
+from src.scraper import Scraper
+
+
+class TestImages:
+    """Набор тестов для загрузки обложек книг в хранилище."""
+
+    def test_covers_are_stored_once_and_skipped_on_next_run(
+        self, tmp_path: Path
+    ):
+        """Тестирует загрузку обложек в хранилище по содержимому.
+
+        Проверяет, что обложки с одинаковым содержимым хранятся в одном
+        файле, имя файла совпадает с хэшем содержимого, а при повторном
+        запуске сохраненные обложки не запрашиваются.
+        """
+        site = generate_site(1, with_covers=True)
+
+        with FakeSiteServer(site) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    max_workers=4,
+                    download_images=True,
+                    images_dir_path=tmp_path,
+                    image_workers=2,
+                    image_chunk_size=1024,
+                ),
+            )
+            books = scraper.scrape_books()
+            first_run_requests = server.requests_count
+            scraper.scrape_books()
+            second_run_requests = server.requests_count - first_run_requests
+
+        stored_files = [
+            path for path in tmp_path.glob("*/*") if path.is_file()
+        ]
+
+        assert len(books) == BOOKS_PER_PAGE
+        assert first_run_requests == 1 + 2 * BOOKS_PER_PAGE
+        assert second_run_requests == 1 + BOOKS_PER_PAGE
+        assert len(stored_files) == COVER_VARIANTS
+        assert len({book["Image"] for book in books}) == COVER_VARIANTS
+        for book in books:
+            content = (tmp_path / book["Image"]).read_bytes()
+            assert Path(book["Image"]).name == (
+                hashlib.sha256(content).hexdigest() + ".jpg"
+            )
+
+    def test_missing_cover_does_not_fail_book(self, tmp_path: Path):
+        """Тестирует парсинг книги, обложку которой загрузить не удалось."""
+        site = generate_site(1, with_covers=True)
+        missing_cover = next(
+            path for path in site if path.startswith("/media")
+        )
+        del site[missing_cover]
+
+        with FakeSiteServer(site) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig(max_retries=0)),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    download_images=True,
+                    images_dir_path=tmp_path,
+                ),
+            )
+            books = scraper.scrape_books()
+
+        assert len(books) == BOOKS_PER_PAGE
+        assert [book["Image"] for book in books].count(EMPTY_DATA) == 1
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_covers_download_without_blocking_page_fetches(
+        self, tmp_path: Path
+    ):
+        """Тестирует загрузку обложек параллельно с загрузкой страниц.
+
+        При одном потоке загрузки страниц обложки загружаются в пуле
+        ``image_workers`` потоков, не задерживая запрос следующей
+        страницы книги, поэтому сервер одновременно обрабатывает больше
+        одного запроса.
+        """
+        with FakeSiteServer(
+            generate_site(1, with_covers=True), latency=0.05
+        ) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    max_workers=1,
+                    download_images=True,
+                    images_dir_path=tmp_path,
+                    image_workers=4,
+                ),
+            )
+            books = scraper.scrape_books()
+
+        assert server.max_active_count > 1
+        assert all((tmp_path / book["Image"]).is_file() for book in books)
@@ -0,0 +1,124 @@
+import json
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from src.adapters import HttpClientManager
+from src.config import ScraperConfig, SessionConfig
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.metrics import (
+    BOOKS_SCRAPED,
+    HTTP_BYTES,
+    HTTP_RESPONSES,
+    STAGE_SECONDS,
+    Histogram,
+    MetricsRegistry,
+    timed,
+)
+from src.scraper import Scraper
+
+
+class TestMetrics:
+    """Набор тестов для реестра метрик парсера."""
+
+    def test_histogram_quantiles(self):
+        """Тестирует оценку квантилей по корзинам гистограммы.
+
+        Проверяет, что оценки p50/p99 отличаются от точных значений
+        не больше, чем в ширину экспоненциальной корзины.
+        """
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.observe(value / 1000)
+
+        assert histogram.count == 100
+        assert histogram.total == pytest.approx(5.05)
+        assert 0.025 < histogram.quantile(0.5) < 0.1
+        assert 0.05 < histogram.quantile(0.99) < 0.2
+
+    def test_disabled_registry_records_nothing(self):
+        """Тестирует, что выключенный реестр не накапливает метрики."""
+        registry = MetricsRegistry(enabled=False)
+        registry.inc(HTTP_RESPONSES, status="200")
+        registry.observe(STAGE_SECONDS, 0.1, stage="fetch")
+
+        assert registry.snapshot() == {"counters": [], "histograms": []}
+
+    def test_timed_waits_for_returned_future(self):
+        """Тестирует замер стадии, возвращающей Future.
+
+        Проверяет, что время записывается, когда Future завершается,
+        а не когда метод возвращает управление, и что запись появляется
+        до того, как вызывающий код получит результат или ошибку.
+        """
+
+        class Stage:
+            def __init__(self) -> None:
+                self.metrics = MetricsRegistry(enabled=True)
+                self.pending: Future = Future()
+
+            @timed("book")
+            def run(self) -> Future:
+                return self.pending
+
+        stage = Stage()
+        finished = stage.run()
+
+        assert stage.metrics.get_histogram(STAGE_SECONDS, stage="book") is None
+        time.sleep(0.05)
+        stage.pending.set_result({"Title": "Book"})
+        assert finished.result() == {"Title": "Book"}
+        histogram = stage.metrics.get_histogram(STAGE_SECONDS, stage="book")
+        assert histogram.count == 1
+        assert histogram.total >= 0.05
+
+        stage.pending = Future()
+        failed = stage.run()
+        stage.pending.set_exception(ValueError("no book"))
+        with pytest.raises(ValueError):
+            failed.result()
+        assert histogram.count == 2
+
+    @pytest.mark.parametrize("parse_workers", [0, 2])
+    def test_scrape_exports_metrics(self, tmp_path: Path, parse_workers: int):
+        """Тестирует сбор и выгрузку метрик по окончании парсинга.
+
+        Проверяет счетчики статусов и объема ответов, гистограммы стадий,
+        включая стадии разбора из пула процессов, и файлы метрик
+        в форматах Prometheus и JSON.
+        """
+        site = generate_site(1)
+
+        with FakeSiteServer(site) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    max_workers=4,
+                    parse_workers=parse_workers,
+                    metrics_enabled=True,
+                    metrics_dir_path=tmp_path,
+                ),
+            )
+            scraper.scrape_books()
+
+        metrics = scraper.metrics
+        prometheus_text = (tmp_path / "metrics.prom").read_text()
+        exported = json.loads((tmp_path / "metrics.json").read_text())
+
+        assert metrics.get_counter(BOOKS_SCRAPED) == BOOKS_PER_PAGE
+        assert metrics.get_counter(HTTP_RESPONSES, status="200") == len(site)
+        assert metrics.get_counter(HTTP_BYTES) == sum(map(len, site.values()))
+        assert metrics.get_histogram(STAGE_SECONDS, stage="fetch").count == (
+            len(site)
+        )
+        assert metrics.get_histogram(
+            STAGE_SECONDS, stage="extract_info_table"
+        ).count == (BOOKS_PER_PAGE)
+        assert 'scraper_stage_seconds_count{stage="scrape"} 1' in (
+            prometheus_text
+        )
+        assert {"p50", "p95", "p99"} <= set(exported["histograms"][0])
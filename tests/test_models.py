@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+from requests import Session
+
+from src.models import Book
+from src.scraper import Scraper
+
+
+class TestBook:
+    """Набор тестов для компактной записи о книге Book."""
+
+    def test_book_from_dict_round_trip(
+        self,
+        scraper: Scraper,
+        session: Session,
+        example_book_full_html: str,
+    ):
+        """Тестирует преобразование словаря книги в запись и обратно.
+
+        Проверяет, что цены, наличие, рейтинг и отзывы хранятся числами,
+        запись не имеет ``__dict__``, повторяющиеся строки интернированы,
+        а обратное преобразование дает исходный словарь.
+        """
+        with patch.object(
+            scraper,
+            "_get_response_content",
+            return_value=example_book_full_html,
+        ):
+            book_data = scraper._get_book_data(session, "http://any-test-url")
+
+        book = Book.from_dict(book_data)
+        other_book = Book.from_json(book.to_json())
+
+        assert not hasattr(book, "__dict__")
+        assert book.price == 51.77
+        assert book.tax == 0.0
+        assert book.available == 22
+        assert book.rating == 3
+        assert book.number_of_reviews == 0
+        assert book.product_type is other_book.product_type
+        assert book.currency is other_book.currency
+        assert book.to_dict() == book_data
+        assert other_book == book
+
+    def test_scrape_books_as_records(
+        self,
+        scraper: Scraper,
+        page3_html_without_next: str,
+    ):
+        """Тестирует получение результатов парсинга в виде записей Book."""
+        scraper.config.as_records = True
+
+        with (
+            patch.object(
+                scraper,
+                "_get_response_content",
+                return_value=page3_html_without_next,
+            ),
+            patch.object(
+                scraper,
+                "_get_book_data",
+                return_value={"Title": "Book", "Price": "£10.00"},
+            ),
+        ):
+            books = scraper.scrape_books()
+
+        assert all(type(book).__name__ == Book.__name__ for book in books)
+        assert books[0].price == 10.0
+        assert books[0].rating is None
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.config import ScraperConfig
+from src.fake_site import generate_site
+from src.parse_pool import ParsePool
+
+
+def get_book_pages(pages_count: int) -> list[bytes]:
+    """Возвращает страницы книг сгенерированного сайта."""
+    return [
+        page
+        for path, page in generate_site(pages_count).items()
+        if path.endswith("/index.html")
+    ]
+
+
+class TestParsePool:
+    """Набор тестов для пула процессов разбора страниц книг."""
+
+    def test_parse_pool_propagates_parse_errors(self):
+        """Тестирует передачу ошибок разбора из пула процессов.
+
+        Проверяет, что страницы пакета разбираются независимо: ошибка
+        на странице без основной информации о книге возвращается только
+        ожидающему её потоку.
+        """
+        book_page = get_book_pages(1)[0].decode()
+        config = ScraperConfig(max_workers=2)
+
+        with (
+            ParsePool(config, workers=1, batch_size=2, max_delay=0.01) as pool,
+            ThreadPoolExecutor(max_workers=2) as executor,
+        ):
+            parsed = executor.submit(pool.parse, book_page)
+            failed = executor.submit(pool.parse, "<html></html>")
+
+            assert parsed.result()["Info_table"]["Tax"] == "£0.00"
+            with pytest.raises(ValueError):
+                failed.result()
+
+    def test_submit_parses_batches_in_several_processes(self):
+        """Тестирует разбор пакетов в нескольких процессах одновременно.
+
+        Один поток ставит страницы в очередь, не дожидаясь разбора,
+        поэтому в работе находится несколько пакетов и их разбирают
+        все процессы пула. Результаты совпадают с порядком страниц.
+        """
+        book_pages = get_book_pages(4)
+        config = ScraperConfig(max_workers=1)
+
+        with ParsePool(
+            config, workers=2, batch_size=4, max_delay=0.01
+        ) as pool:
+            futures = [pool.submit(page) for page in book_pages]
+            books = [future.result() for future in futures]
+
+        assert len(pool.worker_batches) == 2
+        assert sum(pool.worker_batches.values()) == len(book_pages) // 4
+        assert [book["Title"] for book in books] == [
+            page.decode().split("<h1>")[1].split("</h1>")[0]
+            for page in book_pages
+        ]
@@ -0,0 +1,78 @@
+import pstats
+import re
+import threading
+from pathlib import Path
+
+from src.adapters import HttpClientManager
+from src.config import ScraperConfig, SessionConfig
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.scraper import Scraper
+
+COLLAPSED_STACK_PATTERN = re.compile(r"^[^ ;]+(;[^;]+)* \d+$")
+
+
+class TestProfiling:
+    """Набор тестов для режима профилирования запуска."""
+
+    def test_profiling_writes_results(self, tmp_path: Path):
+        """Тестирует результаты профилирования запуска парсера.
+
+        Проверяет, что статистика cProfile включает методы основного
+        потока, стеки потоков загрузки сохраняются в свернутом формате,
+        а отчет tracemalloc содержит стадии парсера.
+        """
+        with FakeSiteServer(generate_site(1)) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    max_workers=4,
+                    profiling=True,
+                    profile_dir_path=tmp_path / "profiles",
+                    profile_sample_interval=0.001,
+                    metrics_dir_path=tmp_path / "metrics",
+                ),
+            )
+            scraper.scrape_books()
+
+        (profile_dir,) = (tmp_path / "profiles").iterdir()
+        stats = pstats.Stats(str(profile_dir / "profile.pstats"))
+        profiled_functions = {function for _, _, function in stats.stats}
+        stacks = (profile_dir / "stacks.folded").read_text().splitlines()
+        memory_report = (profile_dir / "memory.txt").read_text()
+
+        assert {"_iter_books", "_get_catalog_books"} <= profiled_functions
+        assert any(line.startswith("ThreadPoolExecutor;") for line in stacks)
+        assert all(COLLAPSED_STACK_PATTERN.match(line) for line in stacks)
+        assert "book: 20," in memory_report
+        assert scraper.metrics.profiler is None
+
+    def test_profiled_multi_worker_scrape_finishes(self, tmp_path: Path):
+        """Тестирует, что профилирование не останавливает потоки загрузки.
+
+        При включении отдельного cProfile в каждом потоке Python 3.12
+        завершал потоки пула ошибкой, и обход зависал.
+        """
+        with FakeSiteServer(generate_site(2)) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    max_workers=8,
+                    profiling=True,
+                    profile_dir_path=tmp_path / "profiles",
+                    metrics_dir_path=tmp_path / "metrics",
+                ),
+            )
+            books = []
+            thread = threading.Thread(
+                target=lambda: books.extend(scraper.scrape_books()),
+                daemon=True,
+            )
+            thread.start()
+            thread.join(timeout=60)
+
+        assert not thread.is_alive()
+        assert len(books) == 2 * BOOKS_PER_PAGE
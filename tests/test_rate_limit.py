@@ -0,0 +1,91 @@
+import time
+from unittest.mock import patch
+
+from src.adapters import HttpClientManager
+from src.config import SessionConfig
+from src.rate_limit import AimdController, TokenBucket
+from tests.conftest import ThrottlingRequestHandler
+
+
+class TestRateLimit:
+    """Набор тестов для ограничения частоты и параллельности запросов."""
+
+    def test_aimd_controller_adjusts_limit(self):
+        """Тестирует аддитивный рост и мультипликативное снижение лимита.
+
+        Проверяет, что при стабильной задержке лимит растет, при росте
+        задержки и ответе 429 - уменьшается вдвое, но не ниже минимума.
+        """
+        controller = AimdController(
+            initial_limit=4,
+            min_limit=1,
+            max_limit=8,
+            decrease_factor=0.5,
+            latency_tolerance=2.0,
+        )
+        for _ in range(8):
+            controller.acquire()
+            controller.release(latency=0.01, status=200)
+        grown_limit = controller.limit
+
+        controller.acquire()
+        controller.release(latency=0.1, status=200)
+        slowed_limit = controller.limit
+
+        controller._decreased_at = 0.0
+        controller.throttle()
+
+        assert 5 < grown_limit <= 8
+        assert slowed_limit == grown_limit / 2
+        assert controller.limit == max(1, slowed_limit / 2)
+        assert controller.throttled == 1
+
+    def test_token_bucket_limits_rate(self):
+        """Тестирует ожидание токенов после исчерпания запаса."""
+        bucket = TokenBucket(rate=50, burst=1)
+
+        start_time = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+
+        assert time.monotonic() - start_time >= 4 / 50 * 0.9
+
+    def test_retry_after_honoured(self, throttling_server_url: str):
+        """Тестирует повтор запроса после ответа 429 с Retry-After.
+
+        Проверяет, что повторный запрос отправляется не раньше паузы
+        из заголовка, а ограничитель учитывает ответ 429 и снижает лимит.
+        """
+        manager = HttpClientManager(
+            SessionConfig(adaptive_rate_limit=True, backoff_factor=0)
+        )
+
+        response = manager.session.get(throttling_server_url)
+        first, second = ThrottlingRequestHandler.requests_times
+        host_stats = manager.limiter.stats()["127.0.0.1"]
+
+        assert response.status_code == 200
+        assert second - first >= ThrottlingRequestHandler.retry_after * 0.9
+        assert host_stats["throttled"] == 1
+        assert host_stats["limit"] < SessionConfig().initial_concurrency
+
+    def test_latency_excludes_retry_after_pause(
+        self, throttling_server_url: str
+    ):
+        """Тестирует измерение задержки ответа после повтора запроса.
+
+        Регулятор получает время только последней попытки, без паузы
+        из ``Retry-After`` перед ней.
+        """
+        manager = HttpClientManager(
+            SessionConfig(adaptive_rate_limit=True, backoff_factor=0)
+        )
+
+        with patch.object(
+            manager.limiter, "release", wraps=manager.limiter.release
+        ) as release:
+            response = manager.session.get(throttling_server_url)
+        _, latency, status = release.call_args.args
+
+        assert response.status_code == status == 200
+        assert latency < ThrottlingRequestHandler.retry_after / 2
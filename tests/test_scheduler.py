@@ -0,0 +1,132 @@
+import _thread
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import time as day_time
+
+import pytest
+
+from src.scheduler import JobScheduler, ScheduledJob
+
+
+class TestScheduler:
+    """Набор тестов для событийного планировщика задач."""
+
+    @pytest.mark.parametrize(
+        "now, expected_run",
+        [
+            (datetime(2025, 1, 1, 18, 59), datetime(2025, 1, 1, 19, 0)),
+            (datetime(2025, 1, 1, 19, 0), datetime(2025, 1, 2, 19, 0)),
+            (datetime(2025, 12, 31, 23, 0), datetime(2026, 1, 1, 19, 0)),
+        ],
+    )
+    def test_daily_next_run(self, now: datetime, expected_run: datetime):
+        """Тестирует вычисление времени следующего ежедневного запуска."""
+        job = ScheduledJob("crawl", lambda: None, at=day_time(19, 0))
+
+        assert job.get_next_run(now) == expected_run
+
+    def test_interval_next_run_skips_missed_runs(self):
+        """Тестирует, что пропущенные запуски не наверстываются."""
+        job = ScheduledJob(
+            "refresh",
+            lambda: None,
+            interval=timedelta(minutes=10),
+            next_run=datetime(2025, 1, 1, 12, 0),
+        )
+
+        assert job.get_next_run(datetime(2025, 1, 1, 12, 5)) == datetime(
+            2025, 1, 1, 12, 10
+        )
+        assert job.get_next_run(datetime(2025, 1, 1, 13, 0)) == datetime(
+            2025, 1, 1, 13, 10
+        )
+
+    def test_jobs_do_not_overlap_and_share_budget(self):
+        """Тестирует выполнение задач в пуле потоков.
+
+        Долгая задача запускается чаще, чем успевает завершиться, поэтому
+        часть её запусков пропускается и одновременно выполняется не больше
+        одного её запуска. Две задачи по 2 единицы бюджета при бюджете 3
+        никогда не выполняются одновременно.
+        """
+        lock = threading.Lock()
+        running = {"slow": 0, "fast": 0}
+        max_running = {"slow": 0, "fast": 0, "total": 0}
+
+        def make_job(name: str, duration: float):
+            def job() -> None:
+                with lock:
+                    running[name] += 1
+                    max_running[name] = max(max_running[name], running[name])
+                    max_running["total"] = max(
+                        max_running["total"], sum(running.values())
+                    )
+                time.sleep(duration)
+                with lock:
+                    running[name] -= 1
+
+            return job
+
+        scheduler = JobScheduler(workers=4, concurrency_budget=3)
+        slow = scheduler.every("slow", 0.02, make_job("slow", 0.1), slots=2)
+        fast = scheduler.every("fast", 0.02, make_job("fast", 0.01), slots=2)
+        thread = threading.Thread(target=scheduler.run)
+        thread.start()
+        time.sleep(0.5)
+        scheduler.stop()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert slow.runs >= 2
+        assert fast.runs >= 2
+        assert slow.skipped > 0
+        assert max_running == {"slow": 1, "fast": 1, "total": 1}
+
+    def test_scheduler_sleeps_until_due_job(self):
+        """Тестирует, что задача не запускается раньше срока."""
+        started = threading.Event()
+        scheduler = JobScheduler(workers=1, concurrency_budget=1)
+        job = scheduler.every("refresh", 0.3, started.set)
+        scheduled_at = job.next_run
+        thread = threading.Thread(target=scheduler.run)
+        thread.start()
+
+        assert started.wait(timeout=5)
+        started_at = datetime.now()
+        scheduler.stop()
+        thread.join(timeout=5)
+
+        assert started_at >= scheduled_at
+        assert started_at - scheduled_at < timedelta(seconds=0.2)
+
+    def test_keyboard_interrupt_does_not_wait_for_running_jobs(self):
+        """Тестирует остановку планировщика по Ctrl+C во время задачи.
+
+        Задача выполняется дольше теста, но ``run`` сразу передает
+        ``KeyboardInterrupt`` вызывающему коду и новые запуски не делает.
+        """
+        started, finish = threading.Event(), threading.Event()
+
+        def job() -> None:
+            started.set()
+            finish.wait(timeout=10)
+
+        scheduler = JobScheduler(workers=1, concurrency_budget=1)
+        crawl = scheduler.every("crawl", 0.01, job)
+        interrupter = threading.Thread(
+            target=lambda: started.wait(timeout=5) and _thread.interrupt_main()
+        )
+        interrupter.start()
+        start_time = time.perf_counter()
+        try:
+            with pytest.raises(KeyboardInterrupt):
+                scheduler.run()
+            elapsed = time.perf_counter() - start_time
+            assert crawl.is_running
+        finally:
+            finish.set()
+            interrupter.join()
+
+        assert elapsed < 1
+        assert crawl.runs == 0
@@ -1,11 +1,28 @@
+import time
+from pathlib import Path
 from unittest.mock import patch
+from urllib.parse import urljoin
 
 import pytest
 from bs4 import BeautifulSoup
 from requests import RequestException, Session
 
-from src.constants import EMPTY_DATA
+from src.adapters import HttpClientManager
+from src.config import ScraperConfig, SessionConfig
+from src.constants import (
+    CATALOG_DISCOVERY_FANOUT,
+    EMPTY_DATA,
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSONL,
+    OUTPUT_FORMAT_SQLITE,
+    SCRAPE_MODE_FULL,
+    SCRAPE_MODE_HYBRID,
+    SCRAPE_MODE_LISTING,
+)
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.models import Book
 from src.scraper import Scraper
+from src.storage import SqliteBooksStorage, read_json_lines
 from tests.conftest import TOTAL_BOOKS_PAGES, TOTAL_BOOKS_SCRAPED
 
 
@@ -36,9 +53,9 @@ class TestScraper:
             example_book_page_correct_request: Фикстура с корректным HTML-ответом
 
         Asserts:
-            - Ответ является строкой (HTML-контентом)
+            - Ответ является телом HTML-страницы в байтах
         """
-        assert isinstance(example_book_page_correct_request, str)
+        assert isinstance(example_book_page_correct_request, bytes)
 
     def test_example_book_page_not_found_response(
         self, scraper: Scraper, session: Session, not_found_url: str
@@ -59,7 +76,7 @@ class TestScraper:
             - URL присутствует в сообщении об ошибке
         """
         with pytest.raises(RequestException) as error:
-            scraper._get_response_as_text(session, not_found_url)
+            scraper._get_response_content(session, not_found_url)
 
         assert "Ошибка при попытке выполнить запрос" in str(error.value)
         assert not_found_url in str(error.value)
@@ -126,7 +143,7 @@ class TestScraper:
         """
         with patch.object(
             scraper,
-            "_get_response_as_text",
+            "_get_response_content",
             return_value=example_book_full_html,
         ):
             result = scraper._get_book_data(session, self.ANY_TEST_URL)
@@ -167,7 +184,7 @@ class TestScraper:
         - Формирование итогового списка данных
         """
         with (
-            patch.object(scraper, "_get_response_as_text") as mock_get_text,
+            patch.object(scraper, "_get_response_content") as mock_get_text,
             patch.object(scraper, "_get_book_data") as mock_get_book_data,
         ):
             mock_get_text.side_effect = [
@@ -190,3 +207,366 @@ class TestScraper:
 
             assert mock_get_text.call_count == TOTAL_BOOKS_PAGES
             assert mock_get_book_data.call_count == TOTAL_BOOKS_SCRAPED
+
+    def test_get_all_books_data_concurrent_keeps_order(
+        self,
+        scraper: Scraper,
+        page1_html_with_next2: str,
+        page2_html_with_next3: str,
+        page3_html_without_next: str,
+    ):
+        """Тестирует параллельную загрузку страниц книг.
+
+        Проверяет, что при ``max_workers`` больше единицы все книги
+        обрабатываются, а порядок результатов совпадает с порядком
+        ссылок в каталоге независимо от времени ответа.
+        """
+        scraper.config.max_workers = 4
+
+        def fake_book_data(session, book_url):
+            time.sleep(0.01 * (hash(book_url) % 3))
+            return {"Title": book_url}
+
+        with (
+            patch.object(scraper, "_get_response_content") as mock_get_text,
+            patch.object(
+                scraper, "_get_book_data", side_effect=fake_book_data
+            ),
+        ):
+            mock_get_text.side_effect = [
+                page1_html_with_next2,
+                page2_html_with_next3,
+                page3_html_without_next,
+            ]
+
+            books = scraper.scrape_books()
+
+        assert len(books) == TOTAL_BOOKS_SCRAPED
+        assert [book["Title"] for book in books] == [
+            urljoin(scraper.config.base_url, f"/book{i}.html")
+            for i in range(1, TOTAL_BOOKS_SCRAPED + 1)
+        ]
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_get_all_books_data_fanout_discovery(
+        self,
+        scraper: Scraper,
+        page1_html_with_next2: str,
+        page2_html_with_next3: str,
+        page3_html_without_next: str,
+        max_workers: int,
+    ):
+        """Тестирует обход каталога с одновременным запросом всех страниц.
+
+        Проверяет, что количество страниц берется из строки "Page 1 of N",
+        URL страниц формируются по шаблону, а порядок книг сохраняется.
+        """
+        scraper.config.catalog_discovery = CATALOG_DISCOVERY_FANOUT
+        scraper.config.max_workers = max_workers
+        pager = '<li class="current">Page 1 of 3</li>'
+        pages = {
+            scraper.config.start_catalog_page: page1_html_with_next2.replace(
+                "</section>", pager + "</section>"
+            ),
+            scraper._get_catalog_page_url(2): page2_html_with_next3,
+            scraper._get_catalog_page_url(3): page3_html_without_next,
+        }
+
+        with (
+            patch.object(
+                scraper,
+                "_get_response_content",
+                side_effect=lambda session, url: pages[url],
+            ) as mock_get_text,
+            patch.object(
+                scraper,
+                "_get_book_data",
+                side_effect=lambda session, url: {"Title": url},
+            ),
+        ):
+            books = scraper.scrape_books()
+
+        assert mock_get_text.call_count == TOTAL_BOOKS_PAGES
+        assert [book["Title"] for book in books] == [
+            urljoin(scraper.config.base_url, f"/book{i}.html")
+            for i in range(1, TOTAL_BOOKS_SCRAPED + 1)
+        ]
+
+    def test_incremental_scrape_fetches_only_changed_books(
+        self,
+        scraper: Scraper,
+        catalog_page_with_listings_html: str,
+        tmp_path: Path,
+    ):
+        """Тестирует инкрементальный режим парсинга.
+
+        Проверяет, что при первом запуске загружаются все книги, а при
+        повторном - только книга, у которой в каталоге изменилась цена.
+        Данные остальных книг переносятся из индекса предыдущего запуска.
+        """
+        scraper.config.incremental = True
+        scraper.config.books_index_path = tmp_path / "books_index.json"
+        changed_catalog = catalog_page_with_listings_html.replace(
+            "£53.74", "£10.00"
+        )
+
+        with (
+            patch.object(scraper, "_get_response_content") as mock_get_text,
+            patch.object(
+                scraper,
+                "_get_book_data",
+                side_effect=lambda session, url: {"Title": url},
+            ) as mock_get_book_data,
+        ):
+            mock_get_text.side_effect = [
+                catalog_page_with_listings_html,
+                changed_catalog,
+            ]
+            first_run = scraper.scrape_books()
+            second_run = scraper.scrape_books()
+
+        assert mock_get_book_data.call_count == 4
+        assert mock_get_book_data.call_args.args[1] == (
+            scraper.config.base_url + "book-2_2/index.html"
+        )
+        assert second_run == first_run
+        assert scraper.config.books_index_path.exists()
+
+    def test_iter_books_yields_before_next_catalog_page(
+        self,
+        scraper: Scraper,
+        page1_html_with_next2: str,
+        page2_html_with_next3: str,
+        page3_html_without_next: str,
+        books_titles: list[dict[str, str]],
+    ):
+        """Тестирует потоковую выдачу книг генератором iter_books.
+
+        Проверяет, что первая книга возвращается до запроса следующей
+        страницы каталога, а генератор в итоге отдает все книги.
+        """
+        with (
+            patch.object(scraper, "_get_response_content") as mock_get_text,
+            patch.object(scraper, "_get_book_data") as mock_get_book_data,
+        ):
+            mock_get_text.side_effect = [
+                page1_html_with_next2,
+                page2_html_with_next3,
+                page3_html_without_next,
+            ]
+            mock_get_book_data.side_effect = books_titles
+
+            books = scraper.iter_books()
+            first_book = next(books)
+
+            assert first_book == books_titles[0]
+            assert mock_get_text.call_count == 1
+
+            assert [first_book, *books] == books_titles
+            assert mock_get_text.call_count == TOTAL_BOOKS_PAGES
+
+    def test_scrape_books_streams_json_lines(
+        self,
+        scraper: Scraper,
+        page1_html_with_next2: str,
+        page2_html_with_next3: str,
+        page3_html_without_next: str,
+        books_titles: list[dict[str, str]],
+        tmp_path: Path,
+    ):
+        """Тестирует сохранение книг в файл формата JSON Lines.
+
+        Проверяет, что каждая книга записывается отдельной строкой
+        в порядке каталога.
+        """
+        scraper.config.output_format = OUTPUT_FORMAT_JSONL
+        scraper.config.jsonl_file_path = tmp_path / "books.jsonl"
+
+        with (
+            patch.object(scraper, "_get_response_content") as mock_get_text,
+            patch.object(scraper, "_get_book_data") as mock_get_book_data,
+        ):
+            mock_get_text.side_effect = [
+                page1_html_with_next2,
+                page2_html_with_next3,
+                page3_html_without_next,
+            ]
+            mock_get_book_data.side_effect = books_titles
+
+            books = scraper.scrape_books(is_save=True)
+
+        assert read_json_lines(scraper.config.jsonl_file_path) == books
+        assert books == books_titles
+
+    def test_compressed_pages_are_decoded_with_configured_encoding(self):
+        """Тестирует разбор сжатых страниц без указанной сервером кодировки.
+
+        Проверяет, что страницы запрашиваются со сжатием gzip, а символ
+        валюты в ценах декодируется без искажений.
+        """
+        with FakeSiteServer(generate_site(1)) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                ),
+            )
+            books = scraper.scrape_books()
+
+        assert server.compressed_count == server.requests_count
+        assert len(books) == BOOKS_PER_PAGE
+        assert all(book["Price"].startswith("£") for book in books)
+        assert all(book["Info_table"]["Tax"] == "£0.00" for book in books)
+
+    def test_listing_mode_uses_only_catalog_pages(self):
+        """Тестирует режим обхода только по карточкам каталога.
+
+        Проверяет, что запрашиваются только страницы каталога, а название,
+        цена, рейтинг и наличие книг совпадают с данными их страниц.
+        """
+        site = generate_site(2)
+        site["/catalogue/page-1.html"] = site[
+            "/catalogue/page-1.html"
+        ].replace(b"instock availability", b"outofstock availability", 1)
+
+        with FakeSiteServer(site) as server:
+            scrapers = {
+                mode: Scraper(
+                    HttpClientManager(SessionConfig()),
+                    ScraperConfig(
+                        base_url=server.base_url,
+                        start_catalog_page=server.base_url + "page-1.html",
+                        scrape_mode=mode,
+                    ),
+                )
+                for mode in (SCRAPE_MODE_FULL, SCRAPE_MODE_LISTING)
+            }
+            full_books = scrapers[SCRAPE_MODE_FULL].scrape_books()
+            full_run_requests = server.requests_count
+            listing_books = scrapers[SCRAPE_MODE_LISTING].scrape_books()
+            listing_run_requests = server.requests_count - full_run_requests
+
+        assert full_run_requests == 2 + 2 * BOOKS_PER_PAGE
+        assert listing_run_requests == 2
+        assert len(listing_books) == len(full_books)
+        for listing_book, full_book in zip(listing_books, full_books):
+            for key in ("Title", "Price", "Rating"):
+                assert listing_book[key] == full_book[key]
+            assert Book.from_dict(listing_book).to_dict() == {
+                **listing_book,
+                "Description": EMPTY_DATA,
+                "Info_table": {},
+            }
+        assert listing_books[0]["Available"] == "0"
+        assert "In_stock" not in listing_books[0]
+        assert all(
+            book["Available"] == EMPTY_DATA and book["In_stock"] is True
+            for book in listing_books[1:]
+        )
+
+    def test_hybrid_mode_fetches_only_unseen_books(self, tmp_path: Path):
+        """Тестирует гибридный режим обхода.
+
+        Первый запуск обходит только вторую страницу каталога. Во втором
+        запуске страницы запрашиваются только для книг первой страницы,
+        а цена книги второй страницы, изменившаяся в каталоге, обновляется
+        по карточке с сохранением описания и таблицы характеристик.
+        """
+        site = generate_site(2)
+        with FakeSiteServer(site) as server:
+            config = ScraperConfig(
+                base_url=server.base_url,
+                start_catalog_page=server.base_url + "page-2.html",
+                scrape_mode=SCRAPE_MODE_HYBRID,
+                books_index_path=tmp_path / "books_index.json",
+            )
+            scraper = Scraper(HttpClientManager(SessionConfig()), config)
+            first_run = scraper.scrape_books()
+            first_run_requests = server.requests_count
+
+            changed_price = first_run[0]["Price"]
+            site["/catalogue/page-2.html"] = site[
+                "/catalogue/page-2.html"
+            ].replace(changed_price.encode(), "£1.00".encode(), 1)
+            config.start_catalog_page = server.base_url + "page-1.html"
+            second_run = scraper.scrape_books()
+            second_run_requests = server.requests_count - first_run_requests
+
+        changed_book, *unchanged_books = second_run[BOOKS_PER_PAGE:]
+
+        assert first_run_requests == 1 + BOOKS_PER_PAGE
+        assert second_run_requests == 2 + BOOKS_PER_PAGE
+        assert len(second_run) == 2 * BOOKS_PER_PAGE
+        assert unchanged_books == first_run[1:]
+        assert changed_book["Price"] == "£1.00"
+        assert changed_book["In_stock"] is True
+        assert changed_book["Available"] == EMPTY_DATA
+        for key in ("Title", "Description", "Info_table"):
+            assert changed_book[key] == first_run[0][key]
+
+    def test_listing_mode_updates_sqlite_without_losing_details(
+        self, tmp_path: Path
+    ):
+        """Тестирует сохранение обхода по карточкам каталога в SQLite.
+
+        Проверяет, что после полного обхода запуск в режиме "listing"
+        обновляет цену книги по URL, сохраняя её описание и таблицу
+        характеристик, и не удаляет и не дублирует строки базы.
+        """
+        site = generate_site(2)
+        with FakeSiteServer(site) as server:
+            config = ScraperConfig(
+                base_url=server.base_url,
+                start_catalog_page=server.base_url + "page-1.html",
+                output_format=OUTPUT_FORMAT_SQLITE,
+                sqlite_path=tmp_path / "books.db",
+            )
+            scraper = Scraper(HttpClientManager(SessionConfig()), config)
+            full_books = scraper.scrape_books(is_save=True)
+
+            changed_price = full_books[0]["Price"]
+            site["/catalogue/page-1.html"] = site[
+                "/catalogue/page-1.html"
+            ].replace(changed_price.encode(), "£1.00".encode(), 1)
+            config.scrape_mode = SCRAPE_MODE_LISTING
+            scraper.scrape_books(is_save=True)
+
+        with SqliteBooksStorage(config.sqlite_path) as storage:
+            stored_count = len(storage)
+            stored_books = [
+                storage.get(book["Info_table"]["UPC"]) for book in full_books
+            ]
+
+        changed_book = stored_books[0]
+        assert stored_count == len(full_books) == 2 * BOOKS_PER_PAGE
+        assert changed_book["Price"] == "£1.00"
+        assert changed_book["In_stock"] is True
+        for stored_book, full_book in zip(stored_books, full_books):
+            for key in ("Description", "Info_table"):
+                assert stored_book[key] == full_book[key]
+
+    @pytest.mark.parametrize(
+        "output_format", (OUTPUT_FORMAT_JSON, OUTPUT_FORMAT_JSONL)
+    )
+    def test_listing_mode_rejects_overwriting_outputs(
+        self, output_format: str, tmp_path: Path
+    ):
+        """Тестирует запрет сохранения обхода по карточкам вне SQLite.
+
+        Проверяет, что файл с полными данными книг не перезаписывается.
+        """
+        scraper = Scraper(
+            HttpClientManager(SessionConfig()),
+            ScraperConfig(
+                scrape_mode=SCRAPE_MODE_LISTING,
+                output_format=output_format,
+                file_path=tmp_path / "books.json",
+                jsonl_file_path=tmp_path / "books.jsonl",
+            ),
+        )
+
+        with pytest.raises(ValueError):
+            scraper.scrape_books(is_save=True)
+
+        assert not any(tmp_path.iterdir())
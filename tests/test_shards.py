@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+
+from src.config import ScraperConfig, SessionConfig
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.shards import (
+    SHARD_DONE,
+    SHARD_FAILED,
+    ShardQueue,
+    crawl_sharded,
+    merge_shards,
+)
+
+FAKE_SITE_PAGES: int = 4
+FAKE_SITE_CATEGORIES: int = 3
+
+
+class TestShards:
+    """Набор тестов для обхода каталога по категориям."""
+
+    def test_crawl_sharded(self, tmp_path: Path):
+        """Тестирует обход сгенерированного сайта в нескольких процессах.
+
+        Проверяет, что каждая категория обрабатывается один раз,
+        включая переход на следующие страницы категории, и что
+        объединенный результат содержит все книги каталога без повторов.
+        """
+        site = generate_site(
+            FAKE_SITE_PAGES, categories_count=FAKE_SITE_CATEGORIES
+        )
+
+        with FakeSiteServer(site) as server:
+            config = ScraperConfig(
+                base_url=server.base_url,
+                start_catalog_page=server.base_url + "page-1.html",
+                shard_workers=2,
+                shard_queue_path=tmp_path / "queue.sqlite3",
+                shard_results_dir_path=tmp_path / "shards",
+                file_path=tmp_path / "books.json",
+                save_dir_path=tmp_path,
+            )
+            books = crawl_sharded(SessionConfig(), config, is_save=True)
+
+        queue = ShardQueue(config.shard_queue_path, 60, 3)
+        stats = queue.stats()
+        queue.close()
+        upcs = [book["Info_table"]["UPC"] for book in books]
+        saved_books = json.loads((tmp_path / "books.json").read_text())
+
+        assert stats == {SHARD_DONE: FAKE_SITE_CATEGORIES}
+        assert len(books) == FAKE_SITE_PAGES * BOOKS_PER_PAGE
+        assert len(set(upcs)) == len(upcs)
+        assert saved_books == books
+        assert server.requests_count == (
+            1  # стартовая страница с категориями
+            + len(books)
+            + sum(path.startswith("/catalogue/category/") for path in site)
+        )
+
+    def test_expired_lease_is_reclaimed(self, tmp_path: Path):
+        """Тестирует повторную выдачу шарда после истечения аренды.
+
+        Проверяет, что шард аварийно завершившегося обработчика забирает
+        другой обработчик, а после исчерпания попыток шард помечается
+        как неудачный.
+        """
+        queue = ShardQueue(
+            tmp_path / "queue.sqlite3", lease_timeout=0, max_attempts=2
+        )
+        queue.reset([("Travel", "http://example.com/travel_2/index.html")])
+
+        first = queue.claim("worker-1")
+        second = queue.claim("worker-2")
+        third = queue.claim("worker-3")
+        stats = queue.stats()
+        queue.close()
+
+        assert first == second
+        assert third is None
+        assert stats == {SHARD_FAILED: 1}
+
+    def test_merge_shards_removes_duplicates(self, tmp_path: Path):
+        """Тестирует объединение результатов шардов по UPC."""
+        queue = ShardQueue(tmp_path / "queue.sqlite3", 60, 3)
+        queue.reset(
+            [
+                ("Travel", "http://example.com/travel_2/index.html"),
+                ("Poetry", "http://example.com/poetry_3/index.html"),
+            ]
+        )
+        books = [
+            {"Title": title, "Info_table": {"UPC": upc}}
+            for title, upc in (("A", "1"), ("B", "2"), ("C", "3"))
+        ]
+        for index, shard_books in enumerate((books[:2], books[1:])):
+            url, _, _ = queue.claim("worker")
+            result_path = tmp_path / f"shard-{index}.jsonl"
+            result_path.write_text(
+                "".join(json.dumps(book) + "\n" for book in shard_books)
+            )
+            queue.complete(url, "worker", result_path)
+
+        merged_books = merge_shards(queue)
+        queue.close()
+
+        assert merged_books == books
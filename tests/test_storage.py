@@ -0,0 +1,169 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.adapters import HttpClientManager
+from src.config import ScraperConfig, SessionConfig
+from src.constants import EMPTY_DATA, OUTPUT_FORMAT_SQLITE
+from src.fake_site import BOOKS_PER_PAGE, FakeSiteServer, generate_site
+from src.scraper import Scraper
+from src.storage import SqliteBooksStorage
+
+
+def make_book(upc: str, price: str, rating: str, available: str) -> dict:
+    """Создает словарь книги в формате ``Scraper._get_book_data``."""
+    return {
+        "Title": f"Book {upc}",
+        "Price": f"£{price}",
+        "Available": available,
+        "Rating": rating,
+        "Description": "Описание",
+        "Info_table": {"UPC": upc, "Price (excl. tax)": f"£{price}"},
+    }
+
+
+class TestSqliteBooksStorage:
+    """Набор тестов для хранилища книг в базе SQLite."""
+
+    def test_daily_run_writes_only_changed_books(self, tmp_path: Path):
+        """Тестирует повторную запись каталога.
+
+        Проверяет, что неизменившиеся книги не перезаписываются,
+        изменившиеся обновляются, а исчезнувшие из каталога удаляются.
+        """
+        path = tmp_path / "books.sqlite3"
+        books = [
+            make_book("a1", "10.00", "3", "5"),
+            make_book("b2", "20.00", "5", "0"),
+            make_book("c3", "30.00", "1", "2"),
+        ]
+        with SqliteBooksStorage(path, batch_size=2) as storage:
+            for book in books:
+                storage.write(book)
+        first_run = (storage.written, storage.unchanged, storage.removed)
+
+        changed_book = make_book("b2", "25.00", "5", "1")
+        with SqliteBooksStorage(path, prune_missing=True) as storage:
+            for book in (books[0], changed_book):
+                storage.write(book)
+        second_run = (storage.written, storage.unchanged, storage.removed)
+
+        with SqliteBooksStorage(path) as storage:
+            books_count = len(storage)
+            stored_book = storage.get("b2")
+            removed_book = storage.get("c3")
+
+        assert first_run == (3, 0, 0)
+        assert second_run == (1, 1, 1)
+        assert books_count == 2
+        assert stored_book == changed_book
+        assert removed_book is None
+
+    def test_interrupted_run_keeps_written_books(self, tmp_path: Path):
+        """Тестирует прерывание записи исключением.
+
+        Проверяет, что книги из незаписанного пакета сохраняются, а книги,
+        не встретившиеся в прерванном запуске, не удаляются.
+        """
+        path = tmp_path / "books.sqlite3"
+        with SqliteBooksStorage(path) as storage:
+            storage.write(make_book("a1", "10.00", "3", "5"))
+
+        with pytest.raises(RuntimeError):
+            with SqliteBooksStorage(
+                path, batch_size=10, prune_missing=True
+            ) as storage:
+                storage.write(make_book("b2", "20.00", "5", "0"))
+                raise RuntimeError
+
+        with SqliteBooksStorage(path) as storage:
+            stored_upcs = [
+                book["Info_table"]["UPC"] for book in storage.query()
+            ]
+
+        assert stored_upcs == ["a1", "b2"]
+
+    @pytest.mark.parametrize(
+        "filters, expected_upcs",
+        [
+            ({"min_price": 15}, ["b2", "c3"]),
+            ({"max_price": 25, "min_rating": 3}, ["a1", "b2"]),
+            ({"in_stock": False}, ["b2"]),
+            ({"in_stock": True, "order_by": "rating", "limit": 1}, ["c3"]),
+        ],
+    )
+    def test_query(
+        self, tmp_path: Path, filters: dict, expected_upcs: list[str]
+    ):
+        """Тестирует выборку книг по цене, рейтингу и наличию."""
+        with SqliteBooksStorage(tmp_path / "books.sqlite3") as storage:
+            for book in (
+                make_book("a1", "10.00", "3", "5"),
+                make_book("b2", "20.00", "5", "0"),
+                make_book("c3", "30.00", "1", "2"),
+            ):
+                storage.write(book)
+            storage.flush()
+            upcs = [
+                book["Info_table"]["UPC"] for book in storage.query(**filters)
+            ]
+
+        assert upcs == expected_upcs
+
+    def test_query_in_stock_after_schema_upgrade(self, tmp_path: Path):
+        """Тестирует выборку по наличию в базе без столбца ``in_stock``.
+
+        Проверяет, что столбец добавляется при открытии базы и заполняется
+        по количеству доступных копий, а для книг из карточек каталога,
+        где количество не указано, - по признаку "In_stock".
+        """
+        path = tmp_path / "books.sqlite3"
+        with SqliteBooksStorage(path) as storage:
+            storage.write(make_book("a1", "10.00", "3", "5"))
+            storage.write(make_book("b2", "20.00", "5", "0"))
+        with sqlite3.connect(path) as connection:
+            connection.execute("DROP INDEX books_in_stock")
+            connection.execute("ALTER TABLE books DROP COLUMN in_stock")
+
+        listing_book = {
+            "Title": "Book c3",
+            "Price": "£30.00",
+            "Available": EMPTY_DATA,
+            "Rating": "1",
+            "In_stock": True,
+        }
+        with SqliteBooksStorage(path) as storage:
+            storage.write(listing_book)
+            storage.flush()
+            in_stock_titles = [
+                book["Title"] for book in storage.query(in_stock=True)
+            ]
+            out_of_stock_titles = [
+                book["Title"] for book in storage.query(in_stock=False)
+            ]
+
+        assert in_stock_titles == ["Book a1", "Book c3"]
+        assert out_of_stock_titles == ["Book b2"]
+
+    def test_scrape_books_to_sqlite(self, tmp_path: Path):
+        """Тестирует сохранение результатов парсинга в базу SQLite."""
+        with FakeSiteServer(generate_site(1)) as server:
+            scraper = Scraper(
+                HttpClientManager(SessionConfig()),
+                ScraperConfig(
+                    base_url=server.base_url,
+                    start_catalog_page=server.base_url + "page-1.html",
+                    output_format=OUTPUT_FORMAT_SQLITE,
+                    sqlite_path=tmp_path / "books.sqlite3",
+                ),
+            )
+            books = scraper.scrape_books(is_save=True)
+
+        with SqliteBooksStorage(scraper.config.sqlite_path) as storage:
+            stored_books = [
+                storage.get(book["Info_table"]["UPC"]) for book in books
+            ]
+
+        assert len(books) == BOOKS_PER_PAGE
+        assert stored_books == books